@@ -0,0 +1,136 @@
+"""
+Banco de pruebas de las colas de prioridad de Dijkstra.
+
+Genera un grafo dirigido ralo al azar (cada nodo con `degree` aristas
+salientes de peso entero entre 1 y `max_weight`) y ejecuta
+`grafos.csr.dijkstra` desde varios orígenes con cada cola de
+`grafos.heaps`. Mide:
+
+- Tiempo por ejecución (mediana) y nodos fijados por segundo.
+- Pico de entradas en la cola: con `heapq` y borrado perezoso puede
+  superar la cantidad de nodos; con decrease-key está acotado por V.
+
+Los resultados se escriben en JSON para poder compararlos entre versiones.
+
+Uso:
+
+    python -m grafos.benchmark --nodes 1000000 --degree 4 --output resultados.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import time
+
+import numpy as np
+
+from .csr import CSRGraph, _dijkstra, _dijkstra_weights, dijkstra
+from .heaps import QUEUES
+
+
+def random_graph(num_nodes, degree, max_weight=100, seed=42):
+    """
+    Grafo dirigido al azar con `degree` aristas salientes por nodo.
+
+    Args:
+        num_nodes (int): Cantidad de nodos.
+        degree (int): Aristas salientes de cada nodo.
+        max_weight (int): Peso máximo (los pesos son enteros desde 1).
+        seed (int): Semilla del generador.
+
+    Returns:
+        CSRGraph: Grafo generado.
+    """
+    rng = np.random.default_rng(seed)
+    sources = np.repeat(np.arange(num_nodes), degree)
+    targets = rng.integers(0, num_nodes, size=len(sources))
+    weights = rng.integers(1, max_weight + 1, size=len(sources)).astype(np.float64)
+    return CSRGraph.from_arrays(sources, targets, weights, num_nodes)
+
+
+def peak_entries(graph, source, queue):
+    """
+    Ejecuta Dijkstra con la cola `queue` y devuelve el máximo de entradas en ella.
+
+    Lo mide el mismo `_dijkstra` que usa `grafos.csr.dijkstra`. Para `heapq`
+    cuenta también las entradas viejas que todavía no salieron.
+    """
+    stats = {}
+    weights = _dijkstra_weights(graph, queue)
+    _dijkstra(graph.offsets.tolist(), graph.targets.tolist(), weights, graph.index[source], queue, stats)
+    return stats["peak_entries"]
+
+
+def run(num_nodes, degree, max_weight=100, sources=5, seed=42, queues=tuple(QUEUES)):
+    """
+    Ejecuta el banco de pruebas.
+
+    Args:
+        num_nodes (int): Cantidad de nodos del grafo.
+        degree (int): Aristas salientes de cada nodo.
+        max_weight (int): Peso máximo de las aristas.
+        sources (int): Cantidad de orígenes al azar (una ejecución por origen).
+        seed (int): Semilla del grafo y de los orígenes.
+        queues (iterable): Colas a comparar (claves de `QUEUES`).
+
+    Returns:
+        dict: Parámetros, entorno y, por cola, tiempo mediano en segundos,
+        nodos fijados por segundo y pico de entradas en la cola.
+    """
+    graph = random_graph(num_nodes, degree, max_weight, seed)
+    origins = np.random.default_rng(seed + 1).integers(0, num_nodes, size=sources).tolist()
+
+    results = {}
+    distances = {}
+    for queue in queues:
+        times, settled = [], 0
+        for source in origins:
+            start = time.perf_counter()
+            dist, _ = dijkstra(graph, source, queue=queue)
+            times.append(time.perf_counter() - start)
+            settled += int(np.isfinite(dist).sum())
+        distances[queue] = dist
+        results[queue] = {
+            "seconds": statistics.median(times),
+            "settled_per_second": settled / sum(times),
+            "peak_entries": peak_entries(graph, origins[0], queue),
+        }
+
+    # Todas las colas tienen que dar las mismas distancias
+    reference = next(iter(distances.values()))
+    for queue, dist in distances.items():
+        if not np.array_equal(dist, reference):
+            raise AssertionError(f"La cola {queue} dio distancias distintas")
+
+    return {
+        "params": {"nodes": num_nodes, "edges": graph.num_edges, "max_weight": max_weight, "sources": sources},
+        "platform": {"python": platform.python_version(), "machine": platform.machine()},
+        "queues": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara las colas de prioridad de Dijkstra.")
+    parser.add_argument("--nodes", type=int, default=200_000, help="Cantidad de nodos")
+    parser.add_argument("--degree", type=int, default=4, help="Aristas salientes por nodo")
+    parser.add_argument("--max-weight", type=int, default=100, help="Peso máximo de las aristas")
+    parser.add_argument("--sources", type=int, default=5, help="Orígenes por cola")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla")
+    parser.add_argument("--queues", nargs="+", choices=list(QUEUES), default=list(QUEUES), help="Colas a comparar")
+    parser.add_argument("--output", help="Archivo JSON con los resultados")
+    args = parser.parse_args()
+
+    results = run(args.nodes, args.degree, args.max_weight, args.sources, args.seed, args.queues)
+    params = results["params"]
+    print(f"{params['nodes']} nodos, {params['edges']} aristas, pesos 1..{params['max_weight']}")
+    print(f"{'cola':<10}{'tiempo (s)':>12}{'nodos/s':>14}{'pico cola':>12}")
+    for queue, r in results["queues"].items():
+        print(f"{queue:<10}{r['seconds']:>12.3f}{r['settled_per_second']:>14,.0f}{r['peak_entries']:>12,}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
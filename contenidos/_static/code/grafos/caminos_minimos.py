@@ -1,31 +1,44 @@
 """
-Algoritmos de caminos mínimos en grafos: Dijkstra y Bellman-Ford.
+Algoritmos de caminos mínimos en grafos: Dijkstra, Bellman-Ford y SPFA.
 Incluye funciones para trazar paso a paso y visualización interactiva.
+
+El Dijkstra de estas trazas usa siempre `heapq` con borrado perezoso: la
+cola de cada paso se reconstruye repitiendo sus operaciones de `heapq` (ver
+`grafos.trace`) y los pasos "ya fue visitado" muestran las entradas viejas,
+que son parte de lo que se quiere enseñar. Las colas con decrease-key de
+`grafos.heaps` se eligen con `queue` en `grafos.csr.dijkstra`,
+`grafos.distancias` y `grafos.rutas.Router`.
 """
 
-import io
-import base64
 import json
 import secrets
+from collections import deque
 from heapq import heappush, heappop
 
 import networkx as nx
-import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 from IPython.display import HTML, display
 
+from .csr import predecessor_cycle
+from .frames import render_frames
+from .renderer import renderer_for
+from .trace import POP, PUSH, Trace, iter_deltas, iter_states
+from .widget import svg_widget_html, widget_data
+
 
-def dijkstra_trace_fine(graph, source):
+def _dijkstra_events(graph, source):
     """
-    Ejecuta Dijkstra paso a paso y guarda cada estado para visualización.
+    Prepara la ejecución de Dijkstra paso a paso como una secuencia de deltas.
 
     Args:
         graph (nx.Graph): Grafo dirigido y ponderado.
         source: Nodo origen.
 
     Returns:
-        list[dict]: Lista de estados del algoritmo.
+        tuple: Campos del estado inicial, cola inicial y generador de pasos
+        (action, current, changes, pq_ops, summary); el resumen cierra cada
+        vértice finalizado (ver `grafos.trace.iter_states`).
     """
     dist = {v: float("inf") for v in graph.nodes()}
     prev = {v: None for v in graph.nodes()}
@@ -33,74 +46,82 @@ def dijkstra_trace_fine(graph, source):
     pq = []
     dist[source] = 0
     heappush(pq, (0, source))
+    fields = {"dist": dict(dist), "prev": dict(prev), "visited": dict(visited)}
+
+    def events():
+        while pq:
+            _, v = heappop(pq)
+            if visited[v]:
+                yield f"{v} desencolado, ya fue visitado por lo tanto no se procesa", v, None, [(POP,)], None
+                continue
+
+            visited[v] = True
+            adjacent = list(graph[v].items())
+            updates = 0
+            summary = None if adjacent else f"{v} finalizado con distancia {dist[v]}"
+            yield f"{v} desencolado, se marca como visitado", v, [("visited", v, True)], [(POP,)], summary
+
+            for i, (w, edata) in enumerate(adjacent):
+                changes = pq_ops = None
+                if not visited[w]:
+                    if dist[v] + edata["weight"] < dist[w]:
+                        dist[w] = dist[v] + edata["weight"]
+                        prev[w] = v
+                        heappush(pq, (dist[w], w))
+                        changes, pq_ops = [("dist", w, dist[w]), ("prev", w, v)], [(PUSH, (dist[w], w))]
+                        updates += 1
+                        action = f"Procesar adyacente {w} (actualiza y encola)"
+                    else:
+                        action = f"Procesar adyacente {w} (sin cambio)"
+                else:
+                    action = f"Procesar adyacente {w} (ya visitado, se ignora)"
+                if i == len(adjacent) - 1:
+                    summary = f"{v} finalizado con distancia {dist[v]} ({updates} adyacentes actualizados)"
+                yield action, v, changes, pq_ops, summary
+
+    return fields, list(pq), events()
+
+
+def dijkstra_trace_fine(graph, source, keyframe_interval=None):
+    """
+    Ejecuta Dijkstra paso a paso y guarda cada estado para visualización.
 
-    steps = []
-    step = 1
-
-    while pq:
-        _, v = heappop(pq)
-        if visited[v]:
-            steps.append(
-                dict(
-                    step=step,
-                    action=(f"{v} desencolado, ya fue visitado por lo tanto no se procesa"),
-                    current=v,
-                    dist=dict(dist),
-                    prev=dict(prev),
-                    visited=dict(visited),
-                    pq=list(pq),
-                )
-            )
-            step += 1
-            continue
-
-        visited[v] = True
-        steps.append(
-            dict(
-                step=step,
-                action=f"{v} desencolado, se marca como visitado",
-                current=v,
-                dist=dict(dist),
-                prev=dict(prev),
-                visited=dict(visited),
-                pq=list(pq),
-            )
-        )
-        step += 1
-
-        for w, edata in graph[v].items():
-            if not visited[w]:
-                updated = False
-                if dist[v] + edata["weight"] < dist[w]:
-                    dist[w] = dist[v] + edata["weight"]
-                    prev[w] = v
-                    heappush(pq, (dist[w], w))
-                    updated = True
-                steps.append(
-                    dict(
-                        step=step,
-                        action=(f"Procesar adyacente {w} " f"({'actualiza y encola' if updated else 'sin cambio'})"),
-                        current=v,
-                        dist=dict(dist),
-                        prev=dict(prev),
-                        visited=dict(visited),
-                        pq=list(pq),
-                    )
-                )
-            else:
-                steps.append(
-                    dict(
-                        step=step,
-                        action=(f"Procesar adyacente {w} (ya visitado, se ignora)"),
-                        current=v,
-                        dist=dict(dist),
-                        prev=dict(prev),
-                        visited=dict(visited),
-                        pq=list(pq),
-                    )
-                )
-            step += 1
-    return steps
+    Cada paso guarda sólo lo que cambió (ver `grafos.trace`), así que la
+    traza ocupa O(pasos + V) en lugar de una copia del estado por paso.
+
+    Args:
+        graph (nx.Graph): Grafo dirigido y ponderado.
+        source: Nodo origen.
+        keyframe_interval (int, opcional): Pasos entre copias completas del
+            estado (ver `Trace`).
+
+    Returns:
+        Trace: Secuencia de estados del algoritmo; `steps[i]` es un dict con
+        step, action, current, dist, prev, visited y pq.
+    """
+    return _record(_dijkstra_events(graph, source), keyframe_interval)
+
+
+def iter_dijkstra_trace(graph, source, max_frames=None, collapse=False):
+    """
+    Genera los estados de Dijkstra a medida que el algoritmo avanza.
+
+    A diferencia de `dijkstra_trace_fine` no guarda la traza, y puede acotar
+    la cantidad de estados para que el costo de renderizarlos no dependa del
+    tamaño del grafo.
+
+    Args:
+        graph (nx.Graph): Grafo dirigido y ponderado.
+        source: Nodo origen.
+        max_frames (int, opcional): Cantidad máxima de estados; se toman pasos
+            equiespaciados y siempre el último.
+        collapse (bool): Un estado por vértice finalizado (después de
+            procesar sus adyacentes) en lugar de uno por paso.
+
+    Yields:
+        dict: Estado del algoritmo, como los de `dijkstra_trace_fine`.
+    """
+    yield from _iter(_dijkstra_events(graph, source), max_frames, collapse)
 
 
 def render_frame_dijkstra(graph, step, pos=None):
@@ -120,8 +141,8 @@ def render_frame_dijkstra(graph, step, pos=None):
     dist = step["dist"]
     prev = step["prev"]
 
-    if pos is None:
-        pos = nx.spring_layout(graph, seed=7)
+    # La figura y el layout se reutilizan entre pasos del mismo grafo
+    renderer = renderer_for(graph, pos)
 
     node_colors = []
     for n in graph.nodes():
@@ -135,21 +156,7 @@ def render_frame_dijkstra(graph, step, pos=None):
         if p is not None:
             tree_edges.add((p, v))
 
-    fig, ax = plt.subplots(figsize=(6, 4.5))
-    nx.draw_networkx_edges(graph, pos, ax=ax, edge_color="#cccccc", width=1.5)
-    if tree_edges:
-        nx.draw_networkx_edges(graph, pos, ax=ax, edgelist=list(tree_edges), edge_color="#222222", width=2.5)
-    nx.draw_networkx_nodes(graph, pos, ax=ax, node_color=node_colors, node_size=650, edgecolors="#333", linewidths=1.2)
-    nx.draw_networkx_labels(graph, pos, font_color="white", font_weight="bold")
-    nx.draw_networkx_edge_labels(graph, pos, edge_labels=nx.get_edge_attributes(graph, "weight"), font_size=9)
-    ax.set_title(f"{step['action']} (paso {step['step']})")
-    ax.axis("off")
-
-    buf = io.BytesIO()
-    fig.tight_layout()
-    fig.savefig(buf, format="png", dpi=150)
-    plt.close(fig)
-    img_b64 = base64.b64encode(buf.getvalue()).decode("ascii")
+    img = renderer.render(f"{step['action']} (paso {step['step']})", node_colors, tree_edges)
 
     def fmt(x):
         return "∞" if np.isinf(x) else int(x)
@@ -168,23 +175,41 @@ def render_frame_dijkstra(graph, step, pos=None):
     pq_html = pq_df.to_html(index=False, classes="pq-table")
 
     return {
-        "img": f"data:image/png;base64,{img_b64}",
+        "img": img,
         "table": styled.to_html(),
         "pq": pq_html,
     }
 
 
-def show_dijkstra_step_by_step(graph, source):
+def show_dijkstra_step_by_step(graph, source, max_frames=None, collapse=False, processes=None, cache=None, mode="png"):
     """
     Muestra la ejecución paso a paso del algoritmo de Dijkstra.
 
     Args:
         graph (nx.Graph): Grafo dirigido y ponderado.
         source: Nodo origen.
+        max_frames (int, opcional): Cantidad máxima de cuadros a renderizar.
+        collapse (bool): Un cuadro por vértice finalizado en lugar de uno por paso.
+        processes (int, opcional): Procesos para renderizar los cuadros (ver
+            `grafos.frames.render_frames`).
+        cache (bool, str o Path, opcional): Caché en disco de los cuadros
+            (ver `grafos.frames.render_frames`); por defecto sólo se usa si
+            está definida `$GRAFOS_CACHE_DIR`.
+        mode (str): "png" para una imagen y una tabla por cuadro, o "svg"
+            para que el navegador dibuje el grafo y la tabla a partir de los
+            cambios de cada paso (ver `grafos.widget`); el resultado es
+            varios órdenes de magnitud más chico.
     """
-    steps = dijkstra_trace_fine(graph, source)
+    if mode == "svg":
+        fields, pq, events = _dijkstra_events(graph, source)
+        deltas = iter_deltas(fields, pq, events, max_frames, collapse)
+        data = widget_data(graph, nx.spring_layout(graph, seed=7), "dijkstra", fields, pq, deltas, source)
+        display(HTML(svg_widget_html(data)))
+        return
+
+    steps = iter_dijkstra_trace(graph, source, max_frames, collapse)
     pos = nx.spring_layout(graph, seed=7)
-    frames = [render_frame_dijkstra(graph, s, pos) for s in steps]
+    frames = render_frames(render_frame_dijkstra, graph, steps, pos, processes=processes, cache=cache)
 
     uid = secrets.token_hex(3)
     root_id = f"dij-{uid}"
@@ -242,72 +267,123 @@ def show_dijkstra_step_by_step(graph, source):
     display(HTML(html))
 
 
-def bellman_ford_trace(graph, source):
+def _bellman_ford_events(graph, source, early_exit=False):
     """
-    Ejecuta Bellman-Ford paso a paso y guarda cada estado para visualización.
+    Prepara la ejecución de Bellman-Ford paso a paso como una secuencia de deltas.
+
+    `prev_dist`, las distancias al comenzar la iteración, cambia sólo en el
+    primer paso de cada iteración.
 
     Args:
         graph (nx.Graph): Grafo dirigido y ponderado.
         source: Nodo origen.
+        early_exit (bool): Terminar después de una iteración sin cambios.
 
     Returns:
-        list[dict]: Lista de estados del algoritmo.
+        tuple: Como `_dijkstra_events`; el resumen cierra cada iteración.
     """
     dist = {v: float("inf") for v in graph.nodes()}
     prev = {v: None for v in graph.nodes()}
     dist[source] = 0
-
-    steps = []
-    step = 1
+    fields = {"dist": dict(dist), "prev": dict(prev), "prev_dist": dict(dist)}
 
     num_nodes = len(graph.nodes())
     edges = [(u, v, edata["weight"]) for u, v, edata in graph.edges(data=True)]
 
-    # |V|-1 iteraciones
-    for i in range(num_nodes - 1):
-        dist_old = dict(dist)
+    def events():
+        # Nodos cuya distancia cambió desde el comienzo de la iteración
+        changed = set()
+
+        # |V|-1 iteraciones
+        for i in range(num_nodes - 1):
+            new_iteration = [("prev_dist", n, dist[n]) for n in changed]
+            changed = set()
+            for j, (u, v, w) in enumerate(edges):
+                action = f"Iteración {i+1}, relajar arista {u}->{v} (peso {w})"
+                changes = new_iteration
+                new_iteration = []
+                if dist[u] + w < dist[v]:
+                    dist[v] = dist[u] + w
+                    prev[v] = u
+                    changed.add(v)
+                    changes += [("dist", v, dist[v]), ("prev", v, u)]
+                    action += " → se actualiza"
+                else:
+                    action += " → sin cambio"
+                summary = None
+                if j == len(edges) - 1:
+                    summary = f"Fin de la iteración {i+1} ({len(changed)} distancias actualizadas)"
+                yield action, u, changes, None, summary
+            if early_exit and not changed:
+                action = f"Iteración {i+1} sin cambios: las distancias son definitivas"
+                yield action, None, None, None, action
+                return
+
+        # iteración extra: detectar ciclos negativos
         for u, v, w in edges:
-            action = f"Iteración {i+1}, relajar arista {u}->{v} (peso {w})"
             if dist[u] + w < dist[v]:
-                dist[v] = dist[u] + w
-                prev[v] = u
-                action += " → se actualiza"
-            else:
-                action += " → sin cambio"
-
-            steps.append(
-                dict(
-                    step=step,
-                    action=action,
-                    current=u,
-                    dist=dict(dist),
-                    prev=dict(prev),
-                    prev_dist=dict(dist_old),
-                    pq=[],
-                )
-            )
-            step += 1
-
-    # iteración extra: detectar ciclos negativos
-    for u, v, w in edges:
-        if dist[u] + w < dist[v]:
-            steps.append(
-                dict(
-                    step=step,
-                    action=f"Se detecta ciclo negativo usando arista {u}->{v}",
-                    current=u,
-                    dist=dict(dist),
-                    prev=dict(prev),
-                    prev_dist=dict(dist),
-                    pq=[],
-                )
-            )
-            step += 1
-            break
+                action = f"Se detecta ciclo negativo usando arista {u}->{v}"
+                yield action, u, [("prev_dist", n, dist[n]) for n in changed], None, action
+                break
+
+    return fields, [], events()
+
 
+def _record(prepared, keyframe_interval):
+    fields, pq, events = prepared
+    steps = Trace(fields, pq=pq, keyframe_interval=keyframe_interval)
+    for action, current, changes, pq_ops, _ in events:
+        steps.record(action, current, changes, pq_ops)
     return steps
 
 
+def _iter(prepared, max_frames, collapse):
+    fields, pq, events = prepared
+    return iter_states(fields, pq, events, max_frames, collapse)
+
+
+def bellman_ford_trace(graph, source, keyframe_interval=None, early_exit=False):
+    """
+    Ejecuta Bellman-Ford paso a paso y guarda cada estado para visualización.
+
+    Cada paso guarda sólo lo que cambió (ver `grafos.trace`).
+
+    Args:
+        graph (nx.Graph): Grafo dirigido y ponderado.
+        source: Nodo origen.
+        keyframe_interval (int, opcional): Pasos entre copias completas del
+            estado (ver `Trace`).
+        early_exit (bool): Terminar en cuanto una iteración no actualiza
+            ninguna distancia, como `grafos.csr.bellman_ford`.
+
+    Returns:
+        Trace: Secuencia de estados del algoritmo; `steps[i]` es un dict con
+        step, action, current, dist, prev, prev_dist y pq.
+    """
+    return _record(_bellman_ford_events(graph, source, early_exit), keyframe_interval)
+
+
+def iter_bellman_ford_trace(graph, source, max_frames=None, collapse=False, early_exit=False):
+    """
+    Genera los estados de Bellman-Ford a medida que el algoritmo avanza.
+
+    Args:
+        graph (nx.Graph): Grafo dirigido y ponderado.
+        source: Nodo origen.
+        max_frames (int, opcional): Cantidad máxima de estados; se toman pasos
+            equiespaciados y siempre el último. Con `early_exit` la cantidad
+            de iteraciones no se conoce de antemano y los pasos se eligen
+            igual entre los que realmente se ejecutan.
+        collapse (bool): Un estado por iteración (al terminar de relajar
+            todas las aristas) en lugar de uno por arista.
+        early_exit (bool): Terminar después de una iteración sin cambios.
+
+    Yields:
+        dict: Estado del algoritmo, como los de `bellman_ford_trace`.
+    """
+    yield from _iter(_bellman_ford_events(graph, source, early_exit), max_frames, collapse)
+
+
 def render_frame_bellman_ford(graph, step, pos=None, source=None):
     """
     Renderiza un paso del algoritmo de Bellman-Ford como imagen y tabla.
@@ -326,8 +402,8 @@ def render_frame_bellman_ford(graph, step, pos=None, source=None):
     prev = step["prev"]
     prev_dist = step.get("prev_dist", {n: float("inf") for n in graph.nodes()})
 
-    if pos is None:
-        pos = nx.spring_layout(graph, seed=7)
+    # La figura y el layout se reutilizan entre pasos del mismo grafo
+    renderer = renderer_for(graph, pos)
 
     # Colorear nodos:
     node_colors = []
@@ -348,21 +424,7 @@ def render_frame_bellman_ford(graph, step, pos=None, source=None):
         if p is not None:
             tree_edges.add((p, v))
 
-    fig, ax = plt.subplots(figsize=(6, 4.5))
-    nx.draw_networkx_edges(graph, pos, ax=ax, edge_color="#cccccc", width=1.5)
-    if tree_edges:
-        nx.draw_networkx_edges(graph, pos, ax=ax, edgelist=list(tree_edges), edge_color="#222222", width=2.5)
-    nx.draw_networkx_nodes(graph, pos, ax=ax, node_color=node_colors, node_size=650, edgecolors="#333", linewidths=1.2)
-    nx.draw_networkx_labels(graph, pos, font_color="white", font_weight="bold")
-    nx.draw_networkx_edge_labels(graph, pos, edge_labels=nx.get_edge_attributes(graph, "weight"), font_size=9)
-    ax.set_title(f"{step['action']} (paso {step['step']})")
-    ax.axis("off")
-
-    buf = io.BytesIO()
-    fig.tight_layout()
-    fig.savefig(buf, format="png", dpi=150)
-    plt.close(fig)
-    img_b64 = base64.b64encode(buf.getvalue()).decode("ascii")
+    img = renderer.render(f"{step['action']} (paso {step['step']})", node_colors, tree_edges)
 
     def fmt(x):
         return "∞" if np.isinf(x) else int(x)
@@ -374,26 +436,55 @@ def render_frame_bellman_ford(graph, step, pos=None, source=None):
             "Previo": [prev[n] if prev[n] else "—" for n in graph.nodes()],
         }
     )
+    if "queued" in step:  # SPFA
+        df["En cola"] = ["Sí" if step["queued"][n] else "No" for n in graph.nodes()]
     styled = df.style.hide(axis="index").set_table_attributes('class="bf-table"')
 
     return {
-        "img": f"data:image/png;base64,{img_b64}",
+        "img": img,
         "table": styled.to_html(),
         "pq": f"<p>{step['action']}</p>",
     }
 
 
-def show_bellman_ford_step_by_step(graph, source):
+def show_bellman_ford_step_by_step(
+    graph, source, max_frames=None, collapse=False, processes=None, cache=None, mode="png", early_exit=False
+):
     """
     Muestra la ejecución paso a paso del algoritmo de Bellman-Ford.
 
     Args:
         graph (nx.Graph): Grafo dirigido y ponderado.
         source: Nodo origen.
+        max_frames (int, opcional): Cantidad máxima de cuadros a renderizar.
+        collapse (bool): Un cuadro por iteración en lugar de uno por paso.
+        processes (int, opcional): Procesos para renderizar los cuadros (ver
+            `grafos.frames.render_frames`).
+        cache (bool, str o Path, opcional): Caché en disco de los cuadros
+            (ver `grafos.frames.render_frames`); por defecto sólo se usa si
+            está definida `$GRAFOS_CACHE_DIR`.
+        mode (str): "png" para una imagen y una tabla por cuadro, o "svg"
+            para que el navegador dibuje el grafo y la tabla a partir de los
+            cambios de cada paso (ver `grafos.widget`); el resultado es
+            varios órdenes de magnitud más chico.
+        early_exit (bool): Terminar después de una iteración sin cambios.
     """
-    steps = bellman_ford_trace(graph, source)
+    prepared = _bellman_ford_events(graph, source, early_exit)
+    _show_relaxations(graph, source, prepared, max_frames, collapse, processes, cache, mode)
+
+
+def _show_relaxations(graph, source, prepared, max_frames, collapse, processes, cache, mode):
+    """Widget de Bellman-Ford y SPFA a partir de `_bellman_ford_events` o `_spfa_events`."""
+    if mode == "svg":
+        fields, pq, events = prepared
+        deltas = iter_deltas(fields, pq, events, max_frames, collapse)
+        data = widget_data(graph, nx.spring_layout(graph, seed=7), "bellman_ford", fields, pq, deltas, source)
+        display(HTML(svg_widget_html(data)))
+        return
+
+    steps = _iter(prepared, max_frames, collapse)
     pos = nx.spring_layout(graph, seed=7)
-    frames = [render_frame_bellman_ford(graph, s, pos, source) for s in steps]
+    frames = render_frames(render_frame_bellman_ford, graph, steps, pos, source, processes=processes, cache=cache)
 
     uid = secrets.token_hex(3)
     root_id = f"bf-{uid}"
@@ -449,3 +540,133 @@ def show_bellman_ford_step_by_step(graph, source):
   </div>
   """
     display(HTML(html))
+
+
+def _spfa_events(graph, source):
+    """
+    Prepara la ejecución de SPFA paso a paso como una secuencia de deltas.
+
+    SPFA sólo relaja las aristas de los nodos cuya distancia mejoró, que
+    esperan en una cola FIFO (`queued` indica cuáles están en ella).
+    `prev_dist` son las distancias al desencolar el nodo actual, así que se
+    resaltan los nodos mejorados al procesarlo. Un ciclo negativo se detecta
+    cuando el camino hasta un nodo llega a tener |V| aristas.
+
+    Args:
+        graph (nx.Graph): Grafo dirigido y ponderado.
+        source: Nodo origen.
+
+    Returns:
+        tuple: Como `_dijkstra_events`; el resumen cierra cada nodo procesado.
+        La cantidad de pasos depende del orden de la cola y no tiene una cota
+        útil (|V|·(|V| + |E|) en el peor caso), por eso `max_frames` no la usa.
+    """
+    dist = {v: float("inf") for v in graph.nodes()}
+    prev = {v: None for v in graph.nodes()}
+    queued = {v: False for v in graph.nodes()}
+    dist[source] = 0
+    queued[source] = True
+    fields = {"dist": dict(dist), "prev": dict(prev), "prev_dist": dict(dist), "queued": dict(queued)}
+
+    num_nodes = len(graph.nodes())
+    length = {source: 0}
+    queue = deque([source])
+
+    def events():
+        # Nodos cuya distancia cambió desde que se desencoló el nodo anterior
+        changed = set()
+        while queue:
+            u = queue.popleft()
+            queued[u] = False
+            changes = [("queued", u, False)] + [("prev_dist", n, dist[n]) for n in changed]
+            changed = set()
+            adjacent = list(graph[u].items())
+            summary = None if adjacent else f"{u} procesado (sin adyacentes)"
+            yield f"{u} desencolado ({len(queue)} nodos en la cola)", u, changes, None, summary
+
+            for i, (v, edata) in enumerate(adjacent):
+                w = edata["weight"]
+                action = f"Relajar arista {u}->{v} (peso {w})"
+                changes = None
+                if dist[u] + w < dist[v]:
+                    dist[v] = dist[u] + w
+                    prev[v] = u
+                    length[v] = length[u] + 1
+                    changed.add(v)
+                    changes = [("dist", v, dist[v]), ("prev", v, u)]
+                    if length[v] >= num_nodes:
+                        cycle = predecessor_cycle(prev, v, missing=None)
+                        for n in graph.nodes():
+                            if cycle is not None:
+                                break
+                            cycle = predecessor_cycle(prev, n, missing=None)
+                        action = "Se detecta ciclo negativo: " + " -> ".join(str(n) for n in cycle or [])
+                        yield action, u, changes, None, action
+                        return
+                    if not queued[v]:
+                        queue.append(v)
+                        queued[v] = True
+                        changes.append(("queued", v, True))
+                        action += " → se actualiza y se encola"
+                    else:
+                        action += " → se actualiza (ya está en la cola)"
+                else:
+                    action += " → sin cambio"
+                if i == len(adjacent) - 1:
+                    summary = f"{u} procesado ({len(changed)} distancias actualizadas)"
+                yield action, u, changes, None, summary
+
+    return fields, [], events()
+
+
+def spfa_trace(graph, source, keyframe_interval=None):
+    """
+    Ejecuta SPFA paso a paso y guarda cada estado para visualización.
+
+    Args:
+        graph (nx.Graph): Grafo dirigido y ponderado.
+        source: Nodo origen.
+        keyframe_interval (int, opcional): Pasos entre copias completas del
+            estado (ver `Trace`).
+
+    Returns:
+        Trace: Secuencia de estados del algoritmo; `steps[i]` es un dict con
+        step, action, current, dist, prev, prev_dist, queued y pq.
+    """
+    return _record(_spfa_events(graph, source), keyframe_interval)
+
+
+def iter_spfa_trace(graph, source, max_frames=None, collapse=False):
+    """
+    Genera los estados de SPFA a medida que el algoritmo avanza.
+
+    Args:
+        graph (nx.Graph): Grafo dirigido y ponderado.
+        source: Nodo origen.
+        max_frames (int, opcional): Cantidad máxima de estados; se toman pasos
+            equiespaciados entre los que realmente se ejecutan, y siempre el
+            último.
+        collapse (bool): Un estado por nodo procesado en lugar de uno por arista.
+
+    Yields:
+        dict: Estado del algoritmo, como los de `spfa_trace`.
+    """
+    yield from _iter(_spfa_events(graph, source), max_frames, collapse)
+
+
+def show_spfa_step_by_step(graph, source, max_frames=None, collapse=False, processes=None, cache=None, mode="png"):
+    """
+    Muestra la ejecución paso a paso de SPFA.
+
+    Args:
+        graph (nx.Graph): Grafo dirigido y ponderado.
+        source: Nodo origen.
+        max_frames (int, opcional): Cantidad máxima de cuadros a renderizar.
+        collapse (bool): Un cuadro por nodo procesado en lugar de uno por paso.
+        processes (int, opcional): Procesos para renderizar los cuadros.
+        cache (bool, str o Path, opcional): Caché en disco de los cuadros
+            (ver `grafos.frames.render_frames`); por defecto sólo se usa si
+            está definida `$GRAFOS_CACHE_DIR`.
+        mode (str): "png" o "svg", como en `show_bellman_ford_step_by_step`.
+    """
+    _show_relaxations(graph, source, _spfa_events(graph, source), max_frames, collapse, processes, cache, mode)
@@ -0,0 +1,182 @@
+"""
+Matrices de distancias desde muchos orígenes, en paralelo.
+
+`distance_matrix` ejecuta Dijkstra desde cada origen repartiendo los
+orígenes entre varios procesos. Las aristas del grafo no se copian a cada
+proceso: los arreglos CSR se guardan una vez como archivos `.npy` que los
+procesos abren con `mmap`, así que todos leen las mismas páginas del
+sistema operativo. Dijkstra recorre esos arreglos directamente y convierte
+a listas de Python sólo las aristas del nodo que procesa; lo único que cada
+proceso arma como objetos de Python es O(V): la lista de desplazamientos y
+las distancias y predecesores de la ejecución en curso. Convertir todo el
+grafo a listas haría cada ejecución alrededor de 1,5 veces más rápida, a
+costa de O(E) objetos de Python por proceso.
+
+La matriz de resultados también es un `.npy` mapeado en memoria en el que
+cada proceso escribe sus filas, sin devolverlas por la cola de resultados.
+Con `out` la matriz queda en disco, lo que permite matrices más grandes que
+la memoria.
+
+`johnson` admite pesos negativos (algoritmo de Johnson): una sola ejecución
+de Bellman-Ford (`bellman_ford_vectorized`) desde un nodo virtual conectado a todos con peso 0 da un
+potencial h con el que los pesos w(u, v) + h(u) - h(v) son no negativos y
+los caminos mínimos no cambian; después se ejecuta Dijkstra desde cada
+origen sobre el grafo repesado y se corrigen las distancias.
+
+Example:
+    >>> graph = CSRGraph.from_networkx(g)
+    >>> matrix = distance_matrix(graph, depots, targets=clients, processes=8)
+    >>> matrix[i, j]  # distancia de depots[i] a clients[j]
+"""
+
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from .csr import CSRGraph, _check_dijkstra, _dijkstra, _dijkstra_weights, bellman_ford_vectorized
+
+# Estado de cada proceso del pool, cargado por `_init_worker`
+_worker = {}
+
+
+def _init_worker(directory, matrix_path, queue, has_columns):
+    directory = Path(directory)
+    # Sólo los desplazamientos (O(V)) pasan a ser una lista; las aristas se
+    # leen de los archivos mapeados, compartidos entre todos los procesos
+    offsets = np.load(directory / "offsets.npy", mmap_mode="r").tolist()
+    targets = np.load(directory / "targets.npy", mmap_mode="r")
+    weights = np.load(directory / "weights.npy", mmap_mode="r")
+    _worker.update(
+        graph=(offsets, targets, weights),
+        queue=queue,
+        columns=np.load(directory / "columns.npy") if has_columns else None,
+        matrix=np.load(matrix_path, mmap_mode="r+"),
+    )
+
+
+def _run_rows(task):
+    first, sources = task
+    offsets, targets, weights = _worker["graph"]
+    matrix, columns = _worker["matrix"], _worker["columns"]
+    for i, s in enumerate(sources):
+        dist, _ = _dijkstra(offsets, targets, weights, s, _worker["queue"])
+        dist = np.array(dist, dtype=np.float64)
+        matrix[first + i] = dist if columns is None else dist[columns]
+    matrix.flush()
+    return len(sources)
+
+
+def _indices(graph, labels):
+    return np.array([graph.index[label] for label in labels], dtype=np.int64)
+
+
+def distance_matrix(graph, sources, targets=None, processes=None, queue="heapq", out=None):
+    """
+    Distancias mínimas desde cada origen con Dijkstra, en varios procesos.
+
+    Args:
+        graph (CSRGraph): Grafo con pesos no negativos.
+        sources (iterable): Etiquetas de los nodos origen (una fila cada uno).
+        targets (iterable, opcional): Etiquetas de los nodos destino (una
+            columna cada uno); por defecto, todos los nodos en orden.
+        processes (int, opcional): Procesos; por defecto, la cantidad de
+            CPUs. Con 1 se calcula en el proceso actual.
+        queue (str): Cola de prioridad de Dijkstra (ver `grafos.csr.dijkstra`).
+        out (str o Path, opcional): Archivo `.npy` donde guardar la matriz; se
+            devuelve mapeada en memoria en lugar de cargada.
+
+    Returns:
+        np.ndarray: Matriz float64 de len(sources) × len(targets), con inf
+        donde el destino no es alcanzable.
+    """
+    _check_dijkstra(graph, queue)
+    rows = _indices(graph, sources)
+    columns = None if targets is None else _indices(graph, targets)
+    shape = (len(rows), graph.num_nodes if columns is None else len(columns))
+    processes = min(processes or os.cpu_count() or 1, max(len(rows), 1))
+
+    if processes == 1:
+        if out is not None:
+            matrix = np.lib.format.open_memmap(out, mode="w+", dtype=np.float64, shape=shape)
+        else:
+            matrix = np.empty(shape, dtype=np.float64)
+        # En un solo proceso conviene convertir el grafo a listas una vez
+        offsets, csr_targets = graph.offsets.tolist(), graph.targets.tolist()
+        weights = _dijkstra_weights(graph, queue)
+        for i, s in enumerate(rows.tolist()):
+            dist = np.array(_dijkstra(offsets, csr_targets, weights, s, queue)[0], dtype=np.float64)
+            matrix[i] = dist if columns is None else dist[columns]
+        return matrix
+
+    with tempfile.TemporaryDirectory(prefix="grafos-") as directory:
+        directory = Path(directory)
+        np.save(directory / "offsets.npy", graph.offsets)
+        np.save(directory / "targets.npy", graph.targets)
+        np.save(directory / "weights.npy", graph.weights)
+        if columns is not None:
+            np.save(directory / "columns.npy", columns)
+        matrix_path = Path(out) if out is not None else directory / "matrix.npy"
+        np.lib.format.open_memmap(matrix_path, mode="w+", dtype=np.float64, shape=shape).flush()
+
+        # Bloques de orígenes contiguos: cada proceso escribe filas consecutivas
+        size = max(1, len(rows) // (4 * processes))
+        tasks = [(i, rows[i : i + size].tolist()) for i in range(0, len(rows), size)]
+        initargs = (str(directory), str(matrix_path), queue, columns is not None)
+        with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=initargs) as pool:
+            for _ in pool.map(_run_rows, tasks):
+                pass
+
+        if out is not None:
+            return np.load(matrix_path, mmap_mode="r+")
+        return np.load(matrix_path)
+
+
+def johnson(graph, sources=None, targets=None, processes=None, out=None):
+    """
+    Distancias mínimas entre pares con el algoritmo de Johnson.
+
+    Admite pesos negativos. Con `sources` y `targets` por defecto calcula
+    todos contra todos.
+
+    Args:
+        graph (CSRGraph): Grafo.
+        sources (iterable, opcional): Etiquetas de los orígenes; por defecto, todos.
+        targets (iterable, opcional): Etiquetas de los destinos; por defecto, todos.
+        processes (int, opcional): Procesos para las ejecuciones de Dijkstra.
+        out (str o Path, opcional): Archivo `.npy` donde guardar la matriz.
+
+    Returns:
+        np.ndarray: Matriz de distancias, como `distance_matrix`.
+
+    Raises:
+        NegativeCycleError: Si el grafo tiene un ciclo negativo.
+    """
+    sources = graph.nodes if sources is None else list(sources)
+    n = graph.num_nodes
+    potential = np.zeros(n)
+    if graph.num_edges and graph.weights.min() < 0:
+        # Nodo virtual n con aristas de peso 0 hacia todos los nodos
+        augmented = CSRGraph.from_arrays(
+            np.concatenate((graph.sources(), np.full(n, n))),
+            np.concatenate((graph.targets, np.arange(n))),
+            np.concatenate((graph.weights, np.zeros(n))),
+            n + 1,
+            graph.nodes + [object()],
+        )
+        potential = bellman_ford_vectorized(augmented, augmented.nodes[n])[0][:n]
+
+    # Pesos reducidos; el redondeo puede dejar valores apenas negativos
+    edge_sources = graph.sources()
+    reduced = graph.weights + potential[edge_sources] - potential[graph.targets]
+    reweighted = CSRGraph(graph.offsets, graph.targets, np.maximum(reduced, 0.0), graph.nodes)
+
+    matrix = distance_matrix(reweighted, sources, targets, processes=processes, out=out)
+    rows = _indices(graph, sources)
+    columns = np.arange(n) if targets is None else _indices(graph, targets)
+    # inf - h(u) + h(v) sigue siendo inf
+    matrix -= potential[rows][:, None]
+    matrix += potential[columns][None, :]
+    return matrix
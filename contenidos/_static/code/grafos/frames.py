@@ -0,0 +1,233 @@
+"""
+Renderizado de cuadros de los widgets paso a paso, en paralelo y con caché.
+
+Cada cuadro es una figura de matplotlib codificada como PNG más sus tablas
+HTML, y renderizarlo lleva del orden de cientos de milisegundos.
+`render_frames` busca primero cada cuadro en una caché en disco direccionada
+por contenido: la clave es un hash del renderizador, el grafo (nodos,
+aristas y pesos), las posiciones y el estado del paso. Sólo los cuadros que
+faltan se renderizan (en unos pocos procesos si son muchos) y se guardan
+para la próxima vez. Volver a construir el libro o a ejecutar un notebook reutiliza
+los cuadros ya generados.
+
+La caché está desactivada por defecto, para no escribir en el disco de
+quien sólo ejecuta un notebook. Se activa definiendo `$GRAFOS_CACHE_DIR`
+(por ejemplo al construir el libro) o pasando `cache=True` (se guarda en
+`$XDG_CACHE_HOME/grafos/frames`, o en `~/.cache/grafos/frames`) o un
+directorio. Ocupa como mucho `CACHE_MAX_BYTES`: al superarlo se borran
+los cuadros usados hace más tiempo. Para invalidarla alcanza con borrar
+el directorio.
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+
+# Cambiarlo cuando cambie el aspecto de los cuadros, para no reutilizar los viejos
+CACHE_VERSION = 3
+
+# Cuadros que tienen que faltar para abrir procesos cuando no se indica `processes`
+PARALLEL_MIN_FRAMES = 16
+
+# Procesos del pool por defecto: más procesos no compensan lo que cuesta lanzarlos
+DEFAULT_PROCESSES = 4
+
+# Tamaño máximo de la caché en disco; al podarla se deja en 3/4 de esto
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+def default_cache_dir():
+    """Directorio de la caché de cuadros."""
+    if "GRAFOS_CACHE_DIR" in os.environ:
+        return Path(os.environ["GRAFOS_CACHE_DIR"])
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "grafos" / "frames"
+
+
+def _resolve_cache(cache):
+    """Directorio de la caché según el argumento `cache`, o None si está desactivada."""
+    if cache is None:
+        cache = "GRAFOS_CACHE_DIR" in os.environ
+    if cache is False:
+        return None
+    if cache is True:
+        return default_cache_dir()
+    return Path(cache)
+
+
+def prune_cache(cache_dir, max_bytes=CACHE_MAX_BYTES):
+    """
+    Borra los cuadros usados hace más tiempo si la caché ocupa más de `max_bytes`.
+
+    Para no podar en cada llamada, se borra hasta dejar 3/4 de `max_bytes`.
+
+    Args:
+        cache_dir (str o Path): Directorio de la caché.
+        max_bytes (int): Tamaño máximo de la caché.
+
+    Returns:
+        int: Cantidad de cuadros borrados.
+    """
+    entries = []
+    for path in Path(cache_dir).glob("*/*.json"):
+        try:
+            stat = path.stat()
+        except OSError:  # otro proceso lo borró
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    if total <= max_bytes:
+        return 0
+
+    removed = 0
+    entries.sort(key=lambda entry: entry[0])
+    for _, size, path in entries:
+        if total <= max_bytes * 3 // 4:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
+
+
+def frame_key(render, graph, step, pos, *args):
+    """
+    Calcula la clave de caché de un cuadro.
+
+    Args:
+        render (callable): Función que renderiza el cuadro.
+        graph (nx.Graph): Grafo.
+        step (dict): Estado del algoritmo.
+        pos (dict): Posiciones de los nodos.
+        *args: Argumentos adicionales de `render`.
+
+    Returns:
+        str: Hash SHA-256 en hexadecimal.
+    """
+    nodes = list(graph.nodes())
+    payload = (
+        CACHE_VERSION,
+        f"{render.__module__}.{render.__qualname__}",
+        graph.is_directed(),
+        nodes,
+        [(u, v, data.get("weight")) for u, v, data in graph.edges(data=True)],
+        [tuple(round(float(x), 6) for x in pos[n]) for n in nodes],
+        sorted(step.items(), key=lambda item: item[0]),
+        args,
+    )
+    return hashlib.sha256(repr(payload).encode("utf-8")).hexdigest()
+
+
+def _cache_path(cache_dir, key):
+    return cache_dir / key[:2] / f"{key}.json"
+
+
+def _load(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            frame = json.load(f)
+        # La fecha de modificación marca el último uso, para podar
+        os.utime(path)
+        return frame
+    except (OSError, ValueError):
+        return None
+
+
+def _store(path, frame):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Escribir aparte y reemplazar: otro proceso nunca lee un cuadro a medias
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(frame, f)
+    os.replace(tmp, path)
+
+
+def _render_one(task):
+    render, graph, step, pos, args = task
+    return render(graph, step, pos, *args)
+
+
+def render_frames(render, graph, steps, pos, *args, processes=None, cache=None):
+    """
+    Renderiza los cuadros de una traza reutilizando los que están en caché.
+
+    Los estados se consumen a medida que llegan: la clave de cada uno se
+    calcula y, si falta en la caché, se renderiza (o se envía a un proceso)
+    sin esperar a tener la traza completa.
+
+    Args:
+        render (callable): Función de nivel de módulo con la firma
+            `render(graph, step, pos, *args)`, por ejemplo
+            `render_frame_dijkstra`.
+        graph (nx.Graph): Grafo.
+        steps (iterable): Estados del algoritmo.
+        pos (dict): Posiciones de los nodos (deben ser siempre las mismas
+            para que la caché sirva).
+        *args: Argumentos adicionales de `render`.
+        processes (int, opcional): Procesos para renderizar los cuadros que
+            faltan. Por defecto se renderiza en el proceso actual y sólo si
+            faltan al menos `PARALLEL_MIN_FRAMES` cuadros se abre un pool de
+            hasta `DEFAULT_PROCESSES` procesos (lanzarlos cuesta más que
+            renderizar unos pocos cuadros). Con 1 se renderiza siempre en el
+            proceso actual.
+        cache (bool, str o Path, opcional): True para usar la caché en
+            `default_cache_dir()`, un directorio para usar ese, o False para
+            no leerla ni escribirla. Por defecto sólo se usa si está definida
+            `$GRAFOS_CACHE_DIR`.
+
+    Returns:
+        list[dict]: Cuadros en el orden de `steps`.
+    """
+    cache_dir = _resolve_cache(cache)
+    cache = cache_dir is not None
+    if processes is None:
+        processes, threshold = min(DEFAULT_PROCESSES, os.cpu_count() or 1), PARALLEL_MIN_FRAMES
+    else:
+        threshold = 2
+
+    # Cada cuadro es el renderizado, o un Future mientras un proceso lo renderiza
+    frames, paths = [], []
+    # Cuadros que faltan y todavía no se enviaron al pool (antes de abrirlo)
+    waiting = []
+    pool = None
+    stored = 0
+    try:
+        for step in steps:
+            path = _cache_path(cache_dir, frame_key(render, graph, step, pos, *args)) if cache else None
+            frames.append(_load(path) if cache else None)
+            paths.append(path)
+            if frames[-1] is not None:
+                continue
+            waiting.append((len(frames) - 1, (render, graph, step, pos, args)))
+            if pool is None and processes > 1 and len(waiting) >= threshold:
+                pool = ProcessPoolExecutor(max_workers=processes)
+            if pool is not None:
+                for i, task in waiting:
+                    frames[i] = pool.submit(_render_one, task)
+                waiting.clear()
+
+        # Menos cuadros que el umbral: se renderizan en este proceso
+        for i, task in waiting:
+            frames[i] = _render_one(task)
+            if cache:
+                _store(paths[i], frames[i])
+                stored += 1
+        if pool is not None:
+            for i, frame in enumerate(frames):
+                if isinstance(frame, Future):
+                    frames[i] = frame.result()
+                    if cache:
+                        _store(paths[i], frames[i])
+                        stored += 1
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    # Sólo puede haber crecido si se guardó algún cuadro
+    if stored:
+        prune_cache(cache_dir)
+    return frames
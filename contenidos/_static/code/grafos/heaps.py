@@ -0,0 +1,248 @@
+"""
+Colas de prioridad para Dijkstra con nodos numerados de 0 a n - 1.
+
+Todas tienen la misma interfaz:
+
+- `push(item, priority)` agrega `item` o, si ya está, baja su prioridad
+  (decrease-key); nunca la sube.
+- `pop()` saca el elemento de menor prioridad y devuelve (prioridad, item).
+- `peek()` devuelve lo mismo que `pop()` sin sacarlo.
+- `len(queue)` y `bool(queue)`.
+
+Implementaciones:
+
+- `LazyHeap`: `heapq` con borrado perezoso, como los Dijkstra del paquete
+  (`grafos.csr.dijkstra` con `queue="heapq"` usa la lista de `heapq` en
+  línea, sin esta clase, para ahorrarse las llamadas a métodos). Bajar una
+  prioridad agrega otra entrada y las viejas se descartan al salir, así que
+  la cola puede llegar a O(E) entradas.
+- `IndexedHeap`: heap d-ario que guarda la posición de cada elemento y
+  mueve la entrada en el lugar. Nunca tiene más de n entradas; con aridad 4
+  el árbol es la mitad de alto que el binario y sacar el mínimo recorre
+  menos niveles.
+- `RadixHeap`: para prioridades enteras no negativas y monótonas (nunca
+  menores que la última que salió, como en Dijkstra). Reparte los
+  elementos en cubetas según el bit más alto en el que difieren de la
+  última prioridad que salió; cada elemento baja de cubeta a lo sumo
+  log2(C) veces, con C la prioridad máxima.
+
+`QUEUES` asocia un nombre a cada clase, para elegir la cola por parámetro.
+"""
+
+import math
+from heapq import heappop, heappush
+
+
+class LazyHeap:
+    """Cola con `heapq` y borrado perezoso de entradas viejas."""
+
+    def __init__(self, capacity):
+        """
+        Args:
+            capacity (int): Cantidad de elementos posibles (0 .. capacity - 1).
+        """
+        self._heap = []
+        self._priority = [math.inf] * capacity
+        self._queued = [False] * capacity
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def push(self, item, priority):
+        if priority >= self._priority[item] and self._queued[item]:
+            return
+        if not self._queued[item]:
+            self._queued[item] = True
+            self._size += 1
+        self._priority[item] = priority
+        heappush(self._heap, (priority, item))
+
+    def pop(self):
+        heap, current, queued = self._heap, self._priority, self._queued
+        while True:
+            priority, item = heappop(heap)
+            if queued[item] and priority == current[item]:
+                queued[item] = False
+                self._size -= 1
+                return priority, item
+
+    def peek(self):
+        heap, current, queued = self._heap, self._priority, self._queued
+        # Descartar las entradas viejas que quedaron arriba
+        while not (queued[heap[0][1]] and heap[0][0] == current[heap[0][1]]):
+            heappop(heap)
+        return heap[0]
+
+    @property
+    def entries(self):
+        """Entradas en el heap, contando las viejas."""
+        return len(self._heap)
+
+
+class IndexedHeap:
+    """Heap d-ario con decrease-key; a lo sumo una entrada por elemento."""
+
+    def __init__(self, capacity, arity=4):
+        """
+        Args:
+            capacity (int): Cantidad de elementos posibles (0 .. capacity - 1).
+            arity (int): Hijos por nodo del heap.
+        """
+        if arity < 2:
+            raise ValueError("La aridad del heap debe ser al menos 2")
+        self.arity = arity
+        self._items = []
+        self._keys = []
+        # Posición de cada elemento en el heap, -1 si no está
+        self._position = [-1] * capacity
+
+    def __len__(self):
+        return len(self._items)
+
+    def push(self, item, priority):
+        i = self._position[item]
+        if i < 0:
+            i = len(self._items)
+            self._items.append(item)
+            self._keys.append(priority)
+        elif priority < self._keys[i]:
+            self._keys[i] = priority
+        else:
+            return
+        self._sift_up(i, item, priority)
+
+    def pop(self):
+        items, keys, position = self._items, self._keys, self._position
+        item, priority = items[0], keys[0]
+        position[item] = -1
+        last, last_key = items.pop(), keys.pop()
+        if items:
+            self._sift_down(0, last, last_key)
+        return priority, item
+
+    def peek(self):
+        return self._keys[0], self._items[0]
+
+    def _sift_up(self, i, item, priority):
+        items, keys, position, d = self._items, self._keys, self._position, self.arity
+        while i > 0:
+            parent = (i - 1) // d
+            if keys[parent] <= priority:
+                break
+            items[i] = items[parent]
+            keys[i] = keys[parent]
+            position[items[i]] = i
+            i = parent
+        items[i] = item
+        keys[i] = priority
+        position[item] = i
+
+    def _sift_down(self, i, item, priority):
+        items, keys, position, d = self._items, self._keys, self._position, self.arity
+        n = len(items)
+        while True:
+            first = d * i + 1
+            if first >= n:
+                break
+            # Hijo con menor prioridad
+            child, child_key = first, keys[first]
+            for j in range(first + 1, min(first + d, n)):
+                if keys[j] < child_key:
+                    child, child_key = j, keys[j]
+            if child_key >= priority:
+                break
+            items[i] = items[child]
+            keys[i] = child_key
+            position[items[i]] = i
+            i = child
+        items[i] = item
+        keys[i] = priority
+        position[item] = i
+
+
+class RadixHeap:
+    """
+    Radix heap monótono con decrease-key para prioridades enteras no negativas.
+
+    La cubeta 0 tiene los elementos con la misma prioridad que el último que
+    salió (`last`); la cubeta b > 0, los que difieren de `last` por primera
+    vez en el bit b - 1 contando desde el más significativo. Al vaciarse la
+    cubeta 0 se toma la primera cubeta no vacía, su mínimo pasa a ser `last`
+    y sus elementos se reparten en cubetas más bajas.
+    """
+
+    def __init__(self, capacity, max_priority=2**63 - 1):
+        """
+        Args:
+            capacity (int): Cantidad de elementos posibles (0 .. capacity - 1).
+            max_priority (int): Cota de las prioridades (por ejemplo, la suma
+                de los pesos); determina la cantidad de cubetas.
+        """
+        self._buckets = [[] for _ in range(int(max_priority).bit_length() + 1)]
+        self._keys = [0] * capacity
+        # Cubeta y posición en la cubeta de cada elemento (cubeta -1 si no está)
+        self._bucket = [-1] * capacity
+        self._slot = [0] * capacity
+        self._last = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def push(self, item, priority):
+        priority = int(priority)
+        if priority < self._last:
+            raise ValueError("Las prioridades de un radix heap no pueden ser menores que la última que salió")
+        b = self._bucket[item]
+        if b >= 0:
+            if priority >= self._keys[item]:
+                return
+            self._remove(item, b)
+        else:
+            self._size += 1
+        self._keys[item] = priority
+        self._insert(item, (priority ^ self._last).bit_length())
+
+    def pop(self):
+        self._fill()
+        item = self._buckets[0].pop()
+        self._bucket[item] = -1
+        self._size -= 1
+        return self._keys[item], item
+
+    def peek(self):
+        self._fill()
+        item = self._buckets[0][-1]
+        return self._keys[item], item
+
+    def _fill(self):
+        """Si la cubeta 0 está vacía, reparte la primera no vacía a partir de su mínimo."""
+        buckets, keys = self._buckets, self._keys
+        if not buckets[0]:
+            b = 1
+            while not buckets[b]:
+                b += 1
+            moved = buckets[b]
+            buckets[b] = []
+            self._last = last = min(keys[item] for item in moved)
+            for item in moved:
+                self._insert(item, (keys[item] ^ last).bit_length())
+
+    def _insert(self, item, b):
+        bucket = self._buckets[b]
+        self._bucket[item] = b
+        self._slot[item] = len(bucket)
+        bucket.append(item)
+
+    def _remove(self, item, b):
+        # Reemplazar por el último de la cubeta: O(1)
+        bucket = self._buckets[b]
+        last = bucket.pop()
+        if last != item:
+            i = self._slot[item]
+            bucket[i] = last
+            self._slot[last] = i
+
+
+QUEUES = {"heapq": LazyHeap, "indexed": IndexedHeap, "radix": RadixHeap}
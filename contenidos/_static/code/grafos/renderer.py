@@ -0,0 +1,159 @@
+"""
+Dibujo incremental de los pasos de un algoritmo sobre un grafo fijo.
+
+Entre un paso y el siguiente sólo cambian los colores de los nodos, las
+aristas del árbol de predecesores y el título. `StepRenderer` dibuja una
+vez la figura con lo que no cambia (layout, aristas en gris), guarda ese
+fondo y, en cada paso, lo restaura y dibuja encima sólo los artistas que
+dependen del estado (técnica de blitting), más los pesos de las aristas,
+que van entre el árbol y los nodos. La figura, el canvas y los artistas
+se reutilizan entre pasos.
+
+`renderer_for` devuelve un `StepRenderer` por grafo y posiciones, así que
+las funciones `render_frame_*` pueden llamarse paso por paso sin volver a
+calcular el layout ni rearmar la figura.
+"""
+
+import base64
+import io
+from collections import OrderedDict
+
+import matplotlib.colors as mcolors
+import networkx as nx
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import Image
+
+# Cantidad de renderers que se mantienen abiertos en `renderer_for`
+MAX_RENDERERS = 4
+
+_renderers = OrderedDict()
+
+
+class StepRenderer:
+    """
+    Figura de un grafo que se actualiza paso a paso.
+
+    Attributes:
+        graph (nx.Graph): Grafo dibujado.
+        pos (dict): Posiciones de los nodos.
+        nodes (list): Nodos, en el orden en que se esperan sus colores.
+    """
+
+    def __init__(self, graph, pos=None, figsize=(6, 4.5), dpi=150):
+        """
+        Args:
+            graph (nx.Graph): Grafo ponderado.
+            pos (dict, opcional): Posiciones de los nodos; por defecto
+                `nx.spring_layout(graph, seed=7)`, calculado una sola vez.
+            figsize (tuple): Tamaño de la figura en pulgadas.
+            dpi (int): Resolución de la imagen.
+        """
+        self.graph = graph
+        self.pos = pos if pos is not None else nx.spring_layout(graph, seed=7)
+        self.nodes = list(graph.nodes())
+        edges = list(graph.edges())
+
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.figure)
+        ax = self.ax = self.figure.add_subplot()
+
+        # Fijos: forman parte del fondo
+        nx.draw_networkx_edges(graph, self.pos, ax=ax, edge_color="#cccccc", width=1.5)
+        # Dinámicos: se dibujan en cada paso sobre el fondo
+        tree = nx.draw_networkx_edges(graph, self.pos, ax=ax, edgelist=edges, edge_color="#222222", width=2.5)
+        self._nodes = nx.draw_networkx_nodes(
+            graph, self.pos, ax=ax, node_color="#dddddd", node_size=650, edgecolors="#333", linewidths=1.2
+        )
+        labels = nx.draw_networkx_labels(graph, self.pos, ax=ax, font_color="white", font_weight="bold")
+        edge_labels = nx.draw_networkx_edge_labels(
+            graph, self.pos, ax=ax, edge_labels=nx.get_edge_attributes(graph, "weight"), font_size=9
+        )
+        self._title = ax.set_title(" ")
+        ax.axis("off")
+        self.figure.tight_layout()
+
+        # Índice de cada arista en los artistas del árbol (en ambos sentidos si no es dirigido)
+        self._edge_index = {}
+        for i, (u, v) in enumerate(edges):
+            self._edge_index[(u, v)] = i
+            if not graph.is_directed():
+                self._edge_index.setdefault((v, u), i)
+        if isinstance(tree, list):  # grafos dirigidos: una flecha por arista
+            self._arrows, self._lines, self._segments = tree, None, None
+        else:  # no dirigidos: una única LineCollection
+            self._arrows, self._lines = [], tree
+            self._segments = tree.get_segments() if tree is not None else []
+
+        # Orden de dibujo de networkx (zorder): aristas, pesos, nodos, etiquetas
+        self._below = [artist for artist in [*self._arrows, self._lines] if artist is not None]
+        self._above = [*edge_labels.values(), self._nodes, *labels.values(), self._title]
+        for artist in [*self._below, *self._above]:
+            artist.set_animated(True)
+        self.canvas.draw()
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+
+    def render(self, title, node_colors, tree_edges):
+        """
+        Dibuja un paso y lo devuelve como PNG.
+
+        Args:
+            title (str): Título del paso.
+            node_colors (list): Color de cada nodo, en el orden de `nodes`.
+            tree_edges (iterable): Aristas (u, v) del árbol de predecesores.
+
+        Returns:
+            str: Imagen como URI `data:image/png;base64,...`.
+        """
+        visible = {self._edge_index[e] for e in tree_edges if e in self._edge_index}
+        for i, arrow in enumerate(self._arrows):
+            arrow.set_visible(i in visible)
+        if self._lines is not None:
+            self._lines.set_segments([self._segments[i] for i in sorted(visible)])
+        self._nodes.set_facecolor(mcolors.to_rgba_array(node_colors))
+        self._title.set_text(title)
+
+        self.canvas.restore_region(self._background)
+        for artist in self._below:
+            if artist.get_visible():
+                self.ax.draw_artist(artist)
+        for artist in self._above:
+            self.ax.draw_artist(artist)
+
+        # PNG en RGB, sin paleta: cada cuadro es exacto e independiente de los demás
+        image = Image.fromarray(np.asarray(self.canvas.buffer_rgba())[..., :3])
+        buf = io.BytesIO()
+        image.save(buf, format="PNG", compress_level=1)
+        return "data:image/png;base64," + base64.b64encode(buf.getvalue()).decode("ascii")
+
+
+def renderer_for(graph, pos=None):
+    """
+    Devuelve un `StepRenderer` para el grafo y las posiciones, reutilizándolo.
+
+    Los renderers se identifican por el contenido del grafo (nodos, aristas y
+    pesos) y de las posiciones, así que modificar el grafo crea uno nuevo.
+    Se mantienen abiertos los `MAX_RENDERERS` usados más recientemente.
+
+    Args:
+        graph (nx.Graph): Grafo.
+        pos (dict, opcional): Posiciones de los nodos.
+
+    Returns:
+        StepRenderer: Renderer del grafo.
+    """
+    nodes = list(graph.nodes())
+    key = (
+        graph.is_directed(),
+        tuple(nodes),
+        tuple((u, v, data.get("weight")) for u, v, data in graph.edges(data=True)),
+        None if pos is None else tuple(tuple(float(x) for x in pos[n]) for n in nodes),
+    )
+    renderer = _renderers.pop(key, None)
+    if renderer is None:
+        renderer = StepRenderer(graph, pos)
+    _renderers[key] = renderer
+    while len(_renderers) > MAX_RENDERERS:
+        _renderers.popitem(last=False)
+    return renderer
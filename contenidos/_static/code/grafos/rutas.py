@@ -0,0 +1,295 @@
+"""
+Consultas de camino mínimo entre dos nodos sobre grafos CSR.
+
+`grafos.csr.dijkstra` calcula las distancias desde el origen a todos los
+nodos. Para ir de un nodo a otro alcanza con explorar mucho menos:
+
+- Dijkstra con corte: termina al fijar la distancia del destino.
+- Dijkstra bidireccional: avanza a la vez desde el origen sobre el grafo y
+  desde el destino sobre el grafo invertido. Termina cuando la suma de los
+  mínimos de ambas colas alcanza el mejor camino encontrado entre las dos
+  fronteras; en grafos grandes las dos bolas de búsqueda tienen en total
+  mucho menos área que una sola del doble de radio.
+- A*: Dijkstra ordenado por distancia más una estimación de lo que falta
+  (una heurística), que orienta la búsqueda hacia el destino. Con
+  coordenadas, la distancia euclídea es la heurística habitual.
+
+`Router` guarda el grafo invertido y las listas de adyacencia, que se
+construyen una sola vez, y responde consultas con `camino_minimo`. Cada
+consulta informa cuántos nodos fijó, una medida del trabajo realizado
+independiente de la máquina.
+
+La cola de prioridad se elige con `queue`, como en `grafos.csr.dijkstra`:
+con "heapq" (por defecto) se usa `heapq` en línea con borrado perezoso, y
+la cola puede llegar a O(E) entradas; con "indexed" o "radix" (ver
+`grafos.heaps`) cada nodo está a lo sumo una vez en la cola. Estas colas
+reservan arreglos de V posiciones en cada consulta, un costo que sólo
+compensa cuando la consulta explora buena parte del grafo.
+
+Example:
+    >>> graph = CSRGraph.from_networkx(g)
+    >>> router = Router(graph, coords=nx.get_node_attributes(g, "pos"))
+    >>> distance, path, settled = router.camino_minimo("a", "z", method="astar")
+"""
+
+import math
+from heapq import heappop, heappush
+
+import numpy as np
+
+from .csr import CSRGraph
+from .heaps import QUEUES
+
+METHODS = ("bidirectional", "astar", "dijkstra")
+
+
+def euclidean(graph, coords, scale=1.0):
+    """
+    Heurística de A*: distancia euclídea entre las coordenadas de los nodos.
+
+    Es admisible (y consistente) si el peso de cada arista es al menos
+    `scale` por la distancia entre sus extremos, por ejemplo con pesos que
+    son longitudes (`scale=1`) o tiempos con una velocidad máxima v
+    (`scale=1/v`).
+
+    Args:
+        graph (CSRGraph): Grafo.
+        coords: Etiqueta → (x, y), o arreglo de n × 2 en el orden de los nodos.
+        scale (float): Factor por el que se multiplica la distancia.
+
+    Returns:
+        callable: `h(v, t)` con v y t números de nodo.
+    """
+    if isinstance(coords, dict):
+        coords = [coords[node] for node in graph.nodes]
+    coords = np.asarray(coords, dtype=np.float64)
+    xs = coords[:, 0].tolist()
+    ys = coords[:, 1].tolist()
+
+    def h(v, t):
+        return scale * math.hypot(xs[v] - xs[t], ys[v] - ys[t])
+
+    return h
+
+
+class Router:
+    """
+    Consultas de camino mínimo entre pares de nodos de un grafo CSR.
+
+    Attributes:
+        graph (CSRGraph): Grafo, con pesos no negativos.
+        reverse (CSRGraph): Grafo con las aristas invertidas.
+        heuristic (callable): Heurística por defecto de A*, o None.
+        queue (str): Cola de prioridad de las búsquedas.
+    """
+
+    def __init__(self, graph, coords=None, heuristic=None, queue="heapq"):
+        """
+        Args:
+            graph (CSRGraph): Grafo con pesos no negativos.
+            coords (opcional): Coordenadas de los nodos; si se dan, la
+                heurística por defecto de A* es `euclidean(graph, coords)`.
+            heuristic (callable, opcional): Heurística por defecto de A*,
+                `h(v, t)` con números de nodo (tiene prioridad sobre `coords`).
+            queue (str): Cola de prioridad: "heapq", "indexed" o "radix"
+                (sólo con pesos enteros, y no sirve para A*, cuyas
+                prioridades suman una estimación real).
+        """
+        if graph.num_edges and graph.weights.min() < 0:
+            raise ValueError("Las consultas de camino mínimo requieren pesos no negativos")
+        if queue not in QUEUES:
+            raise ValueError(f"Cola desconocida: {queue!r} (se esperaba una de {', '.join(QUEUES)})")
+        if queue == "radix" and not np.array_equal(graph.weights, np.floor(graph.weights)):
+            raise ValueError("El radix heap requiere pesos enteros")
+        self.queue = queue
+        self.graph = graph
+        self.reverse = CSRGraph.from_arrays(graph.targets, graph.sources(), graph.weights, graph.num_nodes, graph.nodes)
+        if heuristic is None and coords is not None:
+            heuristic = euclidean(graph, coords)
+        self.heuristic = heuristic
+
+        # Listas de Python: recorrerlas es más rápido que indexar arreglos de NumPy
+        self._forward = (graph.offsets.tolist(), graph.targets.tolist(), graph.weights.tolist())
+        self._backward = (self.reverse.offsets.tolist(), self.reverse.targets.tolist(), self.reverse.weights.tolist())
+
+    def camino_minimo(self, source, target, method="bidirectional", heuristic=None):
+        """
+        Camino mínimo de `source` a `target`.
+
+        Args:
+            source: Etiqueta del nodo origen.
+            target: Etiqueta del nodo destino.
+            method (str): "bidirectional" (Dijkstra bidireccional), "astar"
+                o "dijkstra" (desde el origen, hasta fijar el destino).
+            heuristic (callable, opcional): Heurística de A*, `h(v, t)` con
+                números de nodo; por defecto, la del router.
+
+        Returns:
+            tuple: (distancia, camino, nodos fijados). La distancia es inf y
+            el camino [] si el destino no es alcanzable; el camino son
+            etiquetas desde el origen; los nodos fijados son los que salieron
+            de las colas con su distancia definitiva (en ambas direcciones).
+        """
+        s, t = self.graph.index[source], self.graph.index[target]
+        lazy = self.queue == "heapq"
+        if method == "bidirectional":
+            distance, path, settled = self._bidirectional(s, t) if lazy else self._bidirectional_queue(s, t)
+        elif method == "astar":
+            heuristic = heuristic or self.heuristic
+            if heuristic is None:
+                raise ValueError("A* requiere una heurística o las coordenadas de los nodos")
+            if self.queue == "radix":
+                raise ValueError("El radix heap requiere prioridades enteras; A* no puede usarlo")
+            distance, path, settled = self._astar(s, t, heuristic) if lazy else self._astar_queue(s, t, heuristic)
+        elif method == "dijkstra":
+            distance, path, settled = self._astar(s, t, _zero) if lazy else self._astar_queue(s, t, _zero)
+        else:
+            raise ValueError(f"Método desconocido: {method!r} (se esperaba uno de {', '.join(METHODS)})")
+        return distance, [self.graph.nodes[v] for v in path], settled
+
+    def _astar(self, s, t, h):
+        offsets, targets, weights = self._forward
+        dist = {s: 0.0}
+        pred = {s: -1}
+        settled = set()
+
+        pq = [(h(s, t), s)]
+        while pq:
+            _, u = heappop(pq)
+            if u in settled:
+                continue
+            settled.add(u)
+            if u == t:
+                return dist[t], _chain(pred, t)[::-1], len(settled)
+            du = dist[u]
+            for v, w in zip(targets[offsets[u] : offsets[u + 1]], weights[offsets[u] : offsets[u + 1]]):
+                nd = du + w
+                if nd < dist.get(v, math.inf):
+                    dist[v] = nd
+                    pred[v] = u
+                    heappush(pq, (nd + h(v, t), v))
+
+        return math.inf, [], len(settled)
+
+    def _astar_queue(self, s, t, h):
+        # Como `_astar`, con una cola de `grafos.heaps` que baja prioridades en el lugar
+        offsets, targets, weights = self._forward
+        dist = {s: 0.0}
+        pred = {s: -1}
+        settled = set()
+
+        pq = QUEUES[self.queue](self.graph.num_nodes)
+        pq.push(s, h(s, t))
+        while pq:
+            _, u = pq.pop()
+            settled.add(u)
+            if u == t:
+                return dist[t], _chain(pred, t)[::-1], len(settled)
+            du = dist[u]
+            for v, w in zip(targets[offsets[u] : offsets[u + 1]], weights[offsets[u] : offsets[u + 1]]):
+                nd = du + w
+                if nd < dist.get(v, math.inf):
+                    dist[v] = nd
+                    pred[v] = u
+                    pq.push(v, nd + h(v, t))
+
+        return math.inf, [], len(settled)
+
+    def _bidirectional(self, s, t):
+        if s == t:
+            return 0.0, [s], 0
+
+        # Índice 0: hacia adelante desde s; índice 1: hacia atrás desde t
+        graphs = (self._forward, self._backward)
+        dist = ({s: 0.0}, {t: 0.0})
+        pred = ({s: -1}, {t: -1})
+        settled = (set(), set())
+        queues = ([(0.0, s)], [(0.0, t)])
+
+        # Mejor camino encontrado y la arista (u, v) donde se unen las búsquedas
+        best, meeting = math.inf, None
+        while queues[0] and queues[1]:
+            # Descartar entradas viejas para que el tope sea una cota válida
+            for side in (0, 1):
+                queue = queues[side]
+                while queue and queue[0][1] in settled[side]:
+                    heappop(queue)
+            if not queues[0] or not queues[1] or queues[0][0][0] + queues[1][0][0] >= best:
+                break
+
+            # Avanzar por el lado con menos nodos en la cola
+            side = 0 if len(queues[0]) <= len(queues[1]) else 1
+            offsets, targets, weights = graphs[side]
+            here, there = dist[side], dist[1 - side]
+            du, u = heappop(queues[side])
+            settled[side].add(u)
+            for v, w in zip(targets[offsets[u] : offsets[u + 1]], weights[offsets[u] : offsets[u + 1]]):
+                nd = du + w
+                if nd < here.get(v, math.inf):
+                    here[v] = nd
+                    pred[side][v] = u
+                    heappush(queues[side], (nd, v))
+                if v in there and nd + there[v] < best:
+                    best = nd + there[v]
+                    meeting = (u, v) if side == 0 else (v, u)
+
+        settled_count = len(settled[0]) + len(settled[1])
+        if meeting is None:
+            return math.inf, [], settled_count
+        u, v = meeting
+        return best, _chain(pred[0], u)[::-1] + _chain(pred[1], v), settled_count
+
+    def _bidirectional_queue(self, s, t):
+        # Como `_bidirectional`, con colas de `grafos.heaps`: sin entradas viejas,
+        # el tope de cada cola ya es una cota válida
+        if s == t:
+            return 0.0, [s], 0
+
+        graphs = (self._forward, self._backward)
+        dist = ({s: 0.0}, {t: 0.0})
+        pred = ({s: -1}, {t: -1})
+        settled = (set(), set())
+        queues = (QUEUES[self.queue](self.graph.num_nodes), QUEUES[self.queue](self.graph.num_nodes))
+        queues[0].push(s, 0)
+        queues[1].push(t, 0)
+
+        best, meeting = math.inf, None
+        while queues[0] and queues[1]:
+            if queues[0].peek()[0] + queues[1].peek()[0] >= best:
+                break
+
+            side = 0 if len(queues[0]) <= len(queues[1]) else 1
+            offsets, targets, weights = graphs[side]
+            here, there = dist[side], dist[1 - side]
+            _, u = queues[side].pop()
+            du = here[u]
+            settled[side].add(u)
+            for v, w in zip(targets[offsets[u] : offsets[u + 1]], weights[offsets[u] : offsets[u + 1]]):
+                nd = du + w
+                if nd < here.get(v, math.inf):
+                    here[v] = nd
+                    pred[side][v] = u
+                    queues[side].push(v, nd)
+                if v in there and nd + there[v] < best:
+                    best = nd + there[v]
+                    meeting = (u, v) if side == 0 else (v, u)
+
+        settled_count = len(settled[0]) + len(settled[1])
+        if meeting is None:
+            return math.inf, [], settled_count
+        u, v = meeting
+        return best, _chain(pred[0], u)[::-1] + _chain(pred[1], v), settled_count
+
+
+def _zero(v, t):
+    """Heurística nula: A* con ella es Dijkstra con corte."""
+    return 0
+
+
+def _chain(pred, v):
+    """Nodos desde `v` siguiendo los predecesores hasta uno sin predecesor."""
+    chain = [v]
+    while pred[v] != -1:
+        v = pred[v]
+        chain.append(v)
+    return chain
@@ -0,0 +1,308 @@
+"""
+Trazas de algoritmos codificadas como deltas, con keyframes para acceso aleatorio.
+
+Guardar una copia completa de `dist`, `prev`, `visited` y la cola de
+prioridad en cada paso hace que una traza ocupe O(pasos × V): Bellman-Ford
+genera V·E pasos. `Trace` guarda el estado inicial y, por cada paso, sólo
+los valores que cambiaron y las operaciones sobre la cola (push/pop). Cada
+`keyframe_interval` pasos guarda además una copia del estado completo, así
+que reconstruir cualquier paso cuesta copiar un keyframe y aplicar a lo sumo
+`keyframe_interval` deltas.
+
+Una `Trace` se comporta como la lista de estados que devolvían antes las
+funciones de traza: tiene `len`, se puede recorrer y `trace[i]` devuelve el
+diccionario completo del paso i (step, action, current, dist, prev, ...).
+
+`iter_states` recorre los mismos pasos a medida que el algoritmo los genera,
+sin guardarlos, y puede acotar la cantidad de estados que devuelve (sin
+conocer de antemano cuántos pasos habrá);
+`iter_deltas` devuelve en cambio sólo lo que cambió entre esos estados.
+"""
+
+import math
+from collections.abc import Sequence
+from heapq import heappop, heappush
+
+PUSH = "push"
+POP = "pop"
+
+
+def _copy_state(fields, pq):
+    return {name: dict(values) for name, values in fields.items()}, None if pq is None else list(pq)
+
+
+def _apply(state, changes, pq_ops):
+    fields, pq = state
+    if changes:
+        for name, key, value in changes:
+            fields[name][key] = value
+    if pq_ops:
+        for op in pq_ops:
+            if op[0] == PUSH:
+                heappush(pq, op[1])
+            else:
+                heappop(pq)
+
+
+def _step_dict(number, action, current, state):
+    fields, pq = state
+    step = dict(step=number, action=action, current=current)
+    for name, values in fields.items():
+        step[name] = dict(values)
+    if pq is not None:
+        step["pq"] = list(pq)
+    return step
+
+
+class Trace(Sequence):
+    """
+    Secuencia de estados de un algoritmo almacenada como deltas.
+
+    El estado tiene campos diccionario (por ejemplo `dist` o `prev`) y,
+    opcionalmente, una cola de prioridad `pq` que se reconstruye repitiendo
+    las operaciones de `heapq`, así que queda idéntica a la del algoritmo.
+
+    Example:
+        >>> trace = Trace({"dist": {"a": 0, "b": float("inf")}}, pq=[(0, "a")])
+        >>> trace.record("a desencolado", "a", pq_ops=[(POP,)])
+        >>> trace.record("actualiza b", "a", [("dist", "b", 4)], [(PUSH, (4, "b"))])
+        >>> trace[1]["dist"], trace[1]["pq"]
+        ({'a': 0, 'b': 4}, [(4, 'b')])
+    """
+
+    def __init__(self, fields, pq=None, keyframe_interval=None):
+        """
+        Args:
+            fields (dict): Nombre del campo → diccionario con su valor inicial.
+            pq (list, opcional): Contenido inicial de la cola de prioridad (un
+                heap válido); si es None los estados no tienen `pq`.
+            keyframe_interval (int, opcional): Pasos entre copias completas del
+                estado. Por defecto max(64, tamaño del estado), con lo que los
+                keyframes ocupan del orden de un valor por paso.
+        """
+        self._initial = {name: dict(values) for name, values in fields.items()}
+        self._initial_pq = None if pq is None else list(pq)
+        if keyframe_interval is None:
+            keyframe_interval = max([64, *(len(values) for values in fields.values())])
+        self.keyframe_interval = keyframe_interval
+
+        self._actions = []
+        self._currents = []
+        self._changes = []
+        self._pq_ops = []
+        self._keyframes = []
+        # Estado después del último paso registrado
+        self._state = _copy_state(self._initial, self._initial_pq)
+
+    def record(self, action, current, changes=None, pq_ops=None):
+        """
+        Agrega un paso.
+
+        Args:
+            action (str): Descripción del paso.
+            current: Nodo que se está procesando.
+            changes (iterable, opcional): Tuplas (campo, clave, valor nuevo).
+            pq_ops (iterable, opcional): Operaciones sobre la cola, en orden:
+                (PUSH, elemento) o (POP,).
+        """
+        changes = tuple(changes) if changes else None
+        pq_ops = tuple(pq_ops) if pq_ops else None
+        self._actions.append(action)
+        self._currents.append(current)
+        self._changes.append(changes)
+        self._pq_ops.append(pq_ops)
+        _apply(self._state, changes, pq_ops)
+        if (len(self._actions) - 1) % self.keyframe_interval == 0:
+            self._keyframes.append(_copy_state(*self._state))
+
+    def __len__(self):
+        return len(self._actions)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("índice de paso fuera de rango")
+
+        k = i // self.keyframe_interval
+        state = _copy_state(*self._keyframes[k])
+        for j in range(k * self.keyframe_interval + 1, i + 1):
+            _apply(state, self._changes[j], self._pq_ops[j])
+        return _step_dict(i + 1, self._actions[i], self._currents[i], state)
+
+    def __iter__(self):
+        state = _copy_state(self._initial, self._initial_pq)
+        for i in range(len(self)):
+            _apply(state, self._changes[i], self._pq_ops[i])
+            yield _step_dict(i + 1, self._actions[i], self._currents[i], state)
+
+    @property
+    def initial(self):
+        """Estado anterior al primer paso: {campo: diccionario, "pq": lista}."""
+        fields, pq = _copy_state(self._initial, self._initial_pq)
+        if pq is not None:
+            fields["pq"] = pq
+        return fields
+
+    def delta(self, i):
+        """
+        Devuelve el paso i sin reconstruir el estado.
+
+        Returns:
+            dict: step, action, current, changes (tuplas (campo, clave, valor))
+            y pq_ops (operaciones sobre la cola).
+        """
+        return dict(
+            step=i + 1,
+            action=self._actions[i],
+            current=self._currents[i],
+            changes=self._changes[i] or (),
+            pq_ops=self._pq_ops[i] or (),
+        )
+
+
+def _thin(frames, changed, queue):
+    """
+    Descarta uno de cada dos pasos elegidos (los de posición impar).
+
+    Los cambios y las operaciones sobre la cola de cada paso descartado se
+    suman a los del paso siguiente o, si era el último, a los pendientes
+    (`changed`, `queue`).
+
+    Returns:
+        tuple: (pasos conservados, changed, queue)
+    """
+    kept, carry = [], None
+    for k, frame in enumerate(frames):
+        if carry is not None:
+            number, action, current, frame_changed, frame_queue, captured = frame
+            frame = (number, action, current, {**carry[3], **frame_changed}, carry[4] + frame_queue, captured)
+            carry = None
+        if k % 2 == 0:
+            kept.append(frame)
+        else:
+            carry = frame
+    if carry is not None:
+        changed, queue = {**carry[3], **changed}, carry[4] + queue
+    return kept, changed, queue
+
+
+def _select(state, events, max_frames, collapse, capture=None):
+    """
+    Aplica los pasos sobre `state` y elige los que se devuelven.
+
+    Sin `max_frames` devuelve los pasos a medida que se generan. Con
+    `max_frames` no hace falta saber de antemano cuántos pasos habrá: se
+    guardan a lo sumo max_frames - 1 pasos, uno de cada `stride` candidatos;
+    cuando se llena el buffer se descarta uno de cada dos y `stride` se
+    duplica. Al terminar se devuelven los guardados, que quedan
+    equiespaciados, y el último paso.
+
+    Args:
+        capture (callable, opcional): `capture(número, action, current)` se
+            llama al elegir un paso, con `state` en el estado de ese paso.
+
+    Yields:
+        tuple: (número de paso, action, current, cambios, cola, captura),
+        donde `cambios` es {(campo, clave): valor} y `cola` la lista de
+        operaciones (PUSH, elemento) o (POP, elemento desencolado), ambos
+        acumulados desde el paso devuelto anterior, y `captura` es lo que
+        devolvió `capture` (o None).
+    """
+    # Pasos a devolver antes del último
+    budget = math.inf if max_frames is None else max_frames - 1
+    stride = 1
+
+    fields, pq = state
+    chosen = []
+    changed, queue = {}, []
+    candidates = 0
+    last, last_out = None, None
+    for i, (action, current, changes, pq_ops, summary) in enumerate(events):
+        if changes:
+            for name, key, value in changes:
+                fields[name][key] = value
+                changed[name, key] = value
+        if pq_ops:
+            for op in pq_ops:
+                if op[0] == PUSH:
+                    heappush(pq, op[1])
+                    queue.append(op)
+                else:
+                    queue.append((POP, heappop(pq)))
+        last = (i + 1, action, current)
+        if collapse:
+            if summary is None:
+                continue
+            last = (i + 1, summary, current)
+        if candidates % stride == 0 and budget > 0:
+            frame = (*last, changed, queue, capture(*last) if capture else None)
+            changed, queue = {}, []
+            if max_frames is None:
+                yield frame
+                last_out = last[0]
+            else:
+                chosen.append(frame)
+                if len(chosen) > budget:
+                    chosen, changed, queue = _thin(chosen, changed, queue)
+                    stride *= 2
+        candidates += 1
+
+    yield from chosen
+    if chosen:
+        last_out = chosen[-1][0]
+    if last is not None and last_out != last[0]:
+        yield (*last, changed, queue, capture(*last) if capture else None)
+
+
+def iter_states(fields, pq, events, max_frames=None, collapse=False):
+    """
+    Recorre los estados de un algoritmo a medida que se generan.
+
+    Los deltas se aplican sobre un único estado y sólo se copia el de los
+    pasos elegidos, así que el costo de cada paso descartado es el de sus
+    cambios. Con `max_frames` se guardan a lo sumo `max_frames` estados y
+    se devuelven al terminar el algoritmo.
+
+    Args:
+        fields (dict): Campos del estado inicial, como en `Trace`.
+        pq (list): Cola de prioridad inicial, o None.
+        events (iterable): Tuplas (action, current, changes, pq_ops, summary);
+            `summary` es None salvo en los pasos que cierran una etapa del
+            algoritmo (un vértice finalizado, una iteración).
+        max_frames (int, opcional): Cantidad máxima de estados a devolver,
+            equiespaciados entre los pasos (o entre los pasos con resumen si
+            `collapse`), más el último. No requiere conocer la cantidad de
+            pasos: se devuelven entre max_frames / 2 y max_frames estados.
+        collapse (bool): Devolver sólo los pasos con resumen, usando el
+            resumen como `action`, y el último paso.
+
+    Yields:
+        dict: Estado completo del paso, como `Trace[i]`.
+    """
+    state = _copy_state(fields, pq)
+
+    def capture(number, action, current):
+        return _step_dict(number, action, current, state)
+
+    for *_, step in _select(state, events, max_frames, collapse, capture):
+        yield step
+
+
+def iter_deltas(fields, pq, events, max_frames=None, collapse=False):
+    """
+    Como `iter_states`, pero devuelve sólo lo que cambió entre estados.
+
+    Los cambios de los pasos omitidos se acumulan en el siguiente devuelto,
+    y cada POP indica qué elemento salió de la cola, así que para seguir la
+    cola no hace falta repetir las operaciones de `heapq`.
+
+    Yields:
+        dict: step, action, current, changes ({(campo, clave): valor}) y
+        pq_ops (lista de (PUSH, elemento) o (POP, elemento)).
+    """
+    state = _copy_state(fields, pq)
+    for number, action, current, changes, pq_ops, _ in _select(state, events, max_frames, collapse):
+        yield dict(step=number, action=action, current=current, changes=changes, pq_ops=pq_ops)
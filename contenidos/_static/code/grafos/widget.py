@@ -0,0 +1,258 @@
+"""
+Widget paso a paso dibujado en el navegador con SVG.
+
+Los widgets con imágenes incrustan un PNG y una tabla HTML por paso, así
+que para Bellman-Ford ocupan varios megabytes. `svg_widget_html` envía la
+geometría del grafo una sola vez (nodos, posiciones, aristas y pesos) y,
+por cada paso, sólo los valores que cambiaron y las operaciones sobre la
+cola (ver `grafos.trace.iter_deltas`). El navegador reconstruye el estado
+de cada paso a partir de keyframes, dibuja el grafo con SVG y arma la tabla
+de distancias, actualizando sólo los colores, aristas y celdas que cambian.
+"""
+
+import json
+import math
+import secrets
+
+from .trace import PUSH
+
+# Pasos entre copias completas del estado en el navegador
+KEYFRAME_INTERVAL = 64
+
+WIDTH, HEIGHT, MARGIN, RADIUS = 600, 450, 30, 16
+
+
+def _encode(name, value, index):
+    if name == "prev":
+        return -1 if value is None else index[value]
+    if name in ("visited", "queued"):
+        return 1 if value else 0
+    if isinstance(value, float) and math.isinf(value):
+        return None  # JSON no admite Infinity: null es ∞
+    return value
+
+
+def _geometry(graph, pos):
+    nodes = list(graph.nodes())
+    xs = [float(pos[n][0]) for n in nodes]
+    ys = [float(pos[n][1]) for n in nodes]
+
+    def scale(values, size):
+        low, high = min(values), max(values)
+        span = (high - low) or 1.0
+        return [round(MARGIN + (v - low) / span * (size - 2 * MARGIN), 1) for v in values]
+
+    # En SVG el eje y crece hacia abajo
+    return scale(xs, WIDTH), [HEIGHT - y for y in scale(ys, HEIGHT)]
+
+
+def widget_data(graph, pos, kind, fields, pq, deltas, source=None):
+    """
+    Arma los datos del widget.
+
+    Args:
+        graph (nx.Graph): Grafo.
+        pos (dict): Posiciones de los nodos.
+        kind (str): "dijkstra" o "bellman_ford" (también para SPFA).
+        fields (dict): Campos del estado inicial (dist, prev, ...).
+        pq (list): Cola de prioridad inicial.
+        deltas (iterable): Pasos de `grafos.trace.iter_deltas`.
+        source: Nodo origen.
+
+    Returns:
+        dict: Datos serializables a JSON.
+    """
+    nodes = list(graph.nodes())
+    index = {n: i for i, n in enumerate(nodes)}
+    names = list(fields)
+    field_index = {name: i for i, name in enumerate(names)}
+    xs, ys = _geometry(graph, pos) if nodes else ([], [])
+
+    def queue_item(item):
+        d, n = item
+        return [_encode("dist", d, index), index[n]]
+
+    steps = []
+    for delta in deltas:
+        changes = [
+            [field_index[name], index[key], _encode(name, value, index)]
+            for (name, key), value in delta["changes"].items()
+        ]
+        queue = [[1 if op == PUSH else -1, *queue_item(item)] for op, item in delta["pq_ops"]]
+        steps.append([delta["step"], delta["action"], index.get(delta["current"], -1), changes, queue])
+
+    return {
+        "kind": kind,
+        "directed": graph.is_directed(),
+        "nodes": [str(n) for n in nodes],
+        "x": xs,
+        "y": ys,
+        "edges": [[index[u], index[v], str(w)] for u, v, w in graph.edges(data="weight")],
+        "fields": names,
+        "initial": [[_encode(name, fields[name][n], index) for n in nodes] for name in names],
+        "pq": [queue_item(item) for item in pq or []],
+        "source": index.get(source, -1),
+        "steps": steps,
+    }
+
+
+def svg_widget_html(data):
+    """
+    Devuelve el HTML del widget para los datos de `widget_data`.
+
+    Args:
+        data (dict): Datos del widget.
+
+    Returns:
+        str: HTML con el SVG, los controles y el script que lo anima.
+    """
+    root_id = f"svgw-{secrets.token_hex(3)}"
+    detail = "Cola de prioridad" if data["kind"] == "dijkstra" else "Detalle"
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+    return f"""
+  <div id="{root_id}" class="svg-widget">
+    <div class="controls">
+    <button data-act="prev">◀</button>
+    <input class="slider" type="range" min="0" max="{max(len(data['steps']) - 1, 0)}" step="1" value="0"/>
+    <button data-act="next">▶</button>
+    <span class="label"></span>
+    </div>
+    <div class="view">
+    <div class="left"><div class="title"></div><svg viewBox="0 0 {WIDTH} {HEIGHT}"></svg></div>
+    <div class="right">
+    <h4>Tabla de distancias</h4>
+    <div class="tbl"></div>
+    <h4>{detail}</h4>
+    <div class="pq"></div>
+    </div>
+    </div>
+    <script type="application/json" class="data">{payload}</script>
+    <style>
+    .svg-widget .view {{ display:grid; grid-template-columns: 1fr 1fr; gap:1rem; }}
+    .svg-widget svg {{ width:100%; border:1px solid #ddd; border-radius:.5rem; background:white; }}
+    .svg-widget .title {{ text-align:center; font-size:.9rem; margin-bottom:.3rem; }}
+    .svg-widget .tbl, .svg-widget .pq {{ max-height:24rem; overflow:auto; }}
+    .svg-widget table {{ border-collapse: collapse; width:100%; margin-top:.5rem; }}
+    .svg-widget th, .svg-widget td {{ border:1px solid #ddd; padding:.3rem; text-align:center; }}
+    .svg-widget .weight {{ font-size:9px; paint-order:stroke; stroke:white; stroke-width:3px; }}
+    .svg-widget .node-label {{ fill:white; font-weight:bold; font-size:12px; pointer-events:none; }}
+    </style>
+    <script>
+    (function(root){{
+    const G = JSON.parse(root.querySelector(".data").textContent);
+    const N = G.nodes.length, K = {KEYFRAME_INTERVAL}, R = {RADIUS};
+    const F = name => G.fields.indexOf(name);
+    const DIST = F("dist"), PREV = F("prev"), VISITED = F("visited"), PREV_DIST = F("prev_dist"), QUEUED = F("queued");
+    const NS = "http://www.w3.org/2000/svg";
+    const svg = root.querySelector("svg");
+    function el(tag, attrs, parent) {{
+      const e = document.createElementNS(NS, tag);
+      for (const k in attrs) e.setAttribute(k, attrs[k]);
+      parent.appendChild(e);
+      return e;
+    }}
+
+    // Estado: un arreglo por campo y la cola como lista de [distancia, nodo]
+    function apply(s, d) {{
+      for (const [f, i, v] of d[3]) s.f[f][i] = v;
+      for (const [sign, dist, i] of d[4]) {{
+        if (sign > 0) s.pq.push([dist, i]);
+        else {{
+          const k = s.pq.findIndex(p => p[0] === dist && p[1] === i);
+          if (k >= 0) s.pq.splice(k, 1);
+        }}
+      }}
+    }}
+    const copy = s => ({{f: s.f.map(a => a.slice()), pq: s.pq.map(p => p.slice())}});
+    const keyframes = [];
+    let live = {{f: G.initial.map(a => a.slice()), pq: G.pq.map(p => p.slice())}};
+    G.steps.forEach((d, i) => {{ apply(live, d); if (i % K === 0) keyframes.push(copy(live)); }});
+    function stateAt(i) {{
+      const k = Math.floor(i / K), s = copy(keyframes[k]);
+      for (let j = k * K + 1; j <= i; j++) apply(s, G.steps[j]);
+      return s;
+    }}
+
+    // Dibujo estático
+    const defs = el("defs", {{}}, svg);
+    for (const [id, color] of [["a", "#cccccc"], ["b", "#222222"]]) {{
+      const m = el("marker", {{id: "{root_id}-" + id, viewBox: "0 0 10 10", refX: 10, refY: 5,
+        markerWidth: 6, markerHeight: 6, orient: "auto-start-reverse"}}, defs);
+      el("path", {{d: "M 0 0 L 10 5 L 0 10 z", fill: color}}, m);
+    }}
+    const edgeLayer = el("g", {{}}, svg), treeLayer = el("g", {{}}, svg);
+    const weightLayer = el("g", {{}}, svg), nodeLayer = el("g", {{}}, svg);
+    const tree = new Map();
+    for (const [u, v, w] of G.edges) {{
+      const dx = G.x[v] - G.x[u], dy = G.y[v] - G.y[u], len = Math.hypot(dx, dy) || 1;
+      const ux = dx / len * R, uy = dy / len * R;
+      const line = {{x1: G.x[u] + ux, y1: G.y[u] + uy, x2: G.x[v] - ux, y2: G.y[v] - uy}};
+      el("line", {{...line, stroke: "#cccccc", "stroke-width": 1.5,
+        ...(G.directed ? {{"marker-end": "url(#{root_id}-a)"}} : {{}})}}, edgeLayer);
+      const t = el("line", {{...line, stroke: "#222222", "stroke-width": 2.5, visibility: "hidden",
+        ...(G.directed ? {{"marker-end": "url(#{root_id}-b)"}} : {{}})}}, treeLayer);
+      tree.set(u + "," + v, t);
+      if (!G.directed && !tree.has(v + "," + u)) tree.set(v + "," + u, t);
+      el("text", {{x: (G.x[u] + G.x[v]) / 2, y: (G.y[u] + G.y[v]) / 2, "text-anchor": "middle",
+        "dominant-baseline": "middle", class: "weight"}}, weightLayer).textContent = w;
+    }}
+    const circles = G.nodes.map((name, i) => {{
+      const c = el("circle", {{cx: G.x[i], cy: G.y[i], r: R, fill: "#dddddd", stroke: "#333", "stroke-width": 1.2}}, nodeLayer);
+      el("text", {{x: G.x[i], y: G.y[i], "text-anchor": "middle", "dominant-baseline": "central", class: "node-label"}}, nodeLayer).textContent = name;
+      return c;
+    }});
+
+    // Tabla: se arma una vez y se actualizan sólo las celdas que cambian
+    const columns = ["Nodo", "Distancia", "Previo"].concat(VISITED >= 0 ? ["Visitado"] : [], QUEUED >= 0 ? ["En cola"] : []);
+    const table = document.createElement("table");
+    table.innerHTML = "<thead><tr>" + columns.map(c => "<th>" + c + "</th>").join("") + "</tr></thead>";
+    const body = table.createTBody();
+    const cells = G.nodes.map(name => {{
+      const row = body.insertRow();
+      return columns.map((_, j) => {{ const td = row.insertCell(); if (j === 0) td.textContent = name; return td; }});
+    }});
+    root.querySelector(".tbl").appendChild(table);
+
+    const fmt = x => x === null ? "∞" : String(Math.trunc(x));
+    const title = root.querySelector(".title"), pq = root.querySelector(".pq");
+    const slider = root.querySelector(".slider"), label = root.querySelector(".label");
+    let shownTree = new Set();
+
+    function show(i) {{
+      if (!G.steps.length) return;
+      const d = G.steps[i], s = stateAt(i), dist = s.f[DIST], prev = s.f[PREV];
+      for (let n = 0; n < N; n++) {{
+        let green;
+        if (G.kind === "dijkstra") green = s.f[VISITED][n] === 1;
+        else green = n === G.source || (d[0] !== 1 && dist[n] !== s.f[PREV_DIST][n]);
+        const fill = green ? "#34a853" : "#dddddd";
+        if (circles[n].getAttribute("fill") !== fill) circles[n].setAttribute("fill", fill);
+        const values = [fmt(dist[n]), prev[n] >= 0 ? G.nodes[prev[n]] : "—"];
+        if (VISITED >= 0) values.push(s.f[VISITED][n] ? "Sí" : "No");
+        if (QUEUED >= 0) values.push(s.f[QUEUED][n] ? "Sí" : "No");
+        values.forEach((v, j) => {{ if (cells[n][j + 1].textContent !== v) cells[n][j + 1].textContent = v; }});
+      }}
+      const nextTree = new Set();
+      for (let n = 0; n < N; n++) if (prev[n] >= 0) nextTree.add(tree.get(prev[n] + "," + n));
+      for (const t of shownTree) if (!nextTree.has(t)) t.setAttribute("visibility", "hidden");
+      for (const t of nextTree) if (t && !shownTree.has(t)) t.setAttribute("visibility", "visible");
+      shownTree = nextTree;
+
+      title.textContent = d[1] + " (paso " + d[0] + ")";
+      if (G.kind === "dijkstra") {{
+        const rows = s.pq.slice().sort((a, b) => a[0] - b[0]).map(([x, n]) => "<tr><td>" + fmt(x) + "</td><td>" + G.nodes[n] + "</td></tr>");
+        pq.innerHTML = "<table><thead><tr><th>Distancia</th><th>Nodo</th></tr></thead><tbody>" + rows.join("") + "</tbody></table>";
+      }} else {{
+        pq.textContent = d[1];
+      }}
+      label.textContent = `Paso ${{i + 1}} / ${{G.steps.length}}`;
+      slider.value = i;
+    }}
+    root.querySelector('[data-act="prev"]').onclick = () => show(Math.max(0, Number(slider.value) - 1));
+    root.querySelector('[data-act="next"]').onclick = () => show(Math.min(G.steps.length - 1, Number(slider.value) + 1));
+    slider.oninput = e => show(Number(e.target.value));
+    show(0);
+    }})(document.getElementById("{root_id}"));
+    </script>
+  </div>
+  """
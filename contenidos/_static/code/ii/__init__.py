@@ -0,0 +1,11 @@
+"""
+Paquete de índices invertidos (Inverted Index).
+
+Este paquete contiene implementaciones de algoritmos para construcción
+y manipulación de índices invertidos.
+"""
+
+from .ii import BSBI
+from .trigramas import IndiceTrigramas
+
+__all__ = ['BSBI', 'IndiceTrigramas']
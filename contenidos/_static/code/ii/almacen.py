@@ -0,0 +1,408 @@
+"""
+Almacén comprimido de documentos con acceso aleatorio y generación de fragmentos.
+
+Los documentos se concatenan en un único flujo de bytes que se corta en
+bloques de tamaño fijo (64 KB por defecto) comprimidos por separado con zlib.
+Una tabla de desplazamientos permite ubicar el bloque comprimido que contiene
+cualquier byte del flujo, así que leer un documento o un rango de bytes sólo
+descomprime los bloques que lo cubren.
+
+Junto al texto se guardan, por documento, las posiciones (en bytes) de las
+primeras apariciones de cada término. Con ellas `AlmacenDocumentos.fragmentos`
+recorta el texto alrededor de los términos de una consulta sin leer ni
+descomprimir el documento completo.
+
+Cada escritura arma una versión completa en un subdirectorio nuevo y recién
+al cerrar la publica reemplazando el archivo `ACTUAL`, que contiene el nombre
+de la versión vigente, con un único `os.replace`. Un `AlmacenDocumentos` que
+se abre (en este u otro proceso) lee `ACTUAL` y abre los cuatro archivos de
+esa versión, así que nunca combina archivos de versiones distintas; uno ya
+abierto sigue leyendo la suya mientras se reconstruye (ver `ii.instantaneas`).
+Al publicar se borran las versiones anteriores a la previa: la previa se
+conserva para los procesos que leyeron `ACTUAL` justo antes del reemplazo, y
+si aun así la versión leída ya no existe, `AlmacenDocumentos` vuelve a leer
+`ACTUAL`.
+
+Archivos generados en el directorio del almacén:
+
+    ACTUAL                                      nombre de la versión vigente
+    version-*/documentos.dat, documentos.idx    texto de los documentos
+    version-*/posiciones.dat, posiciones.idx    {término: [posiciones]} por documento (JSON)
+"""
+
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+
+TAMAÑO_BLOQUE = 64 * 1024
+
+# Archivo con el nombre de la versión publicada del almacén
+ACTUAL = "ACTUAL"
+
+
+class EscritorBloques:
+    """Escribe registros clave → bytes en un `AlmacenBloques`."""
+
+    def __init__(self, ruta, tamaño_bloque=TAMAÑO_BLOQUE, nivel=6):
+        """
+        Args:
+            ruta: Ruta base (se agregan las extensiones .dat e .idx)
+            tamaño_bloque: Bytes sin comprimir por bloque
+            nivel: Nivel de compresión de zlib (1-9)
+        """
+        self.ruta = Path(ruta)
+        self.tamaño_bloque = tamaño_bloque
+        self.nivel = nivel
+        self.registros = {}
+        self.desplazamientos = [0]
+        self._pendiente = bytearray()
+        self._posicion = 0
+        self._archivo = open(self._temporal(".dat"), "wb")
+
+    def _temporal(self, extension):
+        return self.ruta.with_suffix(extension + ".tmp")
+
+    def _escribir_bloque(self, datos):
+        comprimido = zlib.compress(datos, self.nivel)
+        self._archivo.write(comprimido)
+        self.desplazamientos.append(self.desplazamientos[-1] + len(comprimido))
+
+    def agregar(self, clave, datos):
+        """
+        Agrega un registro al final del flujo.
+
+        Args:
+            clave: Identificador del registro (cadena)
+            datos: Contenido en bytes
+        """
+        self.registros[clave] = (self._posicion, len(datos))
+        self._posicion += len(datos)
+        self._pendiente += datos
+        tamaño = self.tamaño_bloque
+        while len(self._pendiente) >= tamaño:
+            self._escribir_bloque(bytes(self._pendiente[:tamaño]))
+            del self._pendiente[:tamaño]
+
+    def cerrar(self):
+        """Escribe el último bloque y la tabla de desplazamientos."""
+        if self._pendiente:
+            self._escribir_bloque(bytes(self._pendiente))
+            self._pendiente.clear()
+        self._archivo.close()
+        indice = {
+            "tamaño_bloque": self.tamaño_bloque,
+            "desplazamientos": self.desplazamientos,
+            "registros": self.registros,
+        }
+        with open(self._temporal(".idx"), "w", encoding="utf-8") as f:
+            json.dump(indice, f, ensure_ascii=False)
+        # Cada archivo se reemplaza de forma atómica, pero el par no: quien
+        # necesite publicar varios archivos juntos escribe en un directorio
+        # nuevo, como `EscritorDocumentos`
+        os.replace(self._temporal(".dat"), self.ruta.with_suffix(".dat"))
+        os.replace(self._temporal(".idx"), self.ruta.with_suffix(".idx"))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+class AlmacenBloques:
+    """
+    Lector de registros comprimidos en bloques con acceso aleatorio.
+
+    Mantiene en memoria los últimos bloques descomprimidos, porque las
+    lecturas consecutivas (por ejemplo, varios fragmentos de un documento)
+    suelen caer en el mismo bloque.
+
+    Puede usarse desde varios hilos a la vez: los bloques se leen con
+    `os.pread`, que no depende de la posición compartida del archivo (donde
+    no existe, la lectura se hace con un cerrojo), y la caché está protegida
+    por otro cerrojo. Entre procesos no se comparte: cada proceso abre su
+    propio `AlmacenBloques`.
+    """
+
+    def __init__(self, ruta, bloques_en_cache=8):
+        """
+        Args:
+            ruta: Ruta base usada al escribir (sin extensión)
+            bloques_en_cache: Bloques descomprimidos que se conservan
+        """
+        self.ruta = Path(ruta)
+        with open(self.ruta.with_suffix(".idx"), "r", encoding="utf-8") as f:
+            indice = json.load(f)
+        self.tamaño_bloque = indice["tamaño_bloque"]
+        self.desplazamientos = indice["desplazamientos"]
+        self.registros = indice["registros"]
+        self.bloques_en_cache = bloques_en_cache
+        self._cache = OrderedDict()
+        self._cerrojo_cache = threading.Lock()
+        self._cerrojo_archivo = threading.Lock()
+        self._archivo = open(self.ruta.with_suffix(".dat"), "rb")
+
+    def __contains__(self, clave):
+        return clave in self.registros
+
+    def longitud(self, clave):
+        """Longitud en bytes del registro."""
+        return self.registros[clave][1]
+
+    def _leer(self, inicio, fin):
+        if hasattr(os, "pread"):
+            return os.pread(self._archivo.fileno(), fin - inicio, inicio)
+        with self._cerrojo_archivo:
+            self._archivo.seek(inicio)
+            return self._archivo.read(fin - inicio)
+
+    def _bloque(self, numero):
+        cache = self._cache
+        with self._cerrojo_cache:
+            if numero in cache:
+                cache.move_to_end(numero)
+                return cache[numero]
+        # Leer y descomprimir fuera del cerrojo: otros hilos siguen usando la caché
+        inicio, fin = self.desplazamientos[numero], self.desplazamientos[numero + 1]
+        datos = zlib.decompress(self._leer(inicio, fin))
+        with self._cerrojo_cache:
+            cache[numero] = datos
+            cache.move_to_end(numero)
+            if len(cache) > self.bloques_en_cache:
+                cache.popitem(last=False)
+        return datos
+
+    def leer(self, clave, inicio=0, fin=None):
+        """
+        Lee un registro completo o un rango de bytes del registro.
+
+        Args:
+            clave: Identificador del registro
+            inicio: Primer byte (relativo al registro)
+            fin: Byte siguiente al último (por defecto, el final del registro)
+
+        Returns:
+            bytes leídos
+        """
+        base, longitud = self.registros[clave]
+        fin = longitud if fin is None else min(fin, longitud)
+        inicio = max(0, inicio)
+        if inicio >= fin:
+            return b""
+
+        desde, hasta = base + inicio, base + fin
+        primero, ultimo = desde // self.tamaño_bloque, (hasta - 1) // self.tamaño_bloque
+        partes = [self._bloque(n) for n in range(primero, ultimo + 1)]
+        datos = b"".join(partes) if len(partes) > 1 else partes[0]
+        corrimiento = primero * self.tamaño_bloque
+        return datos[desde - corrimiento : hasta - corrimiento]
+
+    def cerrar(self):
+        self._archivo.close()
+
+
+class EscritorDocumentos:
+    """
+    Escribe el texto de los documentos y las posiciones de sus términos.
+
+    Los términos se obtienen igual que en `BSBI.tokenizar` (palabras en
+    minúsculas) y, si se indica, se pasan por la misma función de
+    procesamiento que usa el índice, de modo que las posiciones quedan
+    registradas con los mismos términos que los postings.
+
+    Todo se escribe en un subdirectorio de versión nuevo, que `cerrar`
+    publica y `descartar` borra.
+    """
+
+    def __init__(self, directorio, procesar_termino=None, max_posiciones=4, tamaño_bloque=TAMAÑO_BLOQUE):
+        """
+        Args:
+            directorio: Directorio del almacén (se crea si no existe)
+            procesar_termino: Función término → término indexado (o None si
+                el término no se indexa); None para usar el token tal cual
+            max_posiciones: Posiciones que se guardan por término y documento
+            tamaño_bloque: Bytes sin comprimir por bloque
+        """
+        self.directorio = Path(directorio)
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        self.version = Path(tempfile.mkdtemp(prefix="version-", dir=self.directorio))
+        self.procesar_termino = procesar_termino
+        self.max_posiciones = max_posiciones
+        self.textos = EscritorBloques(self.version / "documentos", tamaño_bloque)
+        self.posiciones = EscritorBloques(self.version / "posiciones", tamaño_bloque)
+
+    def _posiciones(self, contenido):
+        """Devuelve {término: [posición en bytes]} de las primeras apariciones."""
+        posiciones = {}
+        procesados = {}
+        caracter = byte = 0
+        for m in re.finditer(r"\w+", contenido):
+            # Avance incremental del desplazamiento en bytes (UTF-8)
+            byte += len(contenido[caracter : m.start()].encode("utf-8"))
+            caracter = m.start()
+
+            token = m.group().lower()
+            if self.procesar_termino is None:
+                termino = token
+            else:
+                if token not in procesados:
+                    procesados[token] = self.procesar_termino(token)
+                termino = procesados[token]
+            if not termino:
+                continue
+
+            lista = posiciones.setdefault(termino, [])
+            if len(lista) < self.max_posiciones:
+                lista.append(byte)
+        return posiciones
+
+    def agregar(self, doc_id, contenido):
+        """
+        Agrega un documento al almacén.
+
+        Args:
+            doc_id: Identificador del documento
+            contenido: Texto del documento
+        """
+        self.textos.agregar(doc_id, contenido.encode("utf-8"))
+        posiciones = json.dumps(self._posiciones(contenido), ensure_ascii=False, separators=(",", ":"))
+        self.posiciones.agregar(doc_id, posiciones.encode("utf-8"))
+
+    def cerrar(self):
+        """Termina de escribir la versión y la publica en un solo paso."""
+        self.textos.cerrar()
+        self.posiciones.cerrar()
+        anterior = _version_actual(self.directorio)
+        temporal = self.directorio / f"{ACTUAL}.{os.getpid()}.tmp"
+        temporal.write_text(self.version.name, encoding="utf-8")
+        os.replace(temporal, self.directorio / ACTUAL)
+
+        # Conservar la versión nueva y la previa; las demás ya no se abren
+        for viejo in self.directorio.glob("version-*"):
+            if viejo.name not in (self.version.name, anterior):
+                shutil.rmtree(viejo, ignore_errors=True)
+
+    def descartar(self):
+        """Abandona la versión a medio escribir sin publicarla."""
+        self.textos._archivo.close()
+        self.posiciones._archivo.close()
+        shutil.rmtree(self.version, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, *exc):
+        if tipo is None:
+            self.cerrar()
+        else:
+            self.descartar()
+
+
+def _version_actual(directorio):
+    """Nombre de la versión publicada en `directorio`, o None si no hay."""
+    try:
+        return (directorio / ACTUAL).read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return None
+
+
+class AlmacenDocumentos:
+    """Acceso aleatorio al texto de los documentos y generación de fragmentos."""
+
+    def __init__(self, directorio):
+        """
+        Args:
+            directorio: Directorio escrito por `EscritorDocumentos`
+        """
+        self.directorio = Path(directorio)
+        version = _version_actual(self.directorio)
+        while True:
+            # Sin `ACTUAL`, los archivos están directo en el directorio (formato anterior)
+            ruta = self.directorio / version if version else self.directorio
+            try:
+                self.textos = AlmacenBloques(ruta / "documentos")
+                try:
+                    self.posiciones = AlmacenBloques(ruta / "posiciones")
+                except BaseException:
+                    self.textos.cerrar()
+                    raise
+                return
+            except FileNotFoundError:
+                # La versión leída ya se borró: se publicaron otras mientras tanto
+                anterior, version = version, _version_actual(self.directorio)
+                if version is None or version == anterior:
+                    raise
+
+    def __contains__(self, doc_id):
+        return doc_id in self.textos
+
+    def documento(self, doc_id):
+        """Devuelve el texto completo de un documento."""
+        return self.textos.leer(doc_id).decode("utf-8")
+
+    def rango(self, doc_id, inicio, fin):
+        """
+        Devuelve el texto entre dos posiciones en bytes del documento.
+
+        Los cortes que caen en medio de un carácter multibyte se descartan.
+        """
+        return self.textos.leer(doc_id, inicio, fin).decode("utf-8", errors="ignore")
+
+    def posiciones_de(self, doc_id, terminos):
+        """
+        Devuelve las posiciones en bytes de los términos en el documento.
+
+        Args:
+            doc_id: Identificador del documento
+            terminos: Términos ya normalizados (como están en el índice)
+
+        Returns:
+            Lista ordenada de posiciones
+        """
+        posiciones = json.loads(self.posiciones.leer(doc_id))
+        return sorted(p for t in terminos for p in posiciones.get(t, ()))
+
+    def fragmentos(self, doc_id, terminos, ancho=60, maximo=3):
+        """
+        Genera fragmentos del documento alrededor de los términos buscados.
+
+        Sólo se descomprimen los bloques que contienen cada ventana de texto.
+
+        Args:
+            doc_id: Identificador del documento
+            terminos: Términos ya normalizados (como están en el índice)
+            ancho: Bytes de contexto a cada lado de la aparición
+            maximo: Cantidad máxima de fragmentos
+
+        Returns:
+            Lista de fragmentos de texto
+        """
+        longitud = self.textos.longitud(doc_id)
+        ventanas = []
+        for posicion in self.posiciones_de(doc_id, terminos):
+            inicio, fin = max(0, posicion - ancho), min(longitud, posicion + ancho)
+            # Ventanas solapadas se unen en un único fragmento
+            if ventanas and inicio <= ventanas[-1][1]:
+                ventanas[-1][1] = max(ventanas[-1][1], fin)
+            else:
+                if len(ventanas) == maximo:
+                    break
+                ventanas.append([inicio, fin])
+
+        fragmentos = []
+        for inicio, fin in ventanas:
+            texto = " ".join(self.rango(doc_id, inicio, fin).split())
+            prefijo = "…" if inicio > 0 else ""
+            sufijo = "…" if fin < longitud else ""
+            fragmentos.append(f"{prefijo}{texto}{sufijo}")
+        return fragmentos
+
+    def cerrar(self):
+        self.textos.cerrar()
+        self.posiciones.cerrar()
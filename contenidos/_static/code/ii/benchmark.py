@@ -0,0 +1,344 @@
+"""
+Banco de pruebas de rendimiento para la construcción y consulta del índice.
+
+Genera un corpus sintético cuyo vocabulario sigue la ley de Zipf (frecuencia
+de un término inversamente proporcional a su rango) con un tamaño de
+vocabulario dado por la ley de Heaps (V = K·N^β), y una carga de consultas
+que muestrea términos con la misma distribución. Mide:
+
+- Construcción: rendimiento (MB/s), pico de memoria residente (RSS), espacio
+  temporal ocupado por los bloques y tamaño del índice final.
+- Consultas: percentiles de latencia por operador (AND, OR, NOT, booleana).
+
+Los resultados se escriben en JSON para poder compararlos entre versiones.
+
+Uso:
+
+    python -m ii.benchmark --tamaño 50MB --salida resultados.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+from pathlib import Path
+
+from .busquedas import _a_rpn, _tokenizar_booleana, _universo_docs, busqueda_and, busqueda_not, busqueda_or, evaluar_rpn
+from .ii import BSBI
+from .metricas import pico_memoria
+
+UNIDADES = {"": 1, "B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3, "TB": 1024**4}
+
+
+def parsear_tamaño(texto):
+    """Convierte un tamaño como '500KB', '10MB' o '2GB' a bytes."""
+    m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?B?)\s*", texto.upper())
+    if not m:
+        raise ValueError(f"Tamaño inválido: {texto}")
+    return int(float(m.group(1)) * UNIDADES[m.group(2)])
+
+
+def tamaño_en_disco(ruta):
+    """Suma los tamaños de los archivos de un directorio (o de un archivo)."""
+    ruta = Path(ruta)
+    if ruta.is_file():
+        return ruta.stat().st_size
+    return sum(p.stat().st_size for p in ruta.rglob("*") if p.is_file())
+
+
+class CorpusSintetico:
+    """
+    Generador de corpus con distribución de Zipf y vocabulario según Heaps.
+
+    El vocabulario total se dimensiona con la ley de Heaps para la cantidad de
+    tokens esperada y cada token se muestrea con probabilidad proporcional a
+    1 / rango^s. Así, el crecimiento del vocabulario observado a medida que se
+    generan documentos también se aproxima a Heaps.
+    """
+
+    def __init__(self, tamaño_bytes, s=1.0, heaps_k=44, heaps_beta=0.49, palabras_por_documento=2000, semilla=42):
+        """
+        Inicializa el generador.
+
+        Args:
+            tamaño_bytes: Tamaño aproximado del corpus a generar
+            s: Exponente de la ley de Zipf
+            heaps_k: Constante K de la ley de Heaps
+            heaps_beta: Exponente β de la ley de Heaps
+            palabras_por_documento: Longitud media de los documentos (en tokens)
+            semilla: Semilla para que el corpus sea reproducible
+        """
+        self.tamaño_bytes = tamaño_bytes
+        self.palabras_por_documento = palabras_por_documento
+        self.random = random.Random(semilla)
+
+        tokens_esperados = max(1, tamaño_bytes // 7)  # ~6 letras + separador por token
+        tamaño_vocabulario = max(10, int(heaps_k * tokens_esperados**heaps_beta))
+        self.vocabulario = self._generar_vocabulario(tamaño_vocabulario)
+        self.pesos_acumulados = list(accumulate(1 / rango**s for rango in range(1, tamaño_vocabulario + 1)))
+
+    def _generar_vocabulario(self, cantidad):
+        """Genera `cantidad` palabras distintas; las más cortas quedan primeras (Zipf)."""
+        silabas = [c + v for c in "bcdfglmnprstv" for v in "aeiou"] + list("aeiou")
+        palabras = []
+        vistas = set()
+        while len(palabras) < cantidad:
+            largo = min(1 + int(self.random.expovariate(0.6)), 6)
+            palabra = "".join(self.random.choices(silabas, k=largo))
+            if palabra not in vistas:
+                vistas.add(palabra)
+                palabras.append(palabra)
+        palabras.sort(key=len)
+        return palabras
+
+    def muestrear(self, cantidad):
+        """Devuelve `cantidad` términos muestreados según Zipf."""
+        return self.random.choices(self.vocabulario, cum_weights=self.pesos_acumulados, k=cantidad)
+
+    def escribir(self, directorio):
+        """
+        Escribe el corpus como archivos .txt sin mantenerlo en memoria.
+
+        Args:
+            directorio: Directorio de salida
+
+        Returns:
+            Diccionario con documentos, tokens y bytes escritos
+        """
+        directorio = Path(directorio)
+        directorio.mkdir(parents=True, exist_ok=True)
+        documentos = tokens = escritos = 0
+
+        while escritos < self.tamaño_bytes:
+            largo = max(1, int(self.random.gauss(self.palabras_por_documento, self.palabras_por_documento / 4)))
+            palabras = self.muestrear(largo)
+            # Líneas de ~12 palabras para que el texto se parezca a prosa
+            lineas = (" ".join(palabras[i : i + 12]) for i in range(0, largo, 12))
+            contenido = ".\n".join(lineas) + ".\n"
+            with open(directorio / f"doc_{documentos:08d}.txt", "w", encoding="utf-8") as f:
+                f.write(contenido)
+            documentos += 1
+            tokens += largo
+            escritos += len(contenido.encode("utf-8"))
+
+        return {"documentos": documentos, "tokens": tokens, "bytes": escritos}
+
+    def consultas(self, cantidad, terminos_por_consulta=2):
+        """
+        Genera una carga de consultas por operador.
+
+        Los términos se muestrean con la misma distribución que el corpus, de
+        modo que la carga mezcla términos frecuentes (listas largas) y raros.
+
+        Args:
+            cantidad: Consultas a generar por operador
+            terminos_por_consulta: Términos de las consultas AND/OR/NOT
+
+        Returns:
+            Diccionario {operador: [consultas]}; cada consulta es una lista de
+            términos, salvo las booleanas que son cadenas
+        """
+        carga = {"AND": [], "OR": [], "NOT": [], "booleana": []}
+        for _ in range(cantidad):
+            for operador in ("AND", "OR", "NOT"):
+                carga[operador].append(self.muestrear(terminos_por_consulta))
+            a, b, c = self.muestrear(3)
+            carga["booleana"].append(f"({a} OR {b}) AND NOT {c}")
+        return carga
+
+
+def _construir(directorio_corpus, directorio_trabajo, tamaño_bloque):
+    """Construye y guarda el índice; se ejecuta en un proceso aparte para aislar el pico de RSS."""
+    directorio_trabajo = Path(directorio_trabajo)
+    directorio_temp = directorio_trabajo / "bloques"
+    ruta_indice = directorio_trabajo / "indice.txt"
+
+    bsbi = BSBI(tamaño_bloque=tamaño_bloque)
+    inicio = time.perf_counter()
+    indice = bsbi.construir_indice(directorio_corpus, directorio_temp)
+    segundos = time.perf_counter() - inicio
+    bsbi.guardar_indice(ruta_indice)
+
+    resultado = {
+        "segundos": segundos,
+        "terminos": len(indice),
+        "postings": sum(len(docs) for docs in indice.values()),
+        "bytes_temporales": tamaño_en_disco(directorio_temp),
+        "bytes_indice": tamaño_en_disco(ruta_indice),
+        "pico_rss": pico_memoria(),
+        "fases": bsbi.estadisticas.como_dict(),
+    }
+    shutil.rmtree(directorio_temp, ignore_errors=True)
+    return resultado
+
+
+def medir_construccion(directorio_corpus, directorio_trabajo, tamaño_bloque=100_000):
+    """
+    Mide la construcción del índice en un proceso hijo nuevo.
+
+    Args:
+        directorio_corpus: Directorio con los .txt
+        directorio_trabajo: Directorio donde quedan bloques e índice
+        tamaño_bloque: Tamaño de bloque de BSBI
+
+    Returns:
+        Diccionario con tiempos, tamaños y pico de memoria
+    """
+    Path(directorio_trabajo).mkdir(parents=True, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=1) as proceso:
+        resultado = proceso.submit(_construir, str(directorio_corpus), str(directorio_trabajo), tamaño_bloque).result()
+
+    bytes_corpus = tamaño_en_disco(directorio_corpus)
+    resultado["bytes_corpus"] = bytes_corpus
+    resultado["mb_por_segundo"] = bytes_corpus / 1024**2 / resultado["segundos"] if resultado["segundos"] else None
+    return resultado
+
+
+def percentiles(muestras):
+    """Resume una lista de latencias (en segundos) en milisegundos."""
+    ordenadas = sorted(muestras)
+    n = len(ordenadas)
+
+    def p(q):
+        return ordenadas[min(n - 1, int(q * n))] * 1000
+
+    return {
+        "n": n,
+        "media_ms": sum(ordenadas) / n * 1000,
+        "p50_ms": p(0.50),
+        "p90_ms": p(0.90),
+        "p99_ms": p(0.99),
+        "max_ms": ordenadas[-1] * 1000,
+    }
+
+
+def medir_consultas(ruta_indice, carga, repeticiones=1):
+    """
+    Mide la latencia de cada consulta de la carga sobre un índice guardado.
+
+    Args:
+        ruta_indice: Índice guardado con `BSBI.guardar_indice`
+        carga: Diccionario {operador: [consultas]} de `CorpusSintetico.consultas`
+        repeticiones: Veces que se repite la carga completa
+
+    Returns:
+        Diccionario {operador: percentiles de latencia}
+    """
+    bsbi = BSBI()
+    bsbi.cargar_indice(ruta_indice)
+    universo = _universo_docs(bsbi)
+
+    operaciones = {
+        "AND": lambda terminos: busqueda_and(bsbi, terminos),
+        "OR": lambda terminos: busqueda_or(bsbi, terminos),
+        "NOT": lambda terminos: busqueda_not(bsbi, terminos),
+        "booleana": lambda consulta: evaluar_rpn(_a_rpn(_tokenizar_booleana(consulta)), bsbi, universo),
+    }
+
+    resultados = {}
+    for operador, consultas in carga.items():
+        latencias = []
+        for _ in range(repeticiones):
+            for consulta in consultas:
+                inicio = time.perf_counter()
+                operaciones[operador](consulta)
+                latencias.append(time.perf_counter() - inicio)
+        if latencias:
+            resultados[operador] = percentiles(latencias)
+    return resultados
+
+
+def ejecutar(tamaño_bytes, directorio, tamaño_bloque=100_000, consultas=1000, semilla=42, s=1.0):
+    """
+    Ejecuta el banco de pruebas completo y devuelve los resultados.
+
+    Args:
+        tamaño_bytes: Tamaño del corpus sintético
+        directorio: Directorio de trabajo (corpus, bloques e índice)
+        tamaño_bloque: Tamaño de bloque de BSBI
+        consultas: Consultas por operador
+        semilla: Semilla del generador
+        s: Exponente de Zipf
+
+    Returns:
+        Diccionario serializable a JSON
+    """
+    directorio = Path(directorio)
+    corpus = CorpusSintetico(tamaño_bytes, s=s, semilla=semilla)
+
+    inicio = time.perf_counter()
+    generado = corpus.escribir(directorio / "corpus")
+    generado["segundos"] = time.perf_counter() - inicio
+    generado["vocabulario_maximo"] = len(corpus.vocabulario)
+
+    construccion = medir_construccion(directorio / "corpus", directorio / "trabajo", tamaño_bloque)
+    latencias = medir_consultas(directorio / "trabajo" / "indice.txt", corpus.consultas(consultas))
+
+    return {
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "entorno": {
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "procesador": platform.processor() or platform.machine(),
+        },
+        "parametros": {
+            "tamaño_bytes": tamaño_bytes,
+            "tamaño_bloque": tamaño_bloque,
+            "consultas_por_operador": consultas,
+            "semilla": semilla,
+            "zipf_s": s,
+        },
+        "corpus": generado,
+        "construccion": construccion,
+        "consultas": latencias,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Banco de pruebas de construcción y consulta del índice invertido.")
+    parser.add_argument("--tamaño", default="10MB", help="Tamaño del corpus sintético (p. ej. 500KB, 50MB, 20GB)")
+    parser.add_argument(
+        "--directorio", default=".", help="Directorio donde crear el subdirectorio de trabajo (benchmark_ii-*)"
+    )
+    parser.add_argument("--tamaño-bloque", type=int, default=100_000, help="Pares (término, doc) por bloque")
+    parser.add_argument("--consultas", type=int, default=1000, help="Consultas por operador")
+    parser.add_argument("--semilla", type=int, default=42, help="Semilla del generador")
+    parser.add_argument("--zipf", type=float, default=1.0, help="Exponente s de la ley de Zipf")
+    parser.add_argument("--salida", help="Archivo JSON de resultados (por defecto, salida estándar)")
+    parser.add_argument("--conservar", action="store_true", help="No borrar el directorio de trabajo al terminar")
+    args = parser.parse_args()
+
+    # Sólo se borra el subdirectorio que crea el banco, nunca `--directorio`
+    Path(args.directorio).mkdir(parents=True, exist_ok=True)
+    trabajo = tempfile.mkdtemp(prefix="benchmark_ii-", dir=args.directorio)
+    try:
+        resultados = ejecutar(
+            parsear_tamaño(args.tamaño),
+            trabajo,
+            tamaño_bloque=args.tamaño_bloque,
+            consultas=args.consultas,
+            semilla=args.semilla,
+            s=args.zipf,
+        )
+    finally:
+        if args.conservar:
+            print(f"Directorio de trabajo: {trabajo}", file=sys.stderr)
+        else:
+            shutil.rmtree(trabajo, ignore_errors=True)
+
+    texto = json.dumps(resultados, indent=2, ensure_ascii=False)
+    if args.salida:
+        Path(args.salida).write_text(texto + "\n", encoding="utf-8")
+    else:
+        print(texto)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Lectura de documentos desde directorios y archivos comprimidos.
+
+`BSBI.construir_indice` recorre los documentos con `leer_documentos`, que
+acepta un directorio con archivos .txt, un archivo .zip, .tar(.gz|.bz2|.xz)
+o .gz, o una lista con cualquiera de ellos. Los archivos comprimidos se leen
+sin extraerlos a disco: cada miembro .txt se descomprime en memoria y pasa
+directo al tokenizador.
+
+La descompresión es paralela donde el formato lo permite:
+
+- .zip: cada miembro está comprimido por separado, así que varios hilos
+  descomprimen miembros a la vez (zlib libera el GIL) mientras el índice
+  consume los documentos en orden.
+- .tar.gz y .gz: son un único flujo comprimido que no puede partirse; un hilo
+  descomprime por delante mientras el hilo principal tokeniza.
+
+El doc_id de un archivo es su nombre sin extensión, igual que para los .txt
+de un directorio; el de un miembro de un .zip o .tar es su ruta dentro del
+archivo sin extensión (por ejemplo `2021/enero/nota`), para que miembros con
+el mismo nombre en carpetas distintas no se confundan. Si aun así dos
+documentos tienen el mismo doc_id (por ejemplo, en dos archivos de una
+lista), `leer_documentos` lanza `ValueError` en lugar de mezclarlos.
+"""
+
+import gzip
+import os
+import queue
+import tarfile
+import threading
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+
+# Documentos descomprimidos por adelantado (por hilo) antes de que se consuman
+ADELANTO = 4
+
+
+def _doc_id(nombre):
+    """doc_id de un archivo: el nombre sin directorio ni extensiones."""
+    nombre = PurePosixPath(nombre).name
+    if nombre.endswith(".gz"):
+        nombre = nombre[: -len(".gz")]
+    return PurePosixPath(nombre).stem
+
+
+def _doc_id_miembro(nombre):
+    """doc_id de un miembro de un .zip o .tar: la ruta relativa sin extensión."""
+    ruta = PurePosixPath(nombre.lstrip("/"))
+    return str(ruta.with_name(_doc_id(ruta.name)))
+
+
+def _en_orden(ejecutor, funcion, elementos, adelanto):
+    """Como `ejecutor.map`, pero con a lo sumo `adelanto` tareas pendientes."""
+    pendientes = deque()
+    for elemento in elementos:
+        pendientes.append(ejecutor.submit(funcion, elemento))
+        if len(pendientes) >= adelanto:
+            yield pendientes.popleft().result()
+    while pendientes:
+        yield pendientes.popleft().result()
+
+
+def _en_segundo_plano(generador, adelanto):
+    """Consume `generador` en otro hilo, guardando hasta `adelanto` elementos."""
+    fin = object()
+    cola = queue.Queue(maxsize=adelanto)
+    detener = threading.Event()
+
+    def producir():
+        try:
+            for elemento in generador:
+                if detener.is_set():
+                    return
+                cola.put(elemento)
+            cola.put(fin)
+        except BaseException as error:
+            cola.put(error)
+        finally:
+            generador.close()
+
+    hilo = threading.Thread(target=producir, daemon=True)
+    hilo.start()
+    try:
+        while (elemento := cola.get()) is not fin:
+            if isinstance(elemento, BaseException):
+                raise elemento
+            yield elemento
+    finally:
+        # Si el consumidor se detiene antes, liberar al productor
+        detener.set()
+        while hilo.is_alive():
+            try:
+                cola.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+
+def _leer_zip(ruta, hilos):
+    with zipfile.ZipFile(ruta) as archivo:
+        miembros = sorted(
+            (m for m in archivo.infolist() if not m.is_dir() and m.filename.endswith(".txt")),
+            key=lambda m: m.filename,
+        )
+        # Cada hilo abre su propio ZipFile para no compartir el descriptor
+        locales = threading.local()
+        abiertos = []
+
+        def descomprimir(miembro):
+            if not hasattr(locales, "archivo"):
+                locales.archivo = zipfile.ZipFile(ruta)
+                abiertos.append(locales.archivo)
+            datos = locales.archivo.read(miembro)
+            return _doc_id_miembro(miembro.filename), datos.decode("utf-8"), len(datos)
+
+        try:
+            with ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+                yield from _en_orden(ejecutor, descomprimir, miembros, hilos * ADELANTO)
+        finally:
+            for abierto in abiertos:
+                abierto.close()
+
+
+def _leer_tar(ruta):
+    # Modo flujo: los miembros se leen en el orden en que están en el archivo
+    with tarfile.open(ruta, "r|*") as archivo:
+        for miembro in archivo:
+            if miembro.isfile() and miembro.name.endswith(".txt"):
+                datos = archivo.extractfile(miembro).read()
+                yield _doc_id_miembro(miembro.name), datos.decode("utf-8"), len(datos)
+
+
+def _leer_gz(ruta):
+    with gzip.open(ruta, "rb") as archivo:
+        datos = archivo.read()
+    yield _doc_id(ruta), datos.decode("utf-8"), len(datos)
+
+
+def _leer_txt(ruta):
+    with open(ruta, "r", encoding="utf-8") as f:
+        contenido = f.read()
+    return _doc_id(ruta), contenido, os.path.getsize(ruta)
+
+
+def leer_documentos(origen, hilos=None):
+    """
+    Recorre los documentos de un directorio, un archivo comprimido o una lista.
+
+    Args:
+        origen: Directorio con archivos .txt, archivo .txt, .zip,
+            .tar(.gz|.bz2|.xz) o .gz, o una lista de cualquiera de ellos
+        hilos: Hilos para descomprimir miembros de un .zip (por defecto,
+            uno por CPU)
+
+    Yields:
+        Tuplas (doc_id, contenido, bytes leídos sin comprimir)
+
+    Raises:
+        ValueError: Si dos documentos tienen el mismo doc_id
+    """
+    vistos = set()
+    for documento in _leer(origen, hilos):
+        if documento[0] in vistos:
+            raise ValueError(f"doc_id repetido: {documento[0]!r}")
+        vistos.add(documento[0])
+        yield documento
+
+
+def _leer(origen, hilos):
+    if not isinstance(origen, (str, os.PathLike)):
+        for ruta in sorted(map(Path, origen)):
+            yield from _leer(ruta, hilos)
+        return
+
+    ruta = Path(origen)
+    hilos = hilos or os.cpu_count() or 1
+    if ruta.is_dir():
+        for archivo in sorted(ruta.glob("*.txt")):
+            yield _leer_txt(archivo)
+    elif ruta.suffix == ".txt":
+        yield _leer_txt(ruta)
+    elif zipfile.is_zipfile(ruta):
+        yield from _leer_zip(ruta, hilos)
+    elif tarfile.is_tarfile(ruta):
+        yield from _en_segundo_plano(_leer_tar(ruta), ADELANTO)
+    elif ruta.suffix == ".gz":
+        yield from _leer_gz(ruta)
+    else:
+        yield _leer_txt(ruta)
@@ -0,0 +1,715 @@
+"""
+Implementación de algoritmos de construcción de índices invertidos.
+
+Este módulo implementa el algoritmo BSBI (Blocked Sort-Based Indexing)
+para la construcción eficiente de índices invertidos sobre grandes colecciones
+de documentos.
+"""
+
+import os
+import re
+import heapq
+import threading
+from array import array
+from bisect import bisect_right
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: sin él se ordena con sorted()
+    np = None
+
+# Cada cuántos términos de un bloque se registra su desplazamiento en el archivo
+MUESTREO_BLOQUES = 256
+
+try:
+    from .almacen import AlmacenDocumentos, EscritorDocumentos
+    from .fuentes import leer_documentos
+    from .instantaneas import Instantanea
+    from .metricas import Instrumentacion
+except ImportError:  # ejecutado como script: python ii.py
+    from almacen import AlmacenDocumentos, EscritorDocumentos
+    from fuentes import leer_documentos
+    from instantaneas import Instantanea
+    from metricas import Instrumentacion
+
+
+class BSBI:
+    """
+    Blocked Sort-Based Indexing (BSBI)
+    
+    Algoritmo para construir índices invertidos que maneja colecciones
+    de documentos que no caben en memoria RAM. Procesa los documentos en
+    bloques, crea índices parciales ordenados, y luego los fusiona.
+    """
+    
+    def __init__(self, tamaño_bloque=1000, observadores=(), procesador=None, procesos_fusion=1):
+        """
+        Inicializa el constructor de índices BSBI.
+        
+        Args:
+            tamaño_bloque: Número de términos por bloque antes de escribir a disco
+            observadores: Objetos `ObservadorConstruccion` notificados durante
+                la construcción (ver `ii.metricas`)
+            procesador: `ProcesadorTerminos` que elimina stopwords y aplica
+                stemming o lematización a los tokens (ver `ii.procesamiento`);
+                None para indexar los tokens tal cual
+            procesos_fusion: Procesos para fusionar los bloques; con más de
+                uno, cada proceso fusiona un rango disjunto de términos
+        """
+        self.tamaño_bloque = tamaño_bloque
+        self.procesador = procesador
+        self.procesos_fusion = procesos_fusion
+        # Identificadores enteros asignados durante el parseo
+        self.ids_terminos = {}
+        self.terminos = []
+        self.doc_ids = []
+        self.directorio_bloques = None
+        # Muestras [(término, desplazamiento)] de cada bloque escrito
+        self.muestras_bloques = []
+        self.instrumentacion = Instrumentacion(observadores)
+        # Índice publicado (ver `ii.instantaneas`); nunca se modifica en el lugar
+        self._instantanea = Instantanea({}, termino_de_consulta=self.termino_de_consulta)
+        self._cerrojo_publicacion = threading.Lock()
+        self._cerrojo_construccion = threading.Lock()
+
+    @property
+    def estadisticas(self):
+        """Estadísticas (`EstadisticasConstruccion`) de la última construcción."""
+        return self.instrumentacion.estadisticas
+    
+    @property
+    def indice_final(self):
+        """Índice publicado {término: [doc_ids]}, de sólo lectura."""
+        return self._instantanea.indice_final
+    
+    @property
+    def almacen(self):
+        """
+        `AlmacenDocumentos` del índice publicado, o None.
+        
+        Se cierra cuando se publica otro índice; para leerlo mientras puede
+        haber reconstrucciones, usar `fragmentos` o `instantanea()`.
+        """
+        return self._instantanea.almacen
+    
+    def instantanea(self):
+        """
+        Devuelve la instantánea publicada, registrada como en uso.
+        
+        Debe usarse con `with` (o llamar a `soltar()` al terminar): mientras
+        tanto la instantánea no cambia ni se libera, aunque se publique otra.
+        """
+        with self._cerrojo_publicacion:
+            return self._instantanea.adquirir()
+    
+    def publicar(self, indice, almacen=None):
+        """
+        Publica un índice nuevo reemplazando la instantánea actual.
+        
+        Los lectores que ya tienen la instantánea anterior la siguen usando
+        hasta terminar; después se libera.
+        
+        Args:
+            indice: Diccionario {término: [doc_ids]}; no debe modificarse después
+            almacen: `AlmacenDocumentos` del índice nuevo, o None
+        """
+        with self._cerrojo_publicacion:
+            anterior = self._instantanea
+            self._instantanea = Instantanea(indice, anterior.version + 1, almacen, self.termino_de_consulta)
+        anterior.retirar()
+        
+    def normalizar(self, texto):
+        """Normaliza el texto a minúsculas y remueve puntuación."""
+        texto = texto.lower()
+        texto = re.sub(r'[^\w\s]', ' ', texto)
+        texto = re.sub(r'\s+', ' ', texto)
+        return texto.strip()
+    
+    def tokenizar(self, texto):
+        """Divide el texto en tokens individuales."""
+        return self.normalizar(texto).split()
+    
+    def parse_documento(self, doc_id, contenido):
+        """
+        Parsea un documento y retorna una lista de tuplas (término, doc_id).
+        
+        La construcción usa `parse_ids_documento`, que evita armar las tuplas.
+        
+        Args:
+            doc_id: Identificador único del documento
+            contenido: Texto del documento
+            
+        Returns:
+            Lista de tuplas (término, doc_id)
+        """
+        terminos = self.terminos
+        return [(terminos[id_termino], doc_id) for id_termino in self.parse_ids_documento(contenido)]
+    
+    def parse_ids_documento(self, contenido):
+        """
+        Parsea un documento y retorna los ids de sus términos únicos.
+        
+        Cada término nuevo recibe el siguiente id entero libre; `self.terminos`
+        permite volver del id al término.
+        
+        Args:
+            contenido: Texto del documento
+            
+        Returns:
+            array de ids de término (uno por término único del documento)
+        """
+        tokens = self.tokenizar(contenido)
+        self.estadisticas.tokens += len(tokens)
+        if self.procesador is not None:
+            tokens = self.procesador.procesar(tokens)
+        
+        ids_terminos = self.ids_terminos
+        terminos = self.terminos
+        ids = array('I')
+        for termino in set(tokens):
+            id_termino = ids_terminos.get(termino)
+            if id_termino is None:
+                id_termino = ids_terminos[termino] = len(terminos)
+                terminos.append(termino)
+            ids.append(id_termino)
+        return ids
+    
+    def _ordenar_pares(self, ids_terminos, ids_docs):
+        """
+        Ordena los pares (id_término, id_doc) de un bloque sin repetidos.
+        
+        Cada par se empaqueta en un único entero de 64 bits (término en los
+        32 bits altos, documento en los bajos), así el orden de las claves es
+        el orden lexicográfico de los pares y se ordena una sola columna.
+        
+        Returns:
+            Tupla (términos, docs, límites): el id de cada término distinto,
+            los doc_ids (nombres) ordenados por término y documento, y las
+            posiciones donde empieza el tramo de cada término en `docs` (más
+            la longitud total)
+        """
+        if np is not None:
+            claves = np.frombuffer(ids_terminos, dtype=np.uintc).astype(np.uint64) << np.uint64(32)
+            claves |= np.frombuffer(ids_docs, dtype=np.uintc)
+            claves.sort()
+            if len(claves):
+                claves = claves[np.concatenate(([True], claves[1:] != claves[:-1]))]
+            terminos = claves >> np.uint64(32)
+            # Un término empieza donde cambia el id respecto del par anterior
+            inicios = np.flatnonzero(np.concatenate(([True], terminos[1:] != terminos[:-1])))
+            # Sólo los nombres de los documentos del bloque, no los de todo el corpus
+            ids = (claves & np.uint64(0xFFFFFFFF)).astype(np.intp)
+            primero, ultimo = (int(ids.min()), int(ids.max())) if len(ids) else (0, -1)
+            docs = np.array(self.doc_ids[primero:ultimo + 1], dtype=object)[ids - primero]
+            return terminos[inicios].tolist(), docs.tolist(), [*inicios.tolist(), len(claves)]
+        
+        claves = sorted({t << 32 | d for t, d in zip(ids_terminos, ids_docs)})
+        terminos = [c >> 32 for c in claves]
+        inicios = [i for i in range(len(terminos)) if i == 0 or terminos[i] != terminos[i - 1]]
+        nombres_docs = self.doc_ids
+        docs = [nombres_docs[c & 0xFFFFFFFF] for c in claves]
+        return [terminos[i] for i in inicios], docs, [*inicios, len(claves)]
+    
+    def invertir_bloque(self, ids_terminos, ids_docs):
+        """
+        Invierte un bloque de pares (término, doc_id) en un diccionario.
+        
+        El bloque llega como dos columnas paralelas de enteros; se ordena por
+        término y luego por documento y se agrupa por tramos de igual término.
+        
+        Args:
+            ids_terminos: array de ids de término
+            ids_docs: array de ids de documento (paralelo a `ids_terminos`)
+            
+        Returns:
+            Diccionario {término: [lista de doc_ids]}
+        """
+        terminos, docs, limites = self._ordenar_pares(ids_terminos, ids_docs)
+        nombres_terminos = self.terminos
+        
+        indice_bloque = {}
+        for id_termino, inicio, fin in zip(terminos, limites, limites[1:]):
+            indice_bloque[nombres_terminos[id_termino]] = docs[inicio:fin]
+        return indice_bloque
+    
+    def escribir_bloque_a_disco(self, indice_bloque, numero_bloque):
+        """
+        Escribe un índice de bloque a disco.
+        
+        Args:
+            indice_bloque: Diccionario {término: [doc_ids]}
+            numero_bloque: Número identificador del bloque
+        """
+        archivo_bloque = self.directorio_bloques / f"bloque_{numero_bloque}.txt"
+        muestras = []
+        
+        with open(archivo_bloque, 'w', encoding='utf-8') as f:
+            for i, termino in enumerate(sorted(indice_bloque.keys())):
+                if i % MUESTREO_BLOQUES == 0:
+                    # Permite a la fusión en paralelo empezar a leer desde aquí
+                    muestras.append((termino, f.tell()))
+                doc_ids = ','.join(map(str, indice_bloque[termino]))
+                f.write(f"{termino}\t{doc_ids}\n")
+        
+        self.muestras_bloques[numero_bloque:] = [muestras]
+        self.estadisticas.bloques_escritos += 1
+        self.estadisticas.bytes_escritos += archivo_bloque.stat().st_size
+    
+    def fusionar_bloques(self, num_bloques):
+        """
+        Fusiona todos los bloques en un índice final usando merge de k-vías.
+        
+        Con `procesos_fusion` > 1 delega en `fusionar_bloques_en_paralelo`.
+        
+        Args:
+            num_bloques: Número total de bloques a fusionar
+            
+        Returns:
+            Diccionario {término: [lista de doc_ids ordenados]}
+        """
+        if self.procesos_fusion > 1 and num_bloques > 1:
+            return self.fusionar_bloques_en_paralelo(num_bloques)
+        
+        # Abrir todos los archivos de bloques
+        archivos_bloques = []
+        heap = []
+        indice_final = {}
+        
+        estadisticas = self.estadisticas
+        
+        for i in range(num_bloques):
+            ruta_bloque = self.directorio_bloques / f"bloque_{i}.txt"
+            estadisticas.bytes_leidos += ruta_bloque.stat().st_size
+            archivo = open(ruta_bloque, 'r', encoding='utf-8')
+            archivos_bloques.append(archivo)
+            
+            # Leer primera línea de cada archivo
+            linea = archivo.readline().strip()
+            if linea:
+                termino, doc_ids = linea.split('\t')
+                doc_ids_list = doc_ids.split(',')
+                # Heap: (término, doc_ids, índice_archivo)
+                heapq.heappush(heap, (termino, doc_ids_list, i))
+        
+        # Merge de k-vías
+        termino_actual = None
+        doc_ids_acumulados = []
+        
+        while heap:
+            termino, doc_ids, idx_archivo = heapq.heappop(heap)
+            
+            # Si es un nuevo término, guardar el anterior
+            if termino_actual is not None and termino != termino_actual:
+                indice_final[termino_actual] = sorted(set(doc_ids_acumulados))
+                doc_ids_acumulados = []
+                estadisticas.terminos_fusionados += 1
+                if estadisticas.terminos_fusionados % 10000 == 0:
+                    self.instrumentacion.progresar()
+            
+            termino_actual = termino
+            doc_ids_acumulados.extend(doc_ids)
+            
+            # Leer siguiente línea del mismo archivo
+            linea = archivos_bloques[idx_archivo].readline().strip()
+            if linea:
+                termino, doc_ids = linea.split('\t')
+                doc_ids_list = doc_ids.split(',')
+                heapq.heappush(heap, (termino, doc_ids_list, idx_archivo))
+        
+        # Guardar el último término
+        if termino_actual is not None:
+            indice_final[termino_actual] = sorted(set(doc_ids_acumulados))
+            estadisticas.terminos_fusionados += 1
+        
+        # Cerrar archivos
+        for archivo in archivos_bloques:
+            archivo.close()
+        
+        return indice_final
+    
+    def rangos_de_fusion(self, num_rangos):
+        """
+        Divide el vocabulario en rangos disjuntos de tamaño parecido.
+        
+        Los límites son cuantiles de los términos muestreados al escribir
+        los bloques, así cada rango recibe una porción similar de líneas.
+        
+        Args:
+            num_rangos: Cantidad de rangos deseada
+            
+        Returns:
+            Lista de tuplas (desde, hasta) que cubren todos los términos;
+            `desde` es inclusivo, `hasta` exclusivo y None significa sin límite
+        """
+        muestras = sorted(termino for bloque in self.muestras_bloques for termino, _ in bloque)
+        limites = sorted({muestras[len(muestras) * i // num_rangos] for i in range(1, num_rangos)} - {muestras[0]})
+        extremos = [None, *limites, None]
+        return list(zip(extremos, extremos[1:]))
+    
+    def fusionar_bloques_en_paralelo(self, num_bloques):
+        """
+        Fusiona los bloques repartiendo rangos de términos entre procesos.
+        
+        Cada proceso salta en cada bloque a la última muestra anterior a su
+        rango, fusiona sólo sus términos y escribe su propio segmento. Como
+        los rangos son disjuntos y ordenados, el índice final es la
+        concatenación de los segmentos en orden.
+        
+        Args:
+            num_bloques: Número total de bloques a fusionar
+            
+        Returns:
+            Diccionario {término: [lista de doc_ids ordenados]}
+        """
+        estadisticas = self.estadisticas
+        rangos = self.rangos_de_fusion(self.procesos_fusion)
+        segmentos = [self.directorio_bloques / f"segmento_{i}.txt" for i in range(len(rangos))]
+        
+        with ProcessPoolExecutor(max_workers=self.procesos_fusion) as ejecutor:
+            tareas = []
+            for (desde, hasta), segmento in zip(rangos, segmentos):
+                bloques = []
+                for i in range(num_bloques):
+                    muestras = self.muestras_bloques[i]
+                    posicion = 0 if desde is None else max(0, bisect_right(muestras, (desde, float('inf'))) - 1)
+                    desplazamiento = muestras[posicion][1] if muestras else 0
+                    bloques.append((str(self.directorio_bloques / f"bloque_{i}.txt"), desplazamiento))
+                tareas.append(ejecutor.submit(_fusionar_rango, bloques, desde, hasta, str(segmento)))
+            
+            for tarea in as_completed(tareas):
+                terminos, bytes_leidos = tarea.result()
+                estadisticas.terminos_fusionados += terminos
+                estadisticas.bytes_leidos += bytes_leidos
+                self.instrumentacion.progresar()
+        
+        # Concatenar los segmentos en el orden de los rangos
+        indice_final = {}
+        for segmento in segmentos:
+            self._leer_indice(segmento, indice_final)
+        return indice_final
+    
+    def _leer_indice(self, ruta, indice):
+        """Agrega a `indice` los términos de un archivo con formato de bloque."""
+        with open(ruta, 'r', encoding='utf-8') as f:
+            for linea in f:
+                termino, doc_ids = linea.rstrip('\n').split('\t')
+                indice[termino] = doc_ids.split(',')
+    
+    def _volcar_bloque(self, ids_terminos, ids_docs, numero_bloque):
+        """Invierte un bloque lleno y lo escribe a disco, midiendo cada fase."""
+        with self.instrumentacion.fase('inversion'):
+            indice_bloque = self.invertir_bloque(ids_terminos, ids_docs)
+        with self.instrumentacion.fase('escritura'):
+            self.escribir_bloque_a_disco(indice_bloque, numero_bloque)
+        self.instrumentacion.progresar()
+    
+    def construir_indice(self, directorio_documentos, directorio_temp='./temp_blocks', directorio_almacen=None):
+        """
+        Construye un índice invertido usando BSBI.
+        
+        Args:
+            directorio_documentos: Directorio con documentos .txt, archivo
+                .zip, .tar.gz o .gz con documentos, o lista de rutas de
+                documentos o archivos
+            directorio_temp: Ruta al directorio temporal para bloques
+            directorio_almacen: Si se indica, guarda además el texto comprimido
+                de los documentos para generar fragmentos (ver `ii.almacen`)
+            
+        Returns:
+            Diccionario {término: [lista de doc_ids ordenados]}
+        """
+        # Una construcción a la vez; las consultas siguen sobre la instantánea publicada
+        with self._cerrojo_construccion:
+            self.directorio_bloques = Path(directorio_temp)
+            self.directorio_bloques.mkdir(exist_ok=True)
+            
+            self.ids_terminos = {}
+            self.terminos = []
+            self.doc_ids = []
+            self.muestras_bloques = []
+            
+            instrumentacion = self.instrumentacion
+            instrumentacion.iniciar()
+            estadisticas = instrumentacion.estadisticas
+            
+            escritor = None
+            if directorio_almacen is not None:
+                procesar_termino = self.procesador.procesar_termino if self.procesador else None
+                escritor = EscritorDocumentos(directorio_almacen, procesar_termino)
+            
+            try:
+                # Fase 1: Procesar documentos en bloques
+                # Bloque actual como dos columnas paralelas de ids enteros
+                bloque_terminos = array('I')
+                bloque_docs = array('I')
+                numero_bloque = 0
+                
+                # Los documentos pueden venir de un directorio o de archivos
+                # comprimidos, que se descomprimen en memoria (ver `ii.fuentes`)
+                documentos = leer_documentos(directorio_documentos)
+                agotados = False
+                while not agotados:
+                    # Un tramo de 'parseo' por bloque (incluye leer los documentos)
+                    with instrumentacion.fase('parseo'):
+                        agotados = True
+                        for doc_id, contenido, tamaño in documentos:
+                            id_doc = len(self.doc_ids)
+                            self.doc_ids.append(doc_id)
+                            
+                            # Parsear documento
+                            ids_doc = self.parse_ids_documento(contenido)
+                            bloque_terminos.extend(ids_doc)
+                            bloque_docs.extend(array('I', [id_doc]) * len(ids_doc))
+                            
+                            if escritor is not None:
+                                escritor.agregar(doc_id, contenido)
+                            
+                            estadisticas.documentos += 1
+                            estadisticas.bytes_leidos += tamaño
+                            estadisticas.pares += len(ids_doc)
+                            instrumentacion.progresar()
+                            
+                            # Si el bloque está lleno, procesarlo
+                            if len(bloque_terminos) >= self.tamaño_bloque:
+                                agotados = False
+                                break
+                    
+                    # Bloque lleno, o el último si tiene datos
+                    if bloque_terminos:
+                        self._volcar_bloque(bloque_terminos, bloque_docs, numero_bloque)
+                        numero_bloque += 1
+                        bloque_terminos = array('I')
+                        bloque_docs = array('I')
+                
+                # Fase 2: Fusionar todos los bloques
+                if numero_bloque > 0:
+                    with instrumentacion.fase('fusion'):
+                        indice_final = self.fusionar_bloques(numero_bloque)
+                else:
+                    indice_final = {}
+            except BaseException:
+                # Un almacén a medio escribir no se publica
+                if escritor is not None:
+                    escritor.descartar()
+                    escritor = None
+                raise
+            finally:
+                if escritor is not None:
+                    escritor.cerrar()
+                instrumentacion.terminar()
+            
+            # Los lectores pasan a ver el índice nuevo recién ahora
+            almacen = AlmacenDocumentos(escritor.version) if escritor is not None else None
+            self.publicar(indice_final, almacen)
+            
+            return dict(indice_final)
+
+    def guardar_indice(self, ruta):
+        """
+        Guarda el índice final en disco con el mismo formato que los bloques.
+
+        El archivo se escribe primero en una ruta temporal y luego se reemplaza
+        de forma atómica, para que un lector nunca vea un índice a medio escribir.
+
+        Args:
+            ruta: Ruta del archivo de índice
+        """
+        ruta = Path(ruta)
+        ruta_temporal = ruta.with_name(ruta.name + '.tmp')
+        indice_final = self.indice_final
+
+        with open(ruta_temporal, 'w', encoding='utf-8') as f:
+            for termino in sorted(indice_final.keys()):
+                doc_ids = ','.join(map(str, indice_final[termino]))
+                f.write(f"{termino}\t{doc_ids}\n")
+
+        os.replace(ruta_temporal, ruta)
+
+    def cargar_indice(self, ruta):
+        """
+        Carga un índice guardado con `guardar_indice`.
+
+        Args:
+            ruta: Ruta del archivo de índice
+
+        Returns:
+            Diccionario {término: [lista de doc_ids ordenados]}
+        """
+        indice_final = {}
+        self._leer_indice(ruta, indice_final)
+        self.publicar(indice_final)
+        return dict(indice_final)
+
+    def buscar(self, termino):
+        """
+        Busca un término en el índice.
+        
+        Args:
+            termino: Término a buscar
+            
+        Returns:
+            Lista de doc_ids que contienen el término
+        """
+        with self.instantanea() as instantanea:
+            return instantanea.buscar(termino)
+    
+    def termino_de_consulta(self, termino):
+        """
+        Convierte un término de consulta en el término tal como está indexado.
+        
+        Args:
+            termino: Término escrito por el usuario
+            
+        Returns:
+            Término normalizado (y procesado, si hay procesador), o None si
+            es una stopword
+        """
+        termino_normalizado = self.normalizar(termino)
+        if self.procesador is not None:
+            # La consulta pasa por el mismo pipeline que los documentos
+            termino_normalizado = self.procesador.procesar_termino(termino_normalizado)
+        return termino_normalizado
+    
+    def fragmentos(self, doc_id, terminos, ancho=60, maximo=3):
+        """
+        Devuelve fragmentos del documento alrededor de los términos de consulta.
+        
+        Requiere haber construido el índice con `directorio_almacen`.
+        
+        Args:
+            doc_id: Documento del resultado
+            terminos: Términos de la consulta (sin normalizar)
+            ancho: Bytes de contexto a cada lado de cada aparición
+            maximo: Cantidad máxima de fragmentos
+            
+        Returns:
+            Lista de fragmentos de texto
+        """
+        # La instantánea en uso no cierra su almacén aunque se publique otra
+        with self.instantanea() as instantanea:
+            return instantanea.fragmentos(doc_id, terminos, ancho, maximo)
+    
+    def buscar_regex(self, patron):
+        """
+        Busca los términos del índice que coinciden con una expresión regular.
+        
+        Usa un índice de trigramas para descartar términos que no pueden
+        coincidir antes de aplicar la expresión regular.
+        
+        Args:
+            patron: Expresión regular
+            
+        Returns:
+            Diccionario {término: [lista de doc_ids]}
+        """
+        with self.instantanea() as instantanea:
+            return instantanea.buscar_regex(patron)
+    
+    def reconstruir_en_segundo_plano(self, *args, **kwargs):
+        """
+        Ejecuta `construir_indice` en otro hilo.
+        
+        Mientras tanto las consultas siguen respondiendo con el índice
+        publicado; al terminar, el índice nuevo se publica de forma atómica.
+        
+        Args:
+            Los mismos de `construir_indice`
+            
+        Returns:
+            `concurrent.futures.Future` con el resultado de `construir_indice`
+        """
+        futuro = Future()
+        
+        def construir():
+            if not futuro.set_running_or_notify_cancel():
+                return
+            try:
+                futuro.set_result(self.construir_indice(*args, **kwargs))
+            except BaseException as error:
+                futuro.set_exception(error)
+        
+        threading.Thread(target=construir, daemon=True).start()
+        return futuro
+
+
+def _fusionar_rango(bloques, desde, hasta, ruta_segmento):
+    """
+    Fusiona el rango de términos [desde, hasta) de todos los bloques.
+    
+    Se ejecuta en un proceso aparte (ver `BSBI.fusionar_bloques_en_paralelo`).
+    
+    Args:
+        bloques: Lista de tuplas (ruta del bloque, desplazamiento inicial)
+        desde: Primer término del rango (None: desde el principio)
+        hasta: Término donde termina el rango, exclusivo (None: hasta el final)
+        ruta_segmento: Archivo donde se escribe el segmento fusionado
+        
+    Returns:
+        Tupla (términos fusionados, bytes leídos)
+    """
+    bytes_leidos = 0
+    
+    def lineas(ruta, desplazamiento):
+        nonlocal bytes_leidos
+        with open(ruta, 'r', encoding='utf-8') as f:
+            f.seek(desplazamiento)
+            try:
+                while linea := f.readline():
+                    termino, doc_ids = linea.rstrip('\n').split('\t')
+                    if hasta is not None and termino >= hasta:
+                        break
+                    if desde is None or termino >= desde:
+                        yield termino, doc_ids
+            finally:
+                bytes_leidos += f.tell() - desplazamiento
+    
+    terminos = 0
+    fusion = heapq.merge(*(lineas(ruta, desplazamiento) for ruta, desplazamiento in bloques), key=itemgetter(0))
+    with open(ruta_segmento, 'w', encoding='utf-8') as salida:
+        for termino, grupo in groupby(fusion, key=itemgetter(0)):
+            doc_ids = sorted({doc_id for _, ids in grupo for doc_id in ids.split(',')})
+            salida.write(f"{termino}\t{','.join(doc_ids)}\n")
+            terminos += 1
+    return terminos, bytes_leidos
+
+
+def ejemplo_bsbi():
+    """Ejemplo de uso del algoritmo BSBI."""
+    
+    # Ruta al corpus de documentos
+    directorio_corpus = Path(__file__).parent / "corpus"
+    
+    if not directorio_corpus.exists():
+        print(f"Error: No se encuentra el directorio {directorio_corpus}")
+        return
+    
+    print("=== Construcción de Índice Invertido con BSBI ===\n")
+    
+    # Crear constructor BSBI
+    bsbi = BSBI(tamaño_bloque=50)
+    
+    # Construir índice
+    print(f"Procesando documentos en {directorio_corpus}...")
+    indice = bsbi.construir_indice(directorio_corpus)
+    
+    print(f"\nÍndice construido con {len(indice)} términos únicos")
+    
+    # Mostrar algunos términos de ejemplo
+    print("\nMuestra de términos en el índice:")
+    terminos_muestra = sorted(indice.keys())[:10]
+    for termino in terminos_muestra:
+        print(f"  {termino}: {indice[termino]}")
+    
+    print("\n=== Estadísticas del Índice ===")
+    total_postings = sum(len(docs) for docs in indice.values())
+    print(f"Total de términos: {len(indice)}")
+    print(f"Total de postings: {total_postings}")
+    print(f"Promedio de docs por término: {total_postings / len(indice):.2f}")
+
+
+if __name__ == "__main__":
+    ejemplo_bsbi()
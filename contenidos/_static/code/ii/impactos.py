@@ -0,0 +1,156 @@
+"""
+Postings ordenados por impacto en niveles, con terminación temprana.
+
+En una consulta rankeada, recorrer completas las listas de los términos
+frecuentes domina el tiempo de respuesta. `IndiceImpactos` guarda los postings
+de cada término ordenados por impacto —la contribución del documento al
+puntaje— y partidos en niveles: el primero tiene los pocos documentos de
+mayor impacto y cada nivel siguiente duplica el tamaño del anterior. Cada
+nivel conoce su impacto máximo, que acota lo que todavía puede sumar.
+
+La consulta procesa los niveles de todos sus términos de mayor a menor cota
+y se detiene en cuanto ningún documento fuera del top-k puede alcanzar al
+k-ésimo con lo que falta leer; para las consultas con términos muy
+frecuentes esto evita leer la mayor parte de sus postings.
+
+El puntaje es el coseno TF-IDF de `ii.vectorial` (el índice no guarda
+frecuencias: el impacto de un documento para un término es idf / ‖d‖), así
+que con `exactitud=1` el resultado coincide con `MatrizTfIdf.top_k`. Valores
+menores de `exactitud` cortan antes a cambio de poder perder documentos.
+
+    from ii.impactos import IndiceImpactos
+
+    indice = IndiceImpactos(bsbi, niveles=4)
+    indice.buscar("hobbit anillo", k=10)                  # exacto
+    indice.buscar("hobbit anillo", k=10, exactitud=0.8)   # más rápido
+"""
+
+import heapq
+import math
+from collections import Counter
+
+
+class IndiceImpactos:
+    """
+    Índice con postings por niveles de impacto para consultas top-k.
+
+    Atributos:
+        niveles: {término: [(impacto máximo, {doc_id: impacto}), ...]}, de
+            mayor a menor impacto
+        idf: {término: idf}
+    """
+
+    def __init__(self, indice, niveles=4, termino_de_consulta=None):
+        """
+        Args:
+            indice: `BSBI`, instantánea (ver `ii.instantaneas`) o diccionario
+                {término: [doc_ids]}
+            niveles: Cantidad máxima de niveles por término
+            termino_de_consulta: Función que normaliza un término de consulta;
+                por defecto la de `indice` si la tiene, si no el término tal cual
+        """
+        if termino_de_consulta is None:
+            termino_de_consulta = getattr(indice, "termino_de_consulta", None)
+        self.termino_de_consulta = termino_de_consulta or (lambda termino: termino)
+        postings = getattr(indice, "indice_final", indice)
+
+        total_documentos = len({doc_id for docs in postings.values() for doc_id in docs})
+        self.idf = {termino: math.log(total_documentos / len(docs)) for termino, docs in postings.items() if docs}
+        normas = Counter()
+        for termino, docs in postings.items():
+            peso = self.idf.get(termino, 0.0) ** 2
+            for doc_id in docs:
+                normas[doc_id] += peso
+
+        self.niveles = {}
+        for termino, docs in postings.items():
+            idf = self.idf.get(termino, 0.0)
+            if idf == 0:
+                continue  # presente en todos los documentos: no aporta puntaje
+            impactos = sorted(((idf / math.sqrt(normas[d]), d) for d in docs), reverse=True)
+            self.niveles[termino] = self._partir(impactos, niveles)
+
+    @staticmethod
+    def _partir(impactos, niveles):
+        """Parte una lista ordenada en niveles que duplican su tamaño."""
+        n = len(impactos)
+        limites = sorted({0, *(math.ceil(n / 2 ** (niveles - 1 - i)) for i in range(niveles))})
+        return [
+            (impactos[desde][0], {doc_id: impacto for impacto, doc_id in impactos[desde:hasta]})
+            for desde, hasta in zip(limites, limites[1:])
+        ]
+
+    def _pesos_consulta(self, consulta):
+        """Pesos normalizados (frecuencia × idf) de los términos de la consulta."""
+        if isinstance(consulta, str):
+            consulta = consulta.split()
+        frecuencias = Counter(self.termino_de_consulta(t) for t in consulta)
+        pesos = {t: n * self.idf[t] for t, n in frecuencias.items() if t in self.niveles}
+        norma = math.sqrt(sum(p * p for p in pesos.values())) or 1.0
+        return {t: p / norma for t, p in pesos.items()}
+
+    def buscar(self, consulta, k=10, exactitud=1.0):
+        """
+        Devuelve los k documentos con mayor coseno, leyendo el mínimo de niveles.
+
+        Args:
+            consulta: Texto o lista de términos sin normalizar
+            k: Cantidad de documentos
+            exactitud: Entre 0 y 1; con 1 el resultado es exacto. Con valores
+                menores la cota de lo que falta leer se multiplica por
+                `exactitud`, así se corta antes y pueden omitirse documentos
+
+        Returns:
+            Lista de tuplas (puntaje, doc_id) de mayor a menor
+        """
+        return self._buscar(consulta, k, exactitud)[0]
+
+    def _buscar(self, consulta, k, exactitud):
+        pesos = self._pesos_consulta(consulta)
+        # Niveles de todos los términos, de mayor a menor cota de contribución
+        pendientes = sorted(
+            (
+                (peso * cota, termino, i)
+                for termino, peso in pesos.items()
+                for i, (cota, _) in enumerate(self.niveles[termino])
+            ),
+            reverse=True,
+        )
+        # Lo que cada término todavía puede aportar a un documento
+        restante = {termino: peso * self.niveles[termino][0][0] for termino, peso in pesos.items()}
+        leidos = dict.fromkeys(pesos, 0)
+        acumulado = Counter()
+        postings = 0
+
+        for _, termino, nivel in pendientes:
+            peso = pesos[termino]
+            documentos = self.niveles[termino][nivel][1]
+            for doc_id, impacto in documentos.items():
+                acumulado[doc_id] += peso * impacto
+            postings += len(documentos)
+            leidos[termino] = nivel + 1
+            siguiente = self.niveles[termino][nivel + 1 :]
+            restante[termino] = peso * siguiente[0][0] if siguiente else 0.0
+
+            cota = sum(restante.values())
+            if cota == 0:
+                break
+            mejores = heapq.nlargest(k + 1, acumulado.values())
+            if len(mejores) >= k:
+                # Ni el (k+1)-ésimo ni un documento nuevo pueden superar al k-ésimo
+                fuera = mejores[k] if len(mejores) > k else 0.0
+                if fuera + cota * exactitud <= mejores[k - 1]:
+                    break
+
+        top = heapq.nlargest(k, acumulado.items(), key=lambda par: (par[1], par[0]))
+        # Completar el puntaje de los elegidos con los niveles no leídos
+        resultado = []
+        for doc_id, puntaje in top:
+            for termino, peso in pesos.items():
+                for _, documentos in self.niveles[termino][leidos[termino] :]:
+                    if doc_id in documentos:
+                        puntaje += peso * documentos[doc_id]
+                        break
+            resultado.append((puntaje, doc_id))
+        resultado.sort(key=lambda par: (-par[0], par[1]))
+        return resultado, postings
@@ -0,0 +1,119 @@
+"""
+Instantáneas inmutables del índice para consultar durante una reconstrucción.
+
+`BSBI` nunca modifica el índice publicado: `construir_indice` y
+`cargar_indice` arman un diccionario nuevo y lo publican reemplazando la
+instantánea actual en una sola operación. Un lector que obtuvo una
+instantánea sigue viendo siempre la misma versión, aunque mientras tanto se
+publique otra, así que una consulta con varios términos nunca mezcla dos
+versiones del índice.
+
+    with bsbi.instantanea() as indice:
+        evaluar_rpn(rpn, indice, _universo_docs(indice))
+
+La instantánea reemplazada se retira, y sus recursos (el almacén de
+documentos abierto) se liberan cuando el último lector que la usa termina.
+
+`BSBI.buscar`, `fragmentos` y `buscar_regex` adquieren la instantánea
+durante cada llamada, así que pueden usarse mientras otro hilo publica.
+
+Las instantáneas viven en la memoria de un proceso y pueden consultarse
+desde cualquiera de sus hilos. Otros procesos no las comparten: leen la
+versión guardada en disco, que también se publica de forma atómica.
+`guardar_indice` escribe un único archivo temporal y lo reemplaza con
+`os.replace`; el almacén de documentos escribe cada versión en un
+subdirectorio propio y la publica reemplazando un único archivo `ACTUAL`
+(ver `ii.almacen`). Así, un proceso que carga el índice con `cargar_indice`
+o abre un `AlmacenDocumentos` ve siempre una versión completa. `ii.servidor`
+recarga el índice guardado con `recargar`.
+"""
+
+import threading
+from types import MappingProxyType
+
+try:
+    from .trigramas import IndiceTrigramas
+except ImportError:  # ejecutado como script: python ii.py
+    from trigramas import IndiceTrigramas
+
+
+class Instantanea:
+    """
+    Versión publicada e inmutable del índice.
+
+    Ofrece la misma interfaz de consulta que `BSBI` (`indice_final`,
+    `buscar`, `fragmentos`, `buscar_regex`, `almacen`), así que puede pasarse
+    a las funciones de `busquedas` en lugar del objeto `BSBI`.
+    """
+
+    def __init__(self, indice, version=0, almacen=None, termino_de_consulta=None):
+        """
+        Args:
+            indice: Diccionario {término: [doc_ids]}; no debe modificarse
+                después de publicarlo
+            version: Número de versión (crece con cada publicación)
+            almacen: `AlmacenDocumentos` asociado, o None
+            termino_de_consulta: Función que normaliza un término de consulta
+                (por defecto, el término tal cual)
+        """
+        self.indice_final = MappingProxyType(indice)
+        self.version = version
+        self.almacen = almacen
+        self.termino_de_consulta = termino_de_consulta or (lambda termino: termino)
+        self._indice_trigramas = None
+        self._cerrojo = threading.Lock()
+        self._lectores = 0
+        self._retirada = False
+
+    def __len__(self):
+        return len(self.indice_final)
+
+    def buscar(self, termino):
+        """Devuelve la lista de doc_ids que contienen el término."""
+        return self.indice_final.get(self.termino_de_consulta(termino), [])
+
+    def fragmentos(self, doc_id, terminos, ancho=60, maximo=3):
+        """Ver `BSBI.fragmentos`."""
+        if self.almacen is None:
+            raise ValueError("El índice se construyó sin almacén de documentos")
+        terminos = [self.termino_de_consulta(t) for t in terminos]
+        return self.almacen.fragmentos(doc_id, [t for t in terminos if t], ancho, maximo)
+
+    def buscar_regex(self, patron):
+        """Ver `BSBI.buscar_regex`; el índice de trigramas se crea al primer uso."""
+        with self._cerrojo:
+            if self._indice_trigramas is None:
+                self._indice_trigramas = IndiceTrigramas(self.indice_final)
+        return self._indice_trigramas.buscar(patron)
+
+    def adquirir(self):
+        """Registra un lector; la instantánea no se libera hasta `soltar`."""
+        with self._cerrojo:
+            self._lectores += 1
+        return self
+
+    def soltar(self):
+        """Da de baja un lector y libera la instantánea si ya fue retirada."""
+        with self._cerrojo:
+            self._lectores -= 1
+            liberar = self._retirada and self._lectores == 0
+        if liberar:
+            self._liberar()
+
+    def retirar(self):
+        """Marca la instantánea como reemplazada; se libera sin lectores."""
+        with self._cerrojo:
+            self._retirada = True
+            liberar = self._lectores == 0
+        if liberar:
+            self._liberar()
+
+    def _liberar(self):
+        if self.almacen is not None:
+            self.almacen.cerrar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.soltar()
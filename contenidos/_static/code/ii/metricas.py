@@ -0,0 +1,240 @@
+"""
+Instrumentación de la construcción del índice.
+
+`BSBI` actualiza un objeto `EstadisticasConstruccion` a medida que avanza y
+notifica a los observadores registrados (subclases de
+`ObservadorConstruccion`) al empezar y terminar cada fase y periódicamente
+durante la construcción. `RegistroProgreso` es un observador listo para usar
+que escribe el progreso con `logging` y avisa si la construcción se detiene.
+"""
+
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+FASES = ("parseo", "inversion", "escritura", "fusion")
+
+logger = logging.getLogger(__name__)
+
+
+def pico_memoria():
+    """
+    Pico de memoria residente del proceso actual en bytes (None si no se puede medir).
+
+    Es el máximo desde que arrancó el proceso (`ru_maxrss`), no puede
+    reiniciarse: incluye lo que haya usado antes de la medición.
+    """
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa KB; macOS, bytes
+    return pico if sys.platform == "darwin" else pico * 1024
+
+
+class EstadisticasConstruccion:
+    """
+    Contadores y tiempos por fase de una construcción BSBI.
+
+    Atributos:
+        documentos: Documentos procesados
+        tokens: Tokens leídos (antes de eliminar repetidos)
+        pares: Pares (término, doc_id) generados
+        bloques_escritos: Bloques volcados a disco
+        bytes_leidos: Bytes leídos de documentos y bloques
+        bytes_escritos: Bytes escritos en bloques
+        terminos_fusionados: Términos del índice final ya fusionados
+        memoria_maxima: Pico de memoria residente del proceso en bytes desde
+            que arrancó, no sólo durante la construcción (None si no se mide)
+        memoria_inicial: Ese mismo pico al iniciar la construcción
+        fase: Fase en curso (None si no hay ninguna)
+        tiempos: Segundos acumulados por fase
+    """
+
+    def __init__(self):
+        self.documentos = 0
+        self.tokens = 0
+        self.pares = 0
+        self.bloques_escritos = 0
+        self.bytes_leidos = 0
+        self.bytes_escritos = 0
+        self.terminos_fusionados = 0
+        self.memoria_maxima = None
+        self.memoria_inicial = None
+        self.fase = None
+        self.tiempos = {fase: 0.0 for fase in FASES}
+        self.inicio = time.perf_counter()
+        self.fin = None
+
+    @property
+    def segundos(self):
+        """Segundos transcurridos desde el inicio de la construcción."""
+        return (self.fin or time.perf_counter()) - self.inicio
+
+    @property
+    def aumento_memoria(self):
+        """
+        Cuánto subió el pico de memoria durante la construcción, en bytes.
+
+        Es 0 si la construcción no superó un pico anterior del proceso, así
+        que sólo mide la construcción en un proceso recién iniciado o cuando
+        ésta es lo que más memoria usa (None si no se mide).
+        """
+        if self.memoria_maxima is None or self.memoria_inicial is None:
+            return None
+        return self.memoria_maxima - self.memoria_inicial
+
+    def actualizar_memoria(self):
+        """Registra el pico de memoria actual."""
+        self.memoria_maxima = pico_memoria()
+        if self.memoria_inicial is None:
+            self.memoria_inicial = self.memoria_maxima
+
+    def como_dict(self):
+        """Devuelve las estadísticas como diccionario serializable a JSON."""
+        return {
+            "documentos": self.documentos,
+            "tokens": self.tokens,
+            "pares": self.pares,
+            "bloques_escritos": self.bloques_escritos,
+            "bytes_leidos": self.bytes_leidos,
+            "bytes_escritos": self.bytes_escritos,
+            "terminos_fusionados": self.terminos_fusionados,
+            "memoria_maxima": self.memoria_maxima,
+            "aumento_memoria": self.aumento_memoria,
+            "fase": self.fase,
+            "tiempos": dict(self.tiempos),
+            "segundos": self.segundos,
+        }
+
+    def __str__(self):
+        memoria = f"{self.memoria_maxima / 1024**2:.1f} MB" if self.memoria_maxima else "?"
+        return (
+            f"[{self.fase or '-'}] {self.documentos} docs, {self.tokens} tokens, {self.pares} pares, "
+            f"{self.bloques_escritos} bloques, {self.terminos_fusionados} términos fusionados, "
+            f"leídos {self.bytes_leidos / 1024**2:.1f} MB, escritos {self.bytes_escritos / 1024**2:.1f} MB, "
+            f"memoria {memoria}, {self.segundos:.1f} s"
+        )
+
+
+class ObservadorConstruccion:
+    """
+    Interfaz de observadores de la construcción.
+
+    Todos los métodos reciben el objeto `EstadisticasConstruccion` vivo (no
+    una copia) y por defecto no hacen nada; basta con redefinir los que
+    interesen. Se invocan desde el hilo que construye el índice, por lo que
+    deben ser rápidos.
+    """
+
+    def al_iniciar(self, estadisticas):
+        """La construcción comienza."""
+
+    def al_iniciar_fase(self, fase, estadisticas):
+        """Comienza un tramo de la fase `fase` (puede repetirse por bloque)."""
+
+    def al_terminar_fase(self, fase, estadisticas):
+        """Termina un tramo de la fase `fase`."""
+
+    def al_progresar(self, estadisticas):
+        """Hubo avance (un documento, un bloque o un lote de términos fusionados)."""
+
+    def al_terminar(self, estadisticas):
+        """La construcción terminó (también se invoca si falló)."""
+
+
+class RegistroProgreso(ObservadorConstruccion):
+    """
+    Escribe el progreso de la construcción cada `intervalo` segundos.
+
+    Usa un hilo propio, así el registro sigue apareciendo aunque una fase
+    tarde mucho. Si entre dos registros ningún contador avanzó durante al
+    menos `umbral_estancamiento` segundos se emite una advertencia, que puede
+    usarse para disparar alertas.
+    """
+
+    def __init__(self, intervalo=30.0, umbral_estancamiento=300.0, registro=None):
+        """
+        Args:
+            intervalo: Segundos entre registros de progreso
+            umbral_estancamiento: Segundos sin avance antes de advertir
+            registro: Logger a usar (por defecto, el de este módulo)
+        """
+        self.intervalo = intervalo
+        self.umbral_estancamiento = umbral_estancamiento
+        self.registro = registro or logger
+        self._detener = threading.Event()
+        self._hilo = None
+        self._ultimo_avance = time.monotonic()
+
+    def al_iniciar(self, estadisticas):
+        self._detener.clear()
+        self._ultimo_avance = time.monotonic()
+        self._hilo = threading.Thread(target=self._registrar, args=(estadisticas,), daemon=True)
+        self._hilo.start()
+
+    def al_progresar(self, estadisticas):
+        self._ultimo_avance = time.monotonic()
+
+    def al_terminar(self, estadisticas):
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join()
+            self._hilo = None
+        self.registro.info("Construcción terminada: %s", estadisticas)
+
+    def _registrar(self, estadisticas):
+        while not self._detener.wait(self.intervalo):
+            quieto = time.monotonic() - self._ultimo_avance
+            if quieto >= self.umbral_estancamiento:
+                self.registro.warning("Construcción sin avances hace %.0f s: %s", quieto, estadisticas)
+            else:
+                self.registro.info("Progreso: %s", estadisticas)
+
+
+class Instrumentacion:
+    """Une las estadísticas con los observadores; la usa `BSBI` internamente."""
+
+    def __init__(self, observadores=()):
+        self.observadores = list(observadores)
+        self.estadisticas = EstadisticasConstruccion()
+
+    def iniciar(self):
+        self.estadisticas = EstadisticasConstruccion()
+        self.estadisticas.actualizar_memoria()
+        for observador in self.observadores:
+            observador.al_iniciar(self.estadisticas)
+
+    @contextmanager
+    def fase(self, nombre):
+        """Mide el tiempo de un tramo de la fase `nombre`."""
+        estadisticas = self.estadisticas
+        anterior = estadisticas.fase
+        estadisticas.fase = nombre
+        for observador in self.observadores:
+            observador.al_iniciar_fase(nombre, estadisticas)
+        inicio = time.perf_counter()
+        try:
+            yield estadisticas
+        finally:
+            estadisticas.tiempos[nombre] += time.perf_counter() - inicio
+            estadisticas.actualizar_memoria()
+            for observador in self.observadores:
+                observador.al_terminar_fase(nombre, estadisticas)
+            estadisticas.fase = anterior
+
+    def progresar(self):
+        for observador in self.observadores:
+            observador.al_progresar(self.estadisticas)
+
+    def terminar(self):
+        self.estadisticas.actualizar_memoria()
+        self.estadisticas.fin = time.perf_counter()
+        for observador in self.observadores:
+            observador.al_terminar(self.estadisticas)
@@ -0,0 +1,181 @@
+"""
+Índice particionado por documentos con ejecución scatter-gather.
+
+La colección se reparte en N particiones según un hash estable del doc_id;
+cada partición es un índice BSBI completo que se construye y se guarda por
+separado (en paralelo, un proceso por partición). Al consultar, un
+coordinador envía la consulta a todas las particiones a la vez —cada una
+cargada en su propio proceso— y combina las respuestas:
+
+- Booleana: unión de los resultados. Como cada documento vive en una sola
+  partición, NOT se resuelve localmente contra el universo de la partición.
+- Rankeada: primero se suman las frecuencias de documento (df) y el total de
+  documentos de todas las particiones, para que el idf sea global; luego
+  cada partición devuelve su top-k y se fusionan con un heap.
+
+Cada partición es un archivo independiente (ver `BSBI.guardar_indice`), así
+que pueden repartirse entre máquinas y servirse, por ejemplo, con
+`ii.servidor`.
+
+Estructura del directorio de salida:
+
+    particiones.json     manifiesto (cantidad de particiones y archivos)
+    particion_0.txt ...  índice de cada partición
+"""
+
+import heapq
+import json
+import shutil
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+
+from .busquedas import _a_rpn, _tokenizar_booleana, _universo_docs, busqueda_rankeada, evaluar_rpn
+from .ii import BSBI
+
+
+def particion_de(doc_id, num_particiones):
+    """Partición de un documento (hash estable entre ejecuciones y máquinas)."""
+    return zlib.crc32(doc_id.encode("utf-8")) % num_particiones
+
+
+def _construir_particion(numero, rutas, directorio_salida, tamaño_bloque):
+    """Construye y guarda una partición; se ejecuta en un proceso aparte."""
+    directorio_salida = Path(directorio_salida)
+    directorio_temp = directorio_salida / f"bloques_{numero}"
+    archivo = f"particion_{numero}.txt"
+
+    bsbi = BSBI(tamaño_bloque=tamaño_bloque)
+    indice = bsbi.construir_indice(rutas, directorio_temp)
+    bsbi.guardar_indice(directorio_salida / archivo)
+    shutil.rmtree(directorio_temp, ignore_errors=True)
+    return {"archivo": archivo, "documentos": len(rutas), "terminos": len(indice)}
+
+
+def construir_particiones(
+    directorio_documentos, directorio_salida, num_particiones=4, tamaño_bloque=100_000, procesos=None
+):
+    """
+    Reparte los documentos en particiones y construye cada una en paralelo.
+
+    Args:
+        directorio_documentos: Directorio con los documentos .txt
+        directorio_salida: Directorio donde se guardan las particiones
+        num_particiones: Cantidad de particiones
+        tamaño_bloque: Tamaño de bloque de BSBI para cada partición
+        procesos: Procesos para construir (por defecto, uno por CPU)
+
+    Returns:
+        Manifiesto de las particiones (también se guarda en particiones.json)
+    """
+    directorio_salida = Path(directorio_salida)
+    directorio_salida.mkdir(parents=True, exist_ok=True)
+
+    rutas = [[] for _ in range(num_particiones)]
+    for ruta in sorted(Path(directorio_documentos).glob("*.txt")):
+        rutas[particion_de(ruta.stem, num_particiones)].append(str(ruta))
+
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        tareas = [
+            ejecutor.submit(_construir_particion, i, rutas[i], str(directorio_salida), tamaño_bloque)
+            for i in range(num_particiones)
+        ]
+        particiones = [tarea.result() for tarea in tareas]
+
+    manifiesto = {"num_particiones": num_particiones, "particiones": particiones}
+    with open(directorio_salida / "particiones.json", "w", encoding="utf-8") as f:
+        json.dump(manifiesto, f, ensure_ascii=False, indent=2)
+    return manifiesto
+
+
+# Estado de cada proceso trabajador: una partición cargada por proceso
+_bsbi = None
+_universo = None
+
+
+def _cargar_particion(ruta):
+    global _bsbi, _universo
+    _bsbi = BSBI()
+    _bsbi.cargar_indice(ruta)
+    _universo = _universo_docs(_bsbi)
+
+
+def _evaluar_booleana(consulta):
+    return evaluar_rpn(_a_rpn(_tokenizar_booleana(consulta)), _bsbi, _universo)
+
+
+def _estadisticas(terminos):
+    """Cantidad de documentos de la partición y df local de cada término."""
+    return len(_universo), {t: len(_bsbi.buscar(t)) for t in terminos}
+
+
+def _rankear(terminos, k, df, total_documentos):
+    return busqueda_rankeada(_bsbi, terminos, k, df, total_documentos)
+
+
+class IndiceParticionado:
+    """
+    Coordinador de consultas sobre un índice particionado.
+
+    Mantiene un proceso por partición con su índice cargado, de modo que
+    cada consulta se evalúa en todas las particiones en paralelo.
+    """
+
+    def __init__(self, directorio):
+        """
+        Args:
+            directorio: Directorio generado por `construir_particiones`
+        """
+        directorio = Path(directorio)
+        with open(directorio / "particiones.json", "r", encoding="utf-8") as f:
+            self.manifiesto = json.load(f)
+        self._procesos = [
+            ProcessPoolExecutor(
+                max_workers=1, initializer=_cargar_particion, initargs=(str(directorio / p["archivo"]),)
+            )
+            for p in self.manifiesto["particiones"]
+        ]
+
+    def _difundir(self, funcion, *args):
+        """Ejecuta `funcion` en todas las particiones a la vez y junta los resultados."""
+        tareas = [proceso.submit(funcion, *args) for proceso in self._procesos]
+        return [tarea.result() for tarea in tareas]
+
+    def buscar_booleana(self, consulta):
+        """
+        Evalúa una consulta booleana ((), AND, OR, NOT) en todas las particiones.
+
+        Returns:
+            Conjunto de doc_ids
+        """
+        return set().union(*self._difundir(_evaluar_booleana, consulta))
+
+    def buscar_rankeada(self, terminos, k=10):
+        """
+        Devuelve los k documentos con mayor puntaje usando idf global.
+
+        Returns:
+            Lista de tuplas (puntaje, doc_id) de mayor a menor
+        """
+        terminos = list(dict.fromkeys(t for t in terminos if t))
+        total_documentos = 0
+        df = dict.fromkeys(terminos, 0)
+        for documentos, df_local in self._difundir(_estadisticas, terminos):
+            total_documentos += documentos
+            for termino, frecuencia in df_local.items():
+                df[termino] += frecuencia
+
+        # Cada lista llega ordenada de mayor a menor: se fusionan con un heap
+        parciales = self._difundir(_rankear, terminos, k, df, total_documentos)
+        return list(islice(heapq.merge(*parciales, reverse=True), k))
+
+    def cerrar(self):
+        for proceso in self._procesos:
+            proceso.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
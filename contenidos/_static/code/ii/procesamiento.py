@@ -0,0 +1,202 @@
+"""
+Procesamiento lingüístico de términos para la construcción del índice.
+
+`BSBI` normaliza y tokeniza el texto; un `ProcesadorTerminos` recibe esos
+tokens y aplica, en orden, eliminación de stopwords y reducción (stemming o
+lematización). Como el vocabulario es minúsculo comparado con la cantidad de
+tokens, el resultado de cada término se memoiza en una caché LRU acotada: el
+stemmer sólo se invoca una vez por término distinto y no una vez por token.
+
+Ejemplo:
+
+    from ii import BSBI
+    from ii.procesamiento import procesador_snowball
+
+    bsbi = BSBI(procesador=procesador_snowball("spanish"))
+    bsbi.construir_indice("corpus")
+    bsbi.buscar("programación")  # busca el stem "program"
+
+NLTK y spaCy son dependencias opcionales: sólo se importan al crear el
+procesador que las usa.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class ProcesadorTerminos:
+    """
+    Pipeline stopwords → reducción con caché acotada por término.
+
+    La reducción se aplica por lotes (`reducir_lote`) sobre los términos de
+    un documento que todavía no están en la caché, lo que permite a las
+    subclases delegar en herramientas que procesan lotes más eficientemente
+    (por ejemplo `nlp.pipe` de spaCy).
+
+    La caché se protege con un cerrojo, porque durante una reconstrucción en
+    segundo plano el índice y las consultas usan el mismo procesador. El
+    cerrojo sólo se toma para leer y escribir la caché: la reducción del
+    lote, que es lo costoso, se hace sin él, así que varios hilos pueden
+    reducir a la vez (si dos reducen el mismo término, se memoiza una vez).
+    """
+
+    def __init__(self, stopwords=(), reductor=None, tamaño_cache=100_000):
+        """
+        Args:
+            stopwords: Términos (ya normalizados) que no se indexan
+            reductor: Función término → término (stemmer o lematizador); None
+                para no reducir
+            tamaño_cache: Cantidad máxima de términos memoizados
+        """
+        self.stopwords = frozenset(stopwords)
+        self.reductor = reductor
+        self.tamaño_cache = tamaño_cache
+        self._cache = OrderedDict()
+        self._cerrojo = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def reducir_lote(self, terminos):
+        """
+        Reduce una lista de términos que no estaban en la caché.
+
+        Args:
+            terminos: Lista de términos distintos
+
+        Returns:
+            Lista de términos reducidos, en el mismo orden
+        """
+        if self.reductor is None:
+            return list(terminos)
+        return [self.reductor(termino) for termino in terminos]
+
+    def _memoizar(self, termino, reducido):
+        cache = self._cache
+        cache[termino] = reducido
+        if len(cache) > self.tamaño_cache:
+            cache.popitem(last=False)
+
+    def procesar(self, tokens):
+        """
+        Aplica el pipeline a una lista de tokens normalizados.
+
+        Args:
+            tokens: Lista de tokens (con repeticiones)
+
+        Returns:
+            Lista de términos procesados, sin stopwords ni términos vacíos
+        """
+        cache = self._cache
+        stopwords = self.stopwords
+        reducidos = {}
+        pendientes = []
+
+        with self._cerrojo:
+            for token in set(tokens):
+                if token in stopwords:
+                    continue
+                if token in cache:
+                    reducidos[token] = cache[token]
+                    cache.move_to_end(token)
+                else:
+                    pendientes.append(token)
+
+            self.aciertos += len(reducidos)
+            self.fallos += len(pendientes)
+
+        if pendientes:
+            # Fuera del cerrojo: los demás hilos siguen usando la caché
+            nuevos = self.reducir_lote(pendientes)
+            with self._cerrojo:
+                for token, reducido in zip(pendientes, nuevos):
+                    reducidos[token] = reducido
+                    self._memoizar(token, reducido)
+
+        return [reducidos[t] for t in tokens if reducidos.get(t)]
+
+    def procesar_termino(self, termino):
+        """
+        Procesa un único término (por ejemplo, el de una consulta).
+
+        Returns:
+            El término procesado, o None si es una stopword
+        """
+        procesados = self.procesar([termino])
+        return procesados[0] if procesados else None
+
+
+class LematizadorSpacy(ProcesadorTerminos):
+    """
+    Procesador que lematiza con spaCy, en lotes y opcionalmente en paralelo.
+
+    Cada término nuevo se lematiza aislado (un documento de spaCy por término)
+    y el lema queda memoizado: se pierde el contexto de la oración a cambio de
+    invocar el modelo una sola vez por término distinto. Los términos
+    pendientes se envían juntos a `nlp.pipe`, usando `n_process` procesos
+    cuando el lote es suficientemente grande como para amortizar su arranque.
+    """
+
+    def __init__(self, modelo="es_core_news_sm", stopwords=None, n_process=1, batch_size=1000, tamaño_cache=100_000):
+        """
+        Args:
+            modelo: Nombre del modelo de spaCy o un objeto `Language` ya cargado
+            stopwords: Stopwords a eliminar (por defecto, las del modelo)
+            n_process: Procesos para `nlp.pipe`
+            batch_size: Términos por lote de `nlp.pipe`
+            tamaño_cache: Cantidad máxima de términos memoizados
+        """
+        if isinstance(modelo, str):
+            import spacy
+
+            # Sólo hace falta el lematizador (y lo que éste necesite)
+            modelo = spacy.load(modelo, disable=["parser", "ner"])
+        self.nlp = modelo
+        self.n_process = n_process
+        self.batch_size = batch_size
+        if stopwords is None:
+            stopwords = modelo.Defaults.stop_words
+        super().__init__(stopwords=stopwords, tamaño_cache=tamaño_cache)
+
+    def reducir_lote(self, terminos):
+        n_process = self.n_process if len(terminos) >= 2 * self.batch_size else 1
+        documentos = self.nlp.pipe(terminos, n_process=n_process, batch_size=self.batch_size)
+        return [doc[0].lemma_.lower() if len(doc) else termino for termino, doc in zip(terminos, documentos)]
+
+
+def procesador_snowball(idioma="spanish", stopwords=True, tamaño_cache=100_000):
+    """
+    Crea un procesador con stopwords de NLTK y `SnowballStemmer`.
+
+    Args:
+        idioma: Idioma de NLTK ("spanish", "english", ...)
+        stopwords: True para usar las stopwords de NLTK (se descargan sólo
+            si no están instaladas), False para no eliminarlas, o un
+            iterable con las stopwords a usar
+        tamaño_cache: Cantidad máxima de términos memoizados
+
+    Returns:
+        ProcesadorTerminos listo para pasar a `BSBI(procesador=...)`
+
+    Raises:
+        LookupError: Si faltan las stopwords de NLTK y no pueden descargarse
+    """
+    from nltk.stem.snowball import SnowballStemmer
+
+    if stopwords is True:
+        import nltk
+        from nltk.corpus import stopwords as stopwords_nltk
+
+        try:
+            nltk.data.find("corpora/stopwords")
+        except LookupError:
+            # Sólo se descargan si no están instaladas
+            if not nltk.download("stopwords", quiet=True):
+                raise LookupError(
+                    "No están las stopwords de NLTK y no pudieron descargarse (¿sin conexión?): "
+                    "instalarlas con `python -m nltk.downloader stopwords` o pasar `stopwords=`"
+                ) from None
+        stopwords = stopwords_nltk.words(idioma)
+    elif stopwords is False:
+        stopwords = ()
+
+    return ProcesadorTerminos(stopwords, SnowballStemmer(idioma).stem, tamaño_cache)
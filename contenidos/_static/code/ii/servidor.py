@@ -0,0 +1,271 @@
+"""
+Servidor asyncio de consultas booleanas sobre un índice invertido.
+
+El índice se carga una sola vez y queda residente en un conjunto de procesos
+trabajadores; el bucle de eventos sólo lee y escribe en los sockets, de modo
+que muchos clientes pueden estar conectados a la vez sin que la evaluación de
+una consulta costosa bloquee a los demás.
+
+Protocolo (JSON delimitado por saltos de línea, una petición por línea):
+
+    {"consulta": "(gato OR perro) AND NOT ratón"}  →  {"documentos": [...]}
+    {"accion": "recargar"}                          →  {"recargado": 2}
+    {"accion": "recargar", "indice": "otro.txt"}    →  {"recargado": 3}
+
+Ante cualquier error se responde {"error": "mensaje"} y la conexión sigue
+abierta, salvo con una línea más larga que `LIMITE_LINEA` bytes: se responde
+el error y se cierra la conexión, porque el resto de la línea no puede
+separarse de la petición siguiente. La recarga también puede dispararse con
+la señal SIGHUP.
+
+Uso:
+
+    python -m ii.servidor indice.txt --socket /tmp/ii.sock
+    python -m ii.servidor indice.txt --host 127.0.0.1 --puerto 8765 --corpus ii/corpus
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import multiprocessing
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .busquedas import _a_rpn, _tokenizar_booleana, _universo_docs, evaluar_rpn
+from .ii import BSBI
+
+# Bytes máximos de una petición (una línea), por defecto
+LIMITE_LINEA = 1024 * 1024
+
+# Estado de cada proceso trabajador: el índice se carga una vez por proceso
+_bsbi = None
+_universo = None
+_barrera = None
+
+
+def _inicializar_trabajador(ruta_indice, barrera):
+    """Carga el índice en el proceso trabajador."""
+    global _bsbi, _universo, _barrera
+    _bsbi = BSBI()
+    _bsbi.cargar_indice(ruta_indice)
+    _universo = _universo_docs(_bsbi)
+    _barrera = barrera
+
+
+def _cantidad_terminos():
+    """
+    Tarea de precalentamiento: espera a que todos los trabajadores la tomen.
+
+    Un trabajador ocupado en la barrera no puede tomar otra tarea, así que
+    las `procesos` tareas de `_crear_trabajadores` terminan cada una en un
+    proceso distinto, y ninguna vuelve hasta que todos cargaron el índice.
+    """
+    _barrera.wait()
+    return len(_bsbi.indice_final)
+
+
+def _evaluar_consulta(consulta):
+    """Evalúa una consulta booleana en el proceso trabajador."""
+    rpn = _a_rpn(_tokenizar_booleana(consulta))
+    return sorted(evaluar_rpn(rpn, _bsbi, _universo))
+
+
+class ServidorConsultas:
+    """
+    Servidor de consultas booleanas sobre un índice guardado en disco.
+
+    Las conexiones se atienden en el bucle de eventos y la evaluación se
+    delega a un `ProcessPoolExecutor` cuyos procesos tienen el índice cargado.
+    Una recarga crea un nuevo conjunto de trabajadores con el índice nuevo,
+    lo publica y recién entonces apaga el anterior, esperando a que terminen
+    las consultas que ya tenía asignadas: ninguna conexión se interrumpe.
+    """
+
+    def __init__(self, ruta_indice, procesos=None, limite_linea=LIMITE_LINEA):
+        """
+        Inicializa el servidor (el índice se carga al llamar a `iniciar`).
+
+        Args:
+            ruta_indice: Ruta del índice guardado con `BSBI.guardar_indice`
+            procesos: Cantidad de procesos trabajadores (por defecto, uno por CPU)
+            limite_linea: Bytes máximos de una petición
+        """
+        self.ruta_indice = Path(ruta_indice)
+        self.procesos = procesos or os.cpu_count() or 1
+        self.limite_linea = limite_linea
+        self.generacion = 0
+        self._trabajadores = None
+        self._servidor = None
+        self._recarga = asyncio.Lock()
+        # Apagados de pools anteriores todavía en curso (ver `recargar`)
+        self._apagados = set()
+
+    async def _crear_trabajadores(self, ruta_indice):
+        """Crea un pool con el índice dado cargado en todos sus procesos."""
+        # "spawn" evita que los trabajadores hereden (por fork) los sockets de
+        # las conexiones abiertas, que entonces no se cerrarían al cerrarlas acá
+        contexto = multiprocessing.get_context("spawn")
+        trabajadores = ProcessPoolExecutor(
+            max_workers=self.procesos,
+            mp_context=contexto,
+            initializer=_inicializar_trabajador,
+            initargs=(str(ruta_indice), contexto.Barrier(self.procesos)),
+        )
+        try:
+            # Una tarea por proceso: el pool se publica recién con todos cargados
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(
+                *(loop.run_in_executor(trabajadores, _cantidad_terminos) for _ in range(self.procesos))
+            )
+        except BaseException:
+            trabajadores.shutdown(wait=False, cancel_futures=True)
+            raise
+        return trabajadores
+
+    async def recargar(self, ruta_indice=None):
+        """
+        Publica un índice nuevo sin cortar las conexiones abiertas.
+
+        Args:
+            ruta_indice: Nueva ruta del índice (por defecto, la actual)
+
+        Returns:
+            Número de generación del índice publicado
+        """
+        async with self._recarga:
+            ruta_indice = Path(ruta_indice) if ruta_indice else self.ruta_indice
+            nuevos = await self._crear_trabajadores(ruta_indice)
+            anteriores, self._trabajadores = self._trabajadores, nuevos
+            self.ruta_indice = ruta_indice
+            self.generacion += 1
+            if anteriores is not None:
+                # shutdown(wait=True) bloquea hasta terminar las consultas en
+                # curso; `cerrar` espera los apagados que sigan pendientes
+                apagado = asyncio.get_running_loop().run_in_executor(None, anteriores.shutdown)
+                self._apagados.add(apagado)
+                apagado.add_done_callback(self._apagados.discard)
+            return self.generacion
+
+    async def _responder(self, peticion):
+        """Resuelve una petición ya decodificada y devuelve la respuesta."""
+        if not isinstance(peticion, dict):
+            raise ValueError("La petición debe ser un objeto JSON")
+        if peticion.get("accion") == "recargar":
+            return {"recargado": await self.recargar(peticion.get("indice"))}
+        consulta = peticion.get("consulta")
+        if not isinstance(consulta, str) or not consulta.strip():
+            raise ValueError("Falta el campo 'consulta'")
+        loop = asyncio.get_running_loop()
+        documentos = await loop.run_in_executor(self._trabajadores, _evaluar_consulta, consulta)
+        return {"documentos": documentos}
+
+    async def _atender(self, lector, escritor):
+        """Atiende una conexión: una respuesta por cada línea recibida."""
+        try:
+            while True:
+                try:
+                    linea = await lector.readline()
+                except ValueError:
+                    # Línea más larga que el límite del lector: ya no se sabe
+                    # dónde empieza la petición siguiente
+                    error = {"error": f"La petición supera el máximo de {self.limite_linea} bytes"}
+                    escritor.write(json.dumps(error, ensure_ascii=False).encode("utf-8") + b"\n")
+                    await escritor.drain()
+                    break
+                if not linea:
+                    break
+                if not linea.strip():
+                    continue
+                try:
+                    respuesta = await self._responder(json.loads(linea))
+                except Exception as e:
+                    respuesta = {"error": str(e)}
+                escritor.write(json.dumps(respuesta, ensure_ascii=False).encode("utf-8") + b"\n")
+                await escritor.drain()
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+
+    async def iniciar(self, ruta_socket=None, host="127.0.0.1", puerto=8765):
+        """
+        Carga el índice y comienza a aceptar conexiones.
+
+        Args:
+            ruta_socket: Ruta de un socket Unix; si se omite se usa TCP
+            host: Dirección TCP
+            puerto: Puerto TCP
+        """
+        await self.recargar()
+        if ruta_socket:
+            self._servidor = await asyncio.start_unix_server(self._atender, path=ruta_socket, limit=self.limite_linea)
+        else:
+            self._servidor = await asyncio.start_server(self._atender, host, puerto, limit=self.limite_linea)
+
+    async def servir(self):
+        """Atiende conexiones hasta que se cancele la tarea."""
+        async with self._servidor:
+            await self._servidor.serve_forever()
+
+    async def cerrar(self):
+        """Deja de aceptar conexiones y apaga los procesos trabajadores."""
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+        if self._trabajadores is not None:
+            # Igual que en `recargar`: esperar las consultas en curso sin bloquear el bucle
+            trabajadores, self._trabajadores = self._trabajadores, None
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, functools.partial(trabajadores.shutdown, wait=True))
+        if self._apagados:
+            await asyncio.gather(*self._apagados)
+
+
+async def _principal(args):
+    servidor = ServidorConsultas(args.indice, procesos=args.procesos, limite_linea=args.limite_linea)
+    await servidor.iniciar(ruta_socket=args.socket, host=args.host, puerto=args.puerto)
+
+    loop = asyncio.get_running_loop()
+    if hasattr(signal, "SIGHUP"):
+        loop.add_signal_handler(signal.SIGHUP, lambda: loop.create_task(servidor.recargar()))
+
+    direccion = args.socket or f"{args.host}:{args.puerto}"
+    print(f"Sirviendo {servidor.ruta_indice} en {direccion} ({servidor.procesos} procesos)")
+    try:
+        await servidor.servir()
+    finally:
+        await servidor.cerrar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor de consultas booleanas sobre un índice invertido.")
+    parser.add_argument("indice", help="Archivo de índice guardado con BSBI.guardar_indice")
+    parser.add_argument("--corpus", help="Construir el índice desde este directorio antes de servir")
+    parser.add_argument("--socket", help="Ruta de socket Unix (si se omite, se usa TCP)")
+    parser.add_argument("--host", default="127.0.0.1", help="Dirección TCP (por defecto: 127.0.0.1)")
+    parser.add_argument("--puerto", type=int, default=8765, help="Puerto TCP (por defecto: 8765)")
+    parser.add_argument("--procesos", type=int, help="Procesos trabajadores (por defecto: uno por CPU)")
+    parser.add_argument(
+        "--limite-linea",
+        type=int,
+        default=LIMITE_LINEA,
+        help=f"Bytes máximos por petición (por defecto: {LIMITE_LINEA})",
+    )
+    args = parser.parse_args()
+
+    if args.corpus:
+        bsbi = BSBI()
+        bsbi.construir_indice(args.corpus)
+        bsbi.guardar_indice(args.indice)
+
+    try:
+        asyncio.run(_principal(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
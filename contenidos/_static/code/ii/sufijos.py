@@ -0,0 +1,202 @@
+"""
+Índice de subcadenas con arreglo de sufijos, guardado en disco y mapeado en memoria.
+
+Las búsquedas booleanas sólo encuentran términos completos. Para buscar
+fragmentos de palabras (por ejemplo `anill` dentro de "anillos" o
+"desanillado") `IndiceSufijos` concatena el texto normalizado de todos los
+documentos, separados por un byte nulo, y guarda el arreglo de sufijos de
+esa concatenación: las posiciones de todos sus sufijos en orden
+lexicográfico. Los sufijos que empiezan con un patrón forman un rango
+contiguo del arreglo, que se ubica con dos búsquedas binarias en
+O(m log n) comparaciones de a lo sumo m bytes.
+
+Archivos generados en el directorio del índice:
+
+    texto.npy       texto normalizado de todos los documentos (UTF-8)
+    sufijos.npy     arreglo de sufijos (int32 o int64)
+    inicios.npy     posición donde empieza cada documento en el texto
+    documentos.json doc_id de cada documento
+
+Los tres arreglos se abren con `numpy.load(mmap_mode="r")`, así que abrir el
+índice es instantáneo y sólo se leen del disco las páginas que tocan las
+búsquedas. La construcción (duplicación de prefijos vectorizada con NumPy)
+necesita en memoria unas 50 veces el tamaño del texto.
+
+    from ii.sufijos import IndiceSufijos
+
+    indice = IndiceSufijos.construir("corpus", "./sufijos")
+    indice.contar("anill")        # cantidad de apariciones
+    indice.ubicar("anill")        # [(doc_id, posición en el texto normalizado), ...]
+    indice.documentos("anill")    # {doc_id: apariciones}
+
+Requiere NumPy.
+"""
+
+import json
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+from .fuentes import leer_documentos
+from .ii import BSBI
+
+SEPARADOR = b"\x00"
+
+
+def arreglo_de_sufijos(texto):
+    """
+    Calcula el arreglo de sufijos por duplicación de prefijos.
+
+    En cada ronda los sufijos se ordenan por el par (rango de los primeros k
+    bytes, rango de los k siguientes), lo que da su orden por los primeros
+    2k bytes; termina cuando todos los rangos son distintos. Cada ronda es un
+    único ordenamiento de NumPy, y hacen falta O(log n) rondas.
+
+    Args:
+        texto: Arreglo de NumPy de uint8
+
+    Returns:
+        Arreglo con las posiciones de los sufijos en orden lexicográfico
+    """
+    n = len(texto)
+    tipo = np.int32 if n < 2**31 else np.int64
+    if n == 0:
+        return np.empty(0, dtype=tipo)
+
+    base = max(n, 256) + 1
+    rango = texto.astype(np.int64)
+    k = 1
+    while True:
+        segundo = np.zeros(n, dtype=np.int64)
+        if k < n:
+            segundo[: n - k] = rango[k:] + 1  # 0 para "fin del texto"
+        clave = rango * base + segundo
+        sufijos = np.argsort(clave)
+        ordenadas = clave[sufijos]
+        rango = np.empty(n, dtype=np.int64)
+        rango[sufijos] = np.concatenate(([0], np.cumsum(ordenadas[1:] != ordenadas[:-1])))
+        if rango[sufijos[-1]] == n - 1 or k >= n:
+            return sufijos.astype(tipo)
+        k *= 2
+
+
+class IndiceSufijos:
+    """Búsqueda de subcadenas sobre un arreglo de sufijos mapeado en memoria."""
+
+    def __init__(self, directorio, normalizar=None):
+        """
+        Args:
+            directorio: Directorio escrito por `IndiceSufijos.construir`
+            normalizar: Función de normalización de los patrones (por
+                defecto, la de `BSBI`); debe ser la misma usada al construir
+        """
+        directorio = Path(directorio)
+        self.texto = np.load(directorio / "texto.npy", mmap_mode="r")
+        self.sufijos = np.load(directorio / "sufijos.npy", mmap_mode="r")
+        self.inicios = np.load(directorio / "inicios.npy", mmap_mode="r")
+        with open(directorio / "documentos.json", "r", encoding="utf-8") as f:
+            self.doc_ids = json.load(f)
+        self.normalizar = normalizar or BSBI().normalizar
+        # Vista en bytes del texto mapeado, para comparar sin copiar todo
+        self._bytes = memoryview(self.texto) if len(self.texto) else memoryview(b"")
+
+    @classmethod
+    def construir(cls, origen, directorio, normalizar=None):
+        """
+        Construye el índice y lo guarda en `directorio`.
+
+        Args:
+            origen: Documentos, como en `BSBI.construir_indice` (directorio,
+                archivo comprimido o lista)
+            directorio: Directorio de salida (se crea si no existe)
+            normalizar: Función de normalización del texto (por defecto, la
+                de `BSBI`)
+
+        Returns:
+            `IndiceSufijos` abierto sobre el directorio
+        """
+        normalizar = normalizar or BSBI().normalizar
+        directorio = Path(directorio)
+        directorio.mkdir(parents=True, exist_ok=True)
+
+        partes, inicios, doc_ids = [], [], []
+        posicion = 0
+        for doc_id, contenido, _ in leer_documentos(origen):
+            datos = normalizar(contenido).encode("utf-8") + SEPARADOR
+            partes.append(datos)
+            inicios.append(posicion)
+            doc_ids.append(doc_id)
+            posicion += len(datos)
+
+        texto = np.frombuffer(b"".join(partes), dtype=np.uint8)
+        del partes
+        np.save(directorio / "texto.npy", texto)
+        np.save(directorio / "sufijos.npy", arreglo_de_sufijos(texto))
+        np.save(directorio / "inicios.npy", np.asarray(inicios, dtype=np.int64))
+        with open(directorio / "documentos.json", "w", encoding="utf-8") as f:
+            json.dump(doc_ids, f, ensure_ascii=False)
+        return cls(directorio, normalizar)
+
+    def _sufijo(self, posicion, m):
+        return self._bytes[posicion : posicion + m].tobytes()
+
+    def rango(self, patron):
+        """
+        Devuelve el rango [desde, hasta) del arreglo de sufijos que empiezan con el patrón.
+
+        Args:
+            patron: Texto a buscar (se normaliza igual que los documentos)
+        """
+        clave = self.normalizar(patron).encode("utf-8")
+        if not clave:
+            return 0, 0
+        sufijos, m = self.sufijos, len(clave)
+
+        desde, hasta = 0, len(sufijos)
+        while desde < hasta:
+            medio = (desde + hasta) // 2
+            if self._sufijo(int(sufijos[medio]), m) < clave:
+                desde = medio + 1
+            else:
+                hasta = medio
+        inicio = desde
+
+        hasta = len(sufijos)
+        while desde < hasta:
+            medio = (desde + hasta) // 2
+            if self._sufijo(int(sufijos[medio]), m) <= clave:
+                desde = medio + 1
+            else:
+                hasta = medio
+        return inicio, desde
+
+    def contar(self, patron):
+        """Cantidad de apariciones del patrón en todo el corpus."""
+        desde, hasta = self.rango(patron)
+        return hasta - desde
+
+    def ubicar(self, patron, limite=None):
+        """
+        Devuelve dónde aparece el patrón.
+
+        Args:
+            patron: Texto a buscar
+            limite: Cantidad máxima de apariciones (None para todas)
+
+        Returns:
+            Lista de tuplas (doc_id, posición en bytes dentro del texto
+            normalizado del documento), ordenada por documento y posición
+        """
+        desde, hasta = self.rango(patron)
+        if limite is not None:
+            hasta = min(hasta, desde + limite)
+        posiciones = np.sort(np.asarray(self.sufijos[desde:hasta], dtype=np.int64))
+        documentos = np.searchsorted(self.inicios, posiciones, side="right") - 1
+        relativas = posiciones - np.asarray(self.inicios)[documentos]
+        doc_ids = self.doc_ids
+        return [(doc_ids[d], p) for d, p in zip(documentos.tolist(), relativas.tolist())]
+
+    def documentos(self, patron):
+        """Devuelve {doc_id: cantidad de apariciones} de los documentos con el patrón."""
+        return dict(Counter(doc_id for doc_id, _ in self.ubicar(patron)))
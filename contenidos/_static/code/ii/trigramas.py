@@ -0,0 +1,244 @@
+"""
+Búsqueda por expresiones regulares acelerada con trigramas.
+
+Recorrer todo el vocabulario aplicando la expresión regular a cada término
+cuesta O(|vocabulario|) por consulta. Este módulo construye un índice
+secundario trigrama → términos y, a partir de la expresión regular, deduce
+qué trigramas debe contener obligatoriamente cualquier término que coincida.
+La intersección/unión de esas listas reduce el conjunto de candidatos sobre
+los que finalmente se ejecuta la expresión regular.
+"""
+
+import re
+from collections import defaultdict
+from re import _constants as sre_constants
+from re import _parser as sre_parse
+
+# Nodos de la consulta de trigramas:
+#   None                 → cualquier término puede coincidir (sin filtro)
+#   ("TRI", "abc")       → términos que contienen el trigrama "abc"
+#   ("AND", [nodos])     → intersección
+#   ("OR", [nodos])      → unión
+TODOS = None
+
+
+def trigramas(texto):
+    """Devuelve el conjunto de trigramas (subcadenas de longitud 3) de un texto."""
+    return {texto[i : i + 3] for i in range(len(texto) - 2)}
+
+
+def _y(nodos):
+    """Combina nodos con AND descartando los que no filtran nada."""
+    nodos = [n for n in nodos if n is not TODOS]
+    if not nodos:
+        return TODOS
+    if len(nodos) == 1:
+        return nodos[0]
+    return ("AND", nodos)
+
+
+def _o(nodos):
+    """Combina nodos con OR; si alguna alternativa no filtra, el OR tampoco."""
+    if not nodos or any(n is TODOS for n in nodos):
+        return TODOS
+    if len(nodos) == 1:
+        return nodos[0]
+    return ("OR", nodos)
+
+
+# Máxima cantidad de cadenas alternativas que se siguen en forma exacta antes
+# de resignar precisión (p. ej. "[abc][def]" genera 9 alternativas)
+MAX_ALTERNATIVAS = 16
+
+
+def _literal(texto):
+    """Consulta que exige todos los trigramas de un literal."""
+    if len(texto) < 3:
+        return TODOS
+    return _y([("TRI", t) for t in sorted(trigramas(texto))])
+
+
+def _literales(textos):
+    """Consulta que exige los trigramas de alguno de los literales dados."""
+    return _o([_literal(t) for t in sorted(textos)])
+
+
+def _clase_literal(items):
+    """Devuelve los caracteres de una clase como [abc], o None si no es enumerable."""
+    caracteres = set()
+    for op, arg in items:
+        if op is not sre_constants.LITERAL:
+            return None
+        caracteres.add(chr(arg).lower())
+    return caracteres
+
+
+def _analizar(subpatron):
+    """
+    Analiza un subpatrón de `re._parser` y devuelve (consulta, exactos).
+
+    `exactos` es el conjunto de cadenas que el subpatrón reconoce cuando es
+    enumerable (literales, clases pequeñas y alternativas de literales), o
+    None en caso contrario. Se usa para que esas construcciones no corten la
+    secuencia que las rodea: "anill(o|os)" produce {"anillo", "anillos"}.
+    """
+    condiciones = []
+    tramo = {""}
+    exacto = True
+
+    def extender(sufijos):
+        nonlocal tramo
+        if sufijos is None or len(tramo) * len(sufijos) > MAX_ALTERNATIVAS:
+            cortar()
+            if sufijos is None:
+                return
+        tramo = {prefijo + sufijo for prefijo in tramo for sufijo in sufijos}
+
+    def cortar():
+        nonlocal tramo, exacto
+        exacto = False
+        condiciones.append(_literales(tramo))
+        tramo = {""}
+
+    for op, arg in subpatron:
+        if op is sre_constants.LITERAL:
+            extender({chr(arg).lower()})
+        elif op is sre_constants.AT:
+            # Anclas (^, $, \b) no consumen caracteres: no cortan el tramo
+            continue
+        elif op is sre_constants.IN:
+            extender(_clase_literal(arg))
+        elif op is sre_constants.SUBPATTERN:
+            consulta, exactos = _analizar(arg[-1])
+            if exactos is None:
+                condiciones.append(consulta)
+            extender(exactos)
+        elif op is sre_constants.BRANCH:
+            analisis = [_analizar(alternativa) for alternativa in arg[1]]
+            if all(exactos is not None for _, exactos in analisis):
+                extender(set().union(*(exactos for _, exactos in analisis)))
+            else:
+                condiciones.append(_o([consulta for consulta, _ in analisis]))
+                extender(None)
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT, sre_constants.POSSESSIVE_REPEAT):
+            minimo, _, sub = arg
+            if minimo >= 1:
+                condiciones.append(_analizar(sub)[0])
+            extender(None)
+        else:
+            # '.', categorías (\w, \d), clases negadas, etc.: cortan el tramo
+            extender(None)
+    condiciones.append(_literales(tramo))
+
+    return _y(condiciones), (tramo if exacto else None)
+
+
+def consulta_trigramas(patron):
+    """
+    Extrae de una expresión regular la consulta de trigramas obligatorios.
+
+    Args:
+        patron: Expresión regular (cadena)
+
+    Returns:
+        Árbol de consulta (ver TODOS, "TRI", "AND", "OR") o TODOS si la
+        expresión no obliga a contener ningún trigrama.
+    """
+    return _analizar(sre_parse.parse(patron))[0]
+
+
+class IndiceTrigramas:
+    """
+    Índice secundario trigrama → términos del vocabulario.
+
+    Se construye a partir de un índice invertido {término: [doc_ids]} y
+    permite resolver consultas por expresión regular verificando la
+    expresión sólo sobre los términos candidatos.
+    """
+
+    def __init__(self, indice):
+        """
+        Construye el índice de trigramas.
+
+        Args:
+            indice: Diccionario {término: [lista de doc_ids ordenados]}
+        """
+        self.indice = indice
+        self.terminos = sorted(indice)
+        postings = defaultdict(list)
+        for id_termino, termino in enumerate(self.terminos):
+            for trigrama in trigramas(termino):
+                postings[trigrama].append(id_termino)
+        self.postings = dict(postings)
+
+    def _evaluar(self, consulta):
+        """Evalúa un árbol de consulta y devuelve un set de ids de términos."""
+        tipo, arg = consulta
+        if tipo == "TRI":
+            return set(self.postings.get(arg, ()))
+        # Para AND se empieza por las listas más cortas
+        conjuntos = [self._evaluar(n) for n in arg]
+        if tipo == "AND":
+            conjuntos.sort(key=len)
+            resultado = conjuntos[0]
+            for conjunto in conjuntos[1:]:
+                if not resultado:
+                    break
+                resultado &= conjunto
+            return resultado
+        return set().union(*conjuntos)
+
+    def candidatos(self, patron):
+        """
+        Devuelve los términos que podrían coincidir con el patrón.
+
+        Args:
+            patron: Expresión regular
+
+        Returns:
+            Lista de términos candidatos (superconjunto de las coincidencias)
+        """
+        consulta = consulta_trigramas(patron)
+        if consulta is TODOS:
+            return self.terminos
+        return [self.terminos[i] for i in sorted(self._evaluar(consulta))]
+
+    def buscar_terminos(self, patron):
+        """
+        Devuelve los términos del vocabulario que coinciden con el patrón.
+
+        Args:
+            patron: Expresión regular
+
+        Returns:
+            Lista ordenada de términos coincidentes
+        """
+        patron_compilado = re.compile(patron, re.IGNORECASE)
+        return [t for t in self.candidatos(patron) if patron_compilado.search(t)]
+
+    def buscar(self, patron):
+        """
+        Devuelve los postings de todos los términos que coinciden con el patrón.
+
+        Args:
+            patron: Expresión regular
+
+        Returns:
+            Diccionario {término: [lista de doc_ids]}
+        """
+        return {t: self.indice[t] for t in self.buscar_terminos(patron)}
+
+    def documentos(self, patron):
+        """
+        Devuelve la unión de los postings de los términos que coinciden.
+
+        Args:
+            patron: Expresión regular
+
+        Returns:
+            Lista ordenada de doc_ids
+        """
+        documentos = set()
+        for doc_ids in self.buscar(patron).values():
+            documentos.update(doc_ids)
+        return sorted(documentos)
@@ -0,0 +1,204 @@
+"""
+Modelo vectorial TF-IDF sobre el índice, con puntuación por lotes.
+
+`MatrizTfIdf` exporta el índice como una matriz dispersa CSR de SciPy
+documentos × términos. Como el índice guarda sólo en qué documentos aparece
+cada término (no cuántas veces), el peso de un término presente es su idf,
+log(N / df), y cada fila se normaliza a norma 1.
+
+Para evaluar muchas consultas de una vez, `puntuar` arma una matriz dispersa
+consultas × términos (frecuencia en la consulta × idf, normalizada) y obtiene
+todos los cosenos con un único producto de matrices dispersas; `top_k`
+selecciona los k mejores documentos de cada fila sin recorrerlas en Python.
+
+    from ii.vectorial import MatrizTfIdf
+
+    modelo = MatrizTfIdf(bsbi)
+    modelo.top_k(["hobbit anillo", "gato perro"], k=5)
+    # [[(0.41, 'Bombadil'), ...], [...]]
+
+Requiere NumPy y SciPy.
+"""
+
+import json
+
+import numpy as np
+from scipy import sparse
+
+
+def _normalizar_filas(matriz):
+    """Divide cada fila de una matriz CSR por su norma euclídea (en el lugar)."""
+    # Los términos presentes en todos los documentos tienen idf 0
+    matriz.eliminate_zeros()
+    normas = np.sqrt(np.asarray(matriz.multiply(matriz).sum(axis=1)).ravel())
+    normas[normas == 0] = 1.0
+    matriz.data /= np.repeat(normas, np.diff(matriz.indptr))
+    return matriz
+
+
+def top_k_por_fila(matriz, k):
+    """
+    Selecciona los k valores más altos de cada fila de una matriz CSR.
+
+    Ordena todos los valores de una vez por (fila, -valor, columna), así que
+    los empates se resuelven por número de columna.
+
+    Args:
+        matriz: Matriz CSR (por ejemplo, consultas × documentos)
+        k: Cantidad de valores por fila
+
+    Returns:
+        Tupla (indptr, columnas, valores) en formato CSR: los resultados de la
+        fila i son columnas[indptr[i]:indptr[i + 1]], de mayor a menor
+    """
+    por_fila = np.diff(matriz.indptr)
+    filas = np.repeat(np.arange(matriz.shape[0]), por_fila)
+    orden = np.lexsort((matriz.indices, -matriz.data, filas))
+    # Posición de cada valor dentro de su fila, ya ordenada
+    posicion = np.arange(len(orden)) - matriz.indptr[filas[orden]]
+    elegidos = orden[posicion < k]
+    indptr = np.concatenate(([0], np.cumsum(np.minimum(por_fila, k))))
+    return indptr, matriz.indices[elegidos], matriz.data[elegidos]
+
+
+class MatrizTfIdf:
+    """
+    Índice exportado como matriz CSR documentos × términos con pesos TF-IDF.
+
+    Atributos:
+        matriz: `scipy.sparse.csr_matrix` con filas normalizadas
+        documentos: doc_id de cada fila
+        terminos: Término de cada columna
+        idf: Vector con el idf de cada columna
+    """
+
+    def __init__(self, indice, termino_de_consulta=None):
+        """
+        Args:
+            indice: `BSBI`, instantánea (ver `ii.instantaneas`) o diccionario
+                {término: [doc_ids]}
+            termino_de_consulta: Función que normaliza un término de consulta;
+                por defecto la de `indice` si la tiene, si no el término tal cual
+        """
+        if termino_de_consulta is None:
+            termino_de_consulta = getattr(indice, "termino_de_consulta", None)
+        postings = getattr(indice, "indice_final", indice)
+
+        terminos = sorted(postings)
+        documentos = sorted({doc_id for docs in postings.values() for doc_id in docs})
+        filas_de = {doc_id: fila for fila, doc_id in enumerate(documentos)}
+
+        df = np.fromiter((len(postings[t]) for t in terminos), dtype=np.int64, count=len(terminos))
+        columnas = np.repeat(np.arange(len(terminos)), df)
+        filas = np.fromiter(
+            (filas_de[doc_id] for t in terminos for doc_id in postings[t]), dtype=np.int64, count=len(columnas)
+        )
+        idf = np.log(len(documentos) / np.maximum(df, 1))
+
+        matriz = sparse.csr_matrix((idf[columnas], (filas, columnas)), shape=(len(documentos), len(terminos)))
+        self._inicializar(_normalizar_filas(matriz), documentos, terminos, idf, termino_de_consulta)
+
+    def _inicializar(self, matriz, documentos, terminos, idf, termino_de_consulta):
+        self.matriz = matriz
+        self.documentos = documentos
+        self.terminos = terminos
+        self.idf = idf
+        self.columnas = {termino: columna for columna, termino in enumerate(terminos)}
+        self.termino_de_consulta = termino_de_consulta or (lambda termino: termino)
+        # La traspuesta se usa en cada producto: se calcula una sola vez
+        self._traspuesta = matriz.T.tocsr()
+
+    def matriz_consultas(self, consultas):
+        """
+        Convierte consultas en una matriz CSR consultas × términos.
+
+        Args:
+            consultas: Lista de consultas, cada una un texto o una lista de
+                términos sin normalizar
+
+        Returns:
+            `scipy.sparse.csr_matrix` con filas normalizadas; los términos que
+            no están en el índice se ignoran
+        """
+        columnas_de = {}
+        filas, columnas = [], []
+        for fila, consulta in enumerate(consultas):
+            if isinstance(consulta, str):
+                consulta = consulta.split()
+            for termino in consulta:
+                if termino not in columnas_de:
+                    columnas_de[termino] = self.columnas.get(self.termino_de_consulta(termino))
+                columna = columnas_de[termino]
+                if columna is not None:
+                    filas.append(fila)
+                    columnas.append(columna)
+
+        columnas = np.asarray(columnas, dtype=np.int64)
+        # Los términos repetidos se suman: frecuencia en la consulta × idf
+        matriz = sparse.csr_matrix(
+            (self.idf[columnas], (np.asarray(filas, dtype=np.int64), columnas)),
+            shape=(len(consultas), len(self.terminos)),
+        )
+        return _normalizar_filas(matriz)
+
+    def puntuar(self, consultas):
+        """
+        Calcula el coseno entre cada consulta y cada documento.
+
+        Returns:
+            `scipy.sparse.csr_matrix` consultas × documentos (sólo los
+            documentos que comparten algún término con la consulta)
+        """
+        return self.matriz_consultas(consultas) @ self._traspuesta
+
+    def top_k(self, consultas, k=10, lote=5000):
+        """
+        Devuelve los k documentos más similares a cada consulta.
+
+        Args:
+            consultas: Lista de consultas (textos o listas de términos)
+            k: Documentos por consulta
+            lote: Consultas por producto de matrices, para acotar la memoria
+
+        Returns:
+            Lista con una lista de tuplas (puntaje, doc_id) por consulta,
+            de mayor a menor
+        """
+        documentos = self.documentos
+        resultados = []
+        for inicio in range(0, len(consultas), lote):
+            indptr, columnas, valores = top_k_por_fila(self.puntuar(consultas[inicio : inicio + lote]), k)
+            columnas, valores = columnas.tolist(), valores.tolist()
+            for desde, hasta in zip(indptr[:-1].tolist(), indptr[1:].tolist()):
+                resultados.append([(valores[i], documentos[columnas[i]]) for i in range(desde, hasta)])
+        return resultados
+
+    def guardar(self, ruta):
+        """Guarda la matriz y su vocabulario en un archivo .npz."""
+        np.savez_compressed(
+            ruta,
+            data=self.matriz.data,
+            indices=self.matriz.indices,
+            indptr=self.matriz.indptr,
+            shape=self.matriz.shape,
+            idf=self.idf,
+            nombres=json.dumps({"documentos": self.documentos, "terminos": self.terminos}, ensure_ascii=False),
+        )
+
+    @classmethod
+    def cargar(cls, ruta, termino_de_consulta=None):
+        """
+        Carga una matriz guardada con `guardar`.
+
+        Args:
+            ruta: Archivo .npz
+            termino_de_consulta: Función que normaliza un término de consulta
+                (por ejemplo, `bsbi.termino_de_consulta`)
+        """
+        with np.load(ruta) as datos:
+            matriz = sparse.csr_matrix((datos["data"], datos["indices"], datos["indptr"]), shape=tuple(datos["shape"]))
+            nombres = json.loads(str(datos["nombres"]))
+            idf = datos["idf"]
+        modelo = cls.__new__(cls)
+        modelo._inicializar(matriz, nombres["documentos"], nombres["terminos"], idf, termino_de_consulta)
+        return modelo
@@ -0,0 +1,91 @@
+"""Consultas concurrentes con publicaciones de índices nuevos."""
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from ii import BSBI
+from ii.almacen import AlmacenDocumentos, EscritorDocumentos
+
+CORPUS = Path(__file__).resolve().parent.parent / "ii" / "corpus"
+
+
+@pytest.fixture(scope="module")
+def construido(tmp_path_factory):
+    directorio = tmp_path_factory.mktemp("ii")
+    bsbi = BSBI(tamaño_bloque=20_000)
+    bsbi.construir_indice(CORPUS, directorio / "bloques", directorio_almacen=directorio / "almacen")
+    return bsbi, directorio / "almacen"
+
+
+def _en_paralelo(consulta, publicar, hilos=4, publicaciones=200):
+    """Ejecuta `consulta` en varios hilos mientras se publica en el principal."""
+    errores = []
+    terminar = threading.Event()
+
+    def leer():
+        while not terminar.is_set():
+            try:
+                consulta()
+            except Exception as e:  # noqa: BLE001 - se informan todos juntos
+                errores.append(e)
+
+    lectores = [threading.Thread(target=leer) for _ in range(hilos)]
+    for lector in lectores:
+        lector.start()
+    try:
+        for _ in range(publicaciones):
+            publicar()
+    finally:
+        terminar.set()
+        for lector in lectores:
+            lector.join()
+    return errores
+
+
+def test_consultas_durante_publicaciones(construido):
+    bsbi, directorio_almacen = construido
+    indice = dict(bsbi.indice_final)
+    doc_id = bsbi.buscar("hobbit")[0]
+    esperado = bsbi.fragmentos(doc_id, ["hobbit"])
+
+    def consulta():
+        assert bsbi.fragmentos(doc_id, ["hobbit"]) == esperado
+        assert doc_id in bsbi.buscar("hobbit")
+        assert "hobbit" in bsbi.buscar_regex("^hobb")
+
+    def publicar():
+        # Cada publicación cierra el almacén de la instantánea anterior
+        bsbi.publicar(indice, AlmacenDocumentos(directorio_almacen))
+
+    assert _en_paralelo(consulta, publicar) == []
+
+
+def test_almacen_abierto_durante_escrituras(tmp_path):
+    # Abrir el almacén mientras se publica una versión nueva nunca combina
+    # archivos de versiones distintas (como lo haría otro proceso)
+    versiones = [{f"d{i}": f"versión {v} " * (i + 1) for i in range(20)} for v in range(2)]
+    with EscritorDocumentos(tmp_path) as escritor:
+        for doc_id, texto in versiones[0].items():
+            escritor.agregar(doc_id, texto)
+
+    def consulta():
+        almacen = AlmacenDocumentos(tmp_path)
+        try:
+            textos = {doc_id: almacen.documento(doc_id) for doc_id in versiones[0]}
+        finally:
+            almacen.cerrar()
+        assert textos in versiones
+
+    numero = 0
+
+    def publicar():
+        nonlocal numero
+        numero += 1
+        with EscritorDocumentos(tmp_path) as escritor:
+            for doc_id, texto in versiones[numero % 2].items():
+                escritor.agregar(doc_id, texto)
+
+    assert _en_paralelo(consulta, publicar, publicaciones=100) == []
+    assert len(list(tmp_path.glob("version-*"))) <= 2
@@ -0,0 +1,52 @@
+"""Los cuadros incrementales de `StepRenderer` contra un dibujo completo."""
+
+import base64
+import io
+
+import networkx as nx
+import numpy as np
+import pytest
+from PIL import Image
+
+from grafos.renderer import StepRenderer
+
+
+def _decodificar(uri):
+    return np.asarray(Image.open(io.BytesIO(base64.b64decode(uri.split(",", 1)[1]))).convert("RGB"))
+
+
+def _dibujo_completo(renderer):
+    """Dibuja la figura entera, con todos los artistas en el estado actual."""
+    for artist in [*renderer._below, *renderer._above]:
+        artist.set_animated(False)
+    try:
+        renderer.canvas.draw()
+        return np.asarray(renderer.canvas.buffer_rgba())[..., :3].copy()
+    finally:
+        for artist in [*renderer._below, *renderer._above]:
+            artist.set_animated(True)
+
+
+def _grafo(dirigido):
+    graph = nx.DiGraph() if dirigido else nx.Graph()
+    graph.add_weighted_edges_from([("A", "B", 4), ("A", "C", 2), ("C", "B", 1), ("B", "D", 5), ("C", "D", 8)])
+    return graph
+
+
+PASOS = [
+    ("inicio", {}, []),
+    ("relajar", {"A": "#34a853"}, [("A", "B"), ("A", "C")]),
+    ("relajar", {"A": "#34a853", "C": "#34a853"}, [("A", "C"), ("C", "B"), ("C", "D")]),
+    ("fin", {n: "#34a853" for n in "ABCD"}, [("A", "C"), ("C", "B"), ("B", "D")]),
+]
+
+
+@pytest.mark.parametrize("dirigido", [False, True])
+def test_render_igual_a_dibujo_completo(dirigido):
+    graph = _grafo(dirigido)
+    renderer = StepRenderer(graph, nx.spring_layout(graph, seed=7), figsize=(3, 2.5), dpi=80)
+    # En orden inverso también: cada cuadro no depende de los anteriores
+    for title, colores, arbol in PASOS + PASOS[::-1]:
+        node_colors = [colores.get(n, "#dddddd") for n in renderer.nodes]
+        imagen = _decodificar(renderer.render(title, node_colors, arbol))
+        np.testing.assert_array_equal(imagen, _dibujo_completo(renderer))